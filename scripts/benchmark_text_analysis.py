@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass text analysis engine against the previous
+multi-pass TextProcessor methods on ~100 KB synthetic papers.
+
+Usage:
+    python scripts/benchmark_text_analysis.py [--size-kb 100] [--repeat 5]
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from lit_review_agent.processing.text_analysis import (  # noqa: E402
+    NOISE_PATTERN,
+    WHITESPACE_PATTERN,
+    analyze_text,
+)
+
+VOCABULARY = (
+    "model method data training network learning neural results performance "
+    "approach task benchmark transformer attention layer evaluation accuracy "
+    "dataset baseline proposed framework robust efficient large language"
+).split()
+
+GAP_SENTENCES = [
+    "However, the approach does not generalise to low resource languages.",
+    "Although promising, the method requires substantial labelled data.",
+    "Despite these gains, inference cost remains prohibitive on edge devices.",
+    "Future work: extend the framework to multimodal inputs and longer contexts.",
+]
+
+
+def make_paper(size_kb: int, seed: int = 0) -> str:
+    """Build a synthetic paper of roughly ``size_kb`` kilobytes."""
+    rng = random.Random(seed)
+    headings = [
+        "Abstract",
+        "1. Introduction",
+        "2. Related Work",
+        "3. Methodology",
+        "4. Results",
+        "5. Conclusion",
+        "References",
+    ]
+    per_section = size_kb * 1024 // len(headings)
+    parts = []
+    for heading in headings:
+        body = []
+        length = 0
+        while length < per_section:
+            if rng.random() < 0.05:
+                sentence = rng.choice(GAP_SENTENCES)
+            else:
+                words = rng.choices(VOCABULARY, k=rng.randint(8, 25))
+                sentence = " ".join(words).capitalize() + " [12]."
+            body.append(sentence)
+            length += len(sentence) + 1
+            if rng.random() < 0.1:
+                body.append("\n\n")
+        parts.append(f"{heading}\n" + " ".join(body))
+    return "\n\n".join(parts)
+
+
+# Previous implementations, kept here as the benchmark baseline
+
+
+def legacy_preprocess(text: str) -> str:
+    processed = re.sub(r"\s+", " ", text).strip()
+    processed = re.sub(r"\[[\d\w\s,\.]+\]", "", processed)
+    processed = re.sub(r"http[s]?://\S+", "", processed)
+    processed = re.sub(r"\S+@\S+", "", processed)
+    processed = re.sub(r"\s+", " ", processed)
+    return processed.strip()
+
+
+def legacy_extract_sections(text: str) -> dict:
+    section_patterns = {
+        "abstract": r"(?i)abstract\s*:?\s*(.*?)(?=\n\s*(?:introduction|keywords|1\.|background))",
+        "introduction": r"(?i)(?:1\.\s*)?introduction\s*:?\s*(.*?)(?=\n\s*(?:2\.|related work|methodology|background))",
+        "methodology": r"(?i)(?:2\.\s*)?(?:methodology|methods|approach)\s*:?\s*(.*?)(?=\n\s*(?:3\.|results|experiments|evaluation))",
+        "results": r"(?i)(?:3\.\s*)?(?:results|experiments|evaluation)\s*:?\s*(.*?)(?=\n\s*(?:4\.|discussion|conclusion|limitations))",
+        "conclusion": r"(?i)(?:4\.\s*)?(?:conclusion|conclusions|summary)\s*:?\s*(.*?)(?=\n\s*(?:references|acknowledgments|appendix|$))",
+    }
+    sections = {}
+    for name, pattern in section_patterns.items():
+        match = re.search(pattern, text, re.DOTALL)
+        if match and match.group(1).strip():
+            sections[name] = legacy_preprocess(match.group(1).strip())
+    return sections
+
+
+def legacy_statistics(text: str) -> dict:
+    try:
+        from nltk.tokenize import sent_tokenize, word_tokenize
+
+        word_count = len(word_tokenize(text))
+        sentence_count = len(sent_tokenize(text))
+    except (ImportError, LookupError):
+        word_count = len(re.findall(r"\w+|[^\w\s]", text))
+        sentence_count = len([s for s in text.split(".") if s.strip()])
+    paragraph_count = len([p for p in text.split("\n\n") if p.strip()])
+    return {
+        "words": word_count,
+        "sentences": sentence_count,
+        "paragraphs": paragraph_count,
+    }
+
+
+def legacy_gaps(text: str) -> list:
+    patterns = [
+        r"(?i)limitation[s]?\s*:?\s*([^.]+)",
+        r"(?i)future work\s*:?\s*([^.]+)",
+        r"(?i)however[,]?\s*([^.]+)",
+        r"(?i)although\s*([^.]+)",
+        r"(?i)despite\s*([^.]+)",
+    ]
+    gaps = []
+    for pattern in patterns:
+        gaps.extend(m.strip() for m in re.findall(pattern, text) if len(m.strip()) > 20)
+    return list(dict.fromkeys(gaps))
+
+
+def legacy_full(text: str) -> None:
+    legacy_extract_sections(text)
+    legacy_statistics(text)
+    legacy_gaps(text)
+
+
+def engine_full(text: str) -> None:
+    analysis = analyze_text(text)
+    for name in analysis.sections:
+        section = NOISE_PATTERN.sub("", analysis.section_text(name))
+        WHITESPACE_PATTERN.sub(" ", section)
+    analysis.statistics()
+    analysis.gap_texts()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-kb", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_paper(args.size_kb)
+    print(f"Input: {len(text) / 1024:.1f} KB, best of {args.repeat} runs\n")
+
+    benchmarks = [
+        ("sections (legacy)", lambda: legacy_extract_sections(text)),
+        ("statistics (legacy)", lambda: legacy_statistics(text)),
+        ("research gaps (legacy)", lambda: legacy_gaps(text)),
+        ("all three (legacy)", lambda: legacy_full(text)),
+        ("analyze_text (engine)", lambda: analyze_text(text)),
+        ("all three (engine)", lambda: engine_full(text)),
+    ]
+    results = {}
+    for name, func in benchmarks:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"{name:<26} {best * 1000:9.2f} ms")
+
+    speedup = results["all three (legacy)"] / results["all three (engine)"]
+    print(f"\nSpeedup (all three): {speedup:.1f}x")
+
+    analysis = analyze_text(text)
+    print(f"Sections found: {sorted(analysis.sections)}")
+    print(f"Statistics: {analysis.statistics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Check that ONNX embeddings (fp32 and int8) match the PyTorch
+sentence-transformers model within MIN_COSINE_FP32 / MIN_COSINE_INT8.
+
+Collections built with one backend are only searched correctly by the other
+if this check passes. Exits with status 1 if a backend is out of tolerance;
+skips (status 0) when onnxruntime or sentence-transformers is not installed.
+
+Usage:
+    python scripts/check_onnx_embeddings.py [--model all-MiniLM-L6-v2]
+        [--model-dir ./data/models/onnx] [--texts abstracts.txt]
+"""
+
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+
+# Add src directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from lit_review_agent.utils.onnx_encoder import (  # noqa: E402
+    MIN_COSINE_FP32,
+    MIN_COSINE_INT8,
+    OnnxSentenceEncoder,
+    compare_embeddings,
+)
+
+SAMPLE_ABSTRACTS = [
+    "We introduce a new language representation model which is designed to "
+    "pre-train deep bidirectional representations from unlabeled text by jointly "
+    "conditioning on both left and right context in all layers.",
+    "The dominant sequence transduction models are based on complex recurrent or "
+    "convolutional neural networks. We propose a new simple network architecture, "
+    "the Transformer, based solely on attention mechanisms.",
+    "Deeper neural networks are more difficult to train. We present a residual "
+    "learning framework to ease the training of networks that are substantially "
+    "deeper than those used previously.",
+    "We present a graph neural network that learns node embeddings by aggregating "
+    "features from a node's local neighborhood, and evaluate it on citation and "
+    "protein interaction benchmarks.",
+    "Retrieval-augmented generation combines a parametric sequence-to-sequence "
+    "model with a dense vector index of Wikipedia accessed by a neural retriever.",
+    "We study the robustness of image classifiers to adversarial perturbations "
+    "and propose a certified defense based on randomized smoothing.",
+    "Large language models can be prompted to produce intermediate reasoning "
+    "steps, which substantially improves performance on arithmetic and symbolic "
+    "reasoning tasks.",
+    "Federated learning enables training on decentralized data; we analyse its "
+    "convergence under heterogeneous clients and partial participation.",
+    "Diffusion probabilistic models generate high quality images by learning to "
+    "reverse a gradual noising process.",
+    "Protein structure prediction reaches near-experimental accuracy with a "
+    "network that reasons jointly over multiple sequence alignments and pair "
+    "representations.",
+    "A short query.",
+    "Benchmark results: BLEU 28.4 on WMT14 English-German, 41.8 on English-French.",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--model-dir", default="./data/models/onnx")
+    parser.add_argument("--texts", type=Path,
+                        help="File with one sample text per line (defaults to built-in abstracts)")
+    args = parser.parse_args()
+
+    missing = [name for name in ("onnxruntime", "tokenizers", "sentence_transformers")
+               if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Skipped: {', '.join(missing)} not installed")
+        return
+
+    from sentence_transformers import SentenceTransformer
+
+    texts = SAMPLE_ABSTRACTS
+    if args.texts:
+        texts = [line.strip() for line in args.texts.read_text().splitlines() if line.strip()]
+    print(f"Model: {args.model}, {len(texts)} sample texts\n")
+
+    reference = SentenceTransformer(args.model)
+    failed = []
+    for label, quantize, threshold in (("fp32", False, MIN_COSINE_FP32),
+                                       ("int8", True, MIN_COSINE_INT8)):
+        encoder = OnnxSentenceEncoder.from_pretrained(
+            args.model, model_dir=args.model_dir, quantize=quantize)
+        report = compare_embeddings(reference, encoder, texts, min_cosine=threshold)
+        status = "ok" if report["compatible"] else "FAIL"
+        print(f"{label:<5} min cosine {report['min_cosine']:.6f}  "
+              f"mean {report['mean_cosine']:.6f}  "
+              f"max |diff| {report['max_abs_diff']:.2e}  "
+              f"(threshold {threshold})  {status}")
+        if not report["compatible"]:
+            failed.append(label)
+
+    if failed:
+        print(f"\nOut of tolerance: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nONNX embeddings are compatible with PyTorch-built collections")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,23 @@ import platform
 from .ai_core.llm_manager import LLMManager
 from .processing.text_processor import TextProcessor
 from .processing.vector_store import VectorStore
+from .processing.sharded_vector_store import ShardedVectorStore
+from .processing.reranker import CrossEncoderReranker
+from .processing.inference_sidecar import InferenceSidecarClient
 from .retrieval.arxiv_client import ArxivClient
 from .retrieval.base_retriever import LiteratureItem
 from .retrieval.pdf_processor import PDFProcessor
 # Semantic Scholar removed - using ArXiv only
 from .utils.config import Config
 from .utils.logger import LoggerMixin, get_logger, setup_logger
+from .utils.embedding_scheduler import configure_embedding_scheduler
+from .utils.model_registry import get_model_registry
+from .utils.onnx_encoder import (
+    MIN_COSINE_FP32,
+    MIN_COSINE_INT8,
+    configure_onnx_embeddings,
+)
+from .utils.tokenizer import configure_default_tokenizer
 from .utils.display import display, print_status, print_error, print_success
 from .ai_core.summarizer import Summarizer
 
@@ -27,6 +38,29 @@ def get_emoji_safe(emoji: str, fallback: str = "*") -> str:
     return emoji if platform.system() != 'Windows' else fallback
 
 
+def configure_shared_models(config: Config) -> None:
+    """
+    Apply model settings to the process-wide model registry and schedulers.
+
+    Args:
+        config: Configuration object
+    """
+    if config.model_idle_timeout_seconds is not None:
+        get_model_registry().configure_idle_unloading(config.model_idle_timeout_seconds)
+    if config.tokenizer_path:
+        configure_default_tokenizer(config.tokenizer_path)
+    configure_embedding_scheduler(
+        memory_budget_mb=config.embedding_memory_budget_mb,
+        max_wait_ms=config.embedding_coalesce_ms,
+    )
+    if config.embedding_backend == "onnx":
+        configure_onnx_embeddings(
+            model_dir=config.onnx_model_dir,
+            quantize=config.onnx_quantize,
+            num_threads=config.onnx_num_threads,
+        )
+
+
 class LiteratureAgent(LoggerMixin):
     """Main agent for automated literature review and summarization."""
 
@@ -40,18 +74,78 @@ class LiteratureAgent(LoggerMixin):
         super().__init__()
         self.config = config if config else Config()
 
+        configure_shared_models(self.config)
+        embedding_cache_dir = self.config.embedding_cache_dir
+        # int8 vectors differ slightly from fp32 ones; keep them apart
+        if (embedding_cache_dir and self.config.embedding_backend == "onnx"
+                and self.config.onnx_quantize):
+            embedding_cache_dir = str(Path(embedding_cache_dir) / "onnx-int8")
+
+        # Models live in the sidecar process when one is configured
+        self.sidecar = (
+            InferenceSidecarClient(self.config.inference_sidecar_socket)
+            if self.config.inference_sidecar_socket else None
+        )
+
         # Initialize components
         self.llm_manager = LLMManager(config=self.config)
 
         self.text_processor = TextProcessor(
             spacy_model=self.config.spacy_model_name,
             sentence_model=self.config.sentence_transformer_model,
+            keyword_backend=self.config.keyword_backend,
+            sidecar=self.sidecar,
         )
 
-        self.vector_store = VectorStore(
+        store_kwargs = dict(
             persist_directory=self.config.chroma_persist_directory,
             collection_name=self.config.chroma_collection_name,
             embedding_model=self.config.sentence_transformer_model,
+            encode_batch_size=self.config.embedding_batch_size,
+            embedding_cache_dir=embedding_cache_dir,
+            backend=self.config.vector_store_backend,
+            quantization=self.config.vector_quantization,
+            rescore_factor=self.config.quantization_rescore_factor,
+            executor_workers=self.config.vector_store_workers,
+            sidecar=self.sidecar,
+        )
+        if self.config.vector_store_shard_key:
+            ignored = [name for name, enabled in (
+                ("INDEX_FULL_TEXT_CHUNKS", self.config.index_full_text_chunks),
+                ("HYBRID_SEARCH", self.config.hybrid_search),
+            ) if enabled]
+            if ignored:
+                self.logger.warning(
+                    f"{', '.join(ignored)} not supported with a sharded vector "
+                    f"store (VECTOR_STORE_SHARD_KEY); ignoring")
+            self.vector_store = ShardedVectorStore(
+                shard_key=self.config.vector_store_shard_key,
+                n_shards=self.config.vector_store_shards,
+                year_bucket=self.config.shard_year_bucket,
+                **store_kwargs,
+            )
+        else:
+            self.vector_store = VectorStore(
+                index_chunks=self.config.index_full_text_chunks,
+                hybrid_search=self.config.hybrid_search,
+                fusion_weights=(self.config.hybrid_vector_weight,
+                                self.config.hybrid_lexical_weight),
+                rrf_k=self.config.hybrid_rrf_k,
+                **store_kwargs,
+            )
+
+        if self.config.embedding_backend == "onnx":
+            self._check_onnx_embeddings()
+
+        self.reranker = (
+            CrossEncoderReranker(
+                model_name=self.config.rerank_model,
+                batch_size=self.config.rerank_batch_size,
+                max_depth=self.config.rerank_candidates,
+                latency_budget_ms=self.config.rerank_latency_budget_ms,
+                cache_size=self.config.rerank_cache_size,
+            )
+            if self.config.rerank_enabled else None
         )
 
         self.arxiv_client = ArxivClient(
@@ -68,6 +162,28 @@ class LiteratureAgent(LoggerMixin):
 
         self.logger.info("Initialized Literature Agent")
 
+    def _check_onnx_embeddings(self) -> None:
+        """Warn if the ONNX encoder does not reproduce the stored vectors."""
+        min_cosine = MIN_COSINE_INT8 if self.config.onnx_quantize else MIN_COSINE_FP32
+        try:
+            report = self.vector_store.check_embedding_compatibility(min_cosine)
+        except Exception as e:
+            self.logger.warning(f"Could not check ONNX embeddings against the collection: {e}")
+            return
+
+        if report and not report["compatible"]:
+            detail = report.get("error") or (
+                f"min cosine {report['min_cosine']:.4f} < {min_cosine}")
+            self.logger.warning(
+                f"ONNX embeddings do not match the vectors stored in "
+                f"'{self.config.chroma_collection_name}' ({detail}); search results "
+                f"will degrade. Re-index the collection or set "
+                f"EMBEDDING_BACKEND=sentence_transformers.")
+        elif report:
+            self.logger.info(
+                f"ONNX embeddings match the stored vectors "
+                f"(min cosine {report['min_cosine']:.4f} over {report['texts']} documents)")
+
     def _generate_basic_action_plan(self, params: dict) -> List[str]:
         """
         Generate a basic action plan based on extracted parameters.
@@ -476,6 +592,24 @@ class LiteratureAgent(LoggerMixin):
             print_status(
                 f"Starting AI processing for {len(retrieved_items)} papers...")
 
+            # Extract keywords for all papers in a single batched NLP pass
+            texts_for_ai = [
+                item.full_text if item.full_text else (item.abstract or "")
+                for item in retrieved_items
+            ]
+            try:
+                batch_keywords = self.text_processor.extract_research_keywords_batch(
+                    texts_for_ai,
+                    max_keywords=10,
+                    n_process=self.config.spacy_n_process,
+                    batch_size=self.config.spacy_batch_size,
+                )
+            except Exception as kw_e:
+                self.logger.error(
+                    f"Error extracting keywords in batch: {kw_e}", exc_info=True
+                )
+                batch_keywords = [[] for _ in retrieved_items]
+
             for i, item in enumerate(retrieved_items):
                 display.update_progress(
                     description=f"{get_emoji_safe('🤖', '>')} AI processing {i+1}/{len(retrieved_items)}: {item.title[:25]}..."
@@ -494,16 +628,7 @@ class LiteratureAgent(LoggerMixin):
                     self.logger.debug(
                         f"Using text (len: {len(text_for_ai)}) for AI processing of '{item.title}'. Full text used: {bool(item.full_text)}."
                     )
-                    try:
-                        keywords = self.text_processor.extract_research_keywords(
-                            text_for_ai, max_keywords=10
-                        )
-                    except Exception as kw_e:
-                        self.logger.error(
-                            f"Error extracting keywords for {item.title}: {kw_e}",
-                            exc_info=True,
-                        )
-                        keywords = []
+                    keywords = batch_keywords[i]
                     try:
                         summary_type_for_llm = (
                             "key_findings" if item.full_text else "abstract_enhancement"
@@ -591,7 +716,13 @@ class LiteratureAgent(LoggerMixin):
         return results
 
     async def search_similar_papers(
-        self, query: str, n_results: int = 10
+        self,
+        query: str,
+        n_results: int = 10,
+        categories: Optional[List[str]] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        authors: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for papers similar to a query using vector similarity.
@@ -599,6 +730,10 @@ class LiteratureAgent(LoggerMixin):
         Args:
             query: Search query
             n_results: Number of results to return
+            categories: Only return papers in any of these categories
+            year_from: Earliest publication year (inclusive)
+            year_to: Latest publication year (inclusive)
+            authors: Only return papers by any of these authors
 
         Returns:
             List of similar papers
@@ -606,8 +741,35 @@ class LiteratureAgent(LoggerMixin):
         try:
             self.logger.info(f"Searching for similar papers: {query}")
 
-            results = self.vector_store.search_similar(
-                query=query, n_results=n_results)
+            # Over-fetch candidates for the cross-encoder to reorder
+            requested = n_results
+            if self.reranker is not None:
+                n_results = max(n_results, self.config.rerank_candidates)
+
+            if categories or authors or year_from is not None or year_to is not None:
+                results = await self.vector_store.asearch_filtered(
+                    query=query,
+                    n_results=n_results,
+                    categories=categories,
+                    year_from=year_from,
+                    year_to=year_to,
+                    authors=authors,
+                )
+            elif self.vector_store.lexical_index is not None:
+                results = await self.vector_store.asearch_hybrid(
+                    query=query, n_results=n_results)
+            elif self.vector_store.index_chunks:
+                results = await self.vector_store.asearch_chunks(
+                    query=query,
+                    n_results=n_results,
+                    pooling=self.config.chunk_pooling,
+                )
+            else:
+                results = await self.vector_store.asearch_similar(
+                    query=query, n_results=n_results)
+
+            if self.reranker is not None:
+                results = await self.reranker.arerank(query, results, top_k=requested)
 
             self.logger.info(f"Found {len(results)} similar papers")
             return results
@@ -616,6 +778,28 @@ class LiteratureAgent(LoggerMixin):
             self.logger.error(f"Error searching similar papers: {e}")
             return []
 
+    async def search_similar_papers_batch(
+        self, queries: List[str], n_results: int = 10
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for papers similar to several queries in one batched lookup.
+
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+
+        Returns:
+            One list of similar papers per query
+        """
+        try:
+            self.logger.info(f"Searching for similar papers: {len(queries)} queries")
+            return await self.vector_store.asearch_similar_batch(
+                queries=queries, n_results=n_results)
+
+        except Exception as e:
+            self.logger.error(f"Error searching similar papers: {e}")
+            return [[] for _ in queries]
+
     async def generate_custom_summary(
         self, paper_ids: List[str], summary_type: str = "executive"
     ) -> Optional[str]:
@@ -634,11 +818,11 @@ class LiteratureAgent(LoggerMixin):
                 f"Generating custom summary for {len(paper_ids)} papers")
 
             # Retrieve papers from vector store
-            paper_texts = []
-            for paper_id in paper_ids:
-                paper_data = self.vector_store.get_item_by_id(paper_id)
-                if paper_data and paper_data["document"]:
-                    paper_texts.append(paper_data["document"])
+            paper_texts = [
+                paper_data["document"]
+                for paper_data in await self.vector_store.aget_items(paper_ids)
+                if paper_data["document"]
+            ]
 
             if not paper_texts:
                 self.logger.warning(
@@ -763,6 +947,13 @@ class LiteratureAgent(LoggerMixin):
             self.logger.error(f"Error generating full report: {e}")
             return {"error": str(e)}
 
+    async def aclose(self) -> None:
+        """Release pooled connections and worker threads held by the agent."""
+        await self.llm_manager.aclose()
+        self.vector_store.close()
+        if self.sidecar is not None:
+            self.sidecar.close()
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get agent statistics.
@@ -776,6 +967,7 @@ class LiteratureAgent(LoggerMixin):
             return {
                 "vector_store": vector_stats,
                 "llm_requests": getattr(self.llm_manager, "request_count", 0),
+                "reranker": self.reranker.get_stats() if self.reranker else None,
                 "config": {
                     "model": self.config.openai_model,
                     "max_papers": self.config.arxiv_max_results,
@@ -961,6 +1153,7 @@ if __name__ == "__main__":
         # Show completion message
         display.print_rule("Review Complete")
         print_success("Literature review process completed successfully!")
+        await agent.aclose()
 
     try:
         asyncio.run(main())
@@ -1,7 +1,9 @@
 """LLM manager for handling OpenAI API interactions."""
 
 import asyncio
-from typing import Any, Dict, List, Optional, Literal
+import importlib.util
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Literal, Tuple
 
 import httpx
 
@@ -20,6 +22,72 @@ class LLMManagerError(Exception):
     pass
 
 
+async def _parse_sse_stream(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Turn OpenAI-style server-sent events into chat deltas."""
+    finish_reason, usage = None, None
+    async for line in lines:
+        # Blank lines separate events; lines starting with ":" are keep-alives
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        chunk = json.loads(data)
+        usage = chunk.get("usage") or usage
+        for choice in chunk.get("choices") or []:
+            delta = choice.get("delta") or {}
+            if delta.get("reasoning_content"):
+                yield {"type": "reasoning", "text": delta["reasoning_content"]}
+            if delta.get("content"):
+                yield {"type": "content", "text": delta["content"]}
+            finish_reason = choice.get("finish_reason") or finish_reason
+    yield {"type": "done", "finish_reason": finish_reason, "usage": usage}
+
+
+async def _parse_ollama_stream(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Turn Ollama's newline-delimited JSON chat stream into chat deltas."""
+    async for line in lines:
+        if not line.strip():
+            continue
+        chunk = json.loads(line)
+        if chunk.get("error"):
+            raise ValueError(chunk["error"])
+        message = chunk.get("message") or {}
+        if message.get("thinking"):
+            yield {"type": "reasoning", "text": message["thinking"]}
+        if message.get("content"):
+            yield {"type": "content", "text": message["content"]}
+        if chunk.get("done"):
+            usage = {
+                "prompt_tokens": chunk.get("prompt_eval_count", 0),
+                "completion_tokens": chunk.get("eval_count", 0),
+            }
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            yield {"type": "done", "finish_reason": chunk.get("done_reason", "stop"),
+                   "usage": usage}
+            return
+    yield {"type": "done", "finish_reason": None, "usage": None}
+
+
+# Context windows (prompt + completion tokens) of common models, matched by
+# name prefix so dated versions ("gpt-4o-2024-08-06") are covered
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4.1": 1047576,
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "deepseek-chat": 65536,
+    "deepseek-reasoner": 65536,
+    "deepseek-coder": 65536,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+# Ollama's default num_ctx; longer prompts are silently cut by the server
+OLLAMA_CONTEXT_WINDOW = 4096
+
+
 class LLMManager(LoggerMixin):
     """
     Manages interactions with various Large Language Models (LLMs).
@@ -36,6 +104,10 @@ class LLMManager(LoggerMixin):
         self.timeout = self.config.llm_timeout_seconds
         self.max_retries = self.config.llm_max_retries
 
+        # Long-lived connection pool for the provider, created on first request
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
         self._configure_provider()
         self.logger.info(
             f"LLMManager initialized for provider: {self.provider} with model: {self.model_name}"
@@ -71,6 +143,70 @@ class LLMManager(LoggerMixin):
         else:
             raise LLMManagerError(f"Unsupported LLM provider: {self.provider}")
 
+    @property
+    def context_window(self) -> int:
+        """Prompt plus completion tokens the configured model accepts."""
+        if self.config.llm_context_window:
+            return self.config.llm_context_window
+        if self.provider == "ollama":
+            return OLLAMA_CONTEXT_WINDOW
+        name = (self.model_name or "").lower()
+        for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+            if name.startswith(prefix):
+                return MODEL_CONTEXT_WINDOWS[prefix]
+        return DEFAULT_CONTEXT_WINDOW
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the provider's pooled HTTP client, creating it on first use.
+
+        Connections are kept alive between calls, so only the first request
+        (and the first after an idle expiry) pays for TCP and TLS setup. A
+        client is bound to the event loop it was created on; a caller on a
+        different loop (e.g. a second ``asyncio.run``) gets a fresh one.
+        Callers that run the manager in a short-lived loop should await
+        :meth:`aclose` before that loop ends, which releases the connections.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and not self._client.is_closed:
+            if self._client_loop is loop:
+                return self._client
+            self.logger.debug("Event loop changed; creating a new LLM HTTP client")
+
+        http2 = self.config.llm_http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            self.logger.warning(
+                "LLM_HTTP2 is enabled but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+
+        headers = {"Content-Type": "application/json"}
+        if (
+            self.api_key and self.provider != "ollama"
+        ):  # Ollama does not use Bearer token typically
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.config.llm_max_connections,
+                max_keepalive_connections=self.config.llm_max_keepalive_connections,
+                keepalive_expiry=self.config.llm_keepalive_expiry_seconds,
+            ),
+            http2=http2,
+        )
+        self._client_loop = loop
+        self.logger.debug(
+            f"Created pooled HTTP client for {self.provider} (http2={http2})")
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client. It is recreated if used again."""
+        client, self._client = self._client, None
+        self._client_loop = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
     async def _make_request(
         self,
         endpoint: str,
@@ -82,33 +218,26 @@ class LLMManager(LoggerMixin):
             raise LLMManagerError("LLM base URL is not configured.")
 
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-        headers = {"Content-Type": "application/json"}
-        if (
-            self.api_key and self.provider != "ollama"
-        ):  # Ollama does not use Bearer token typically
-            headers["Authorization"] = f"Bearer {self.api_key}"
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    self.logger.debug(
-                        f"Sending {method} request to {url} with payload: {payload}"
-                    )
-                    if method == "POST":
-                        response = await client.post(url, headers=headers, json=payload)
-                    elif method == "GET":
-                        response = await client.get(
-                            url, headers=headers, params=payload
-                        )  # params for GET
-                    else:
-                        raise LLMManagerError(
-                            f"Unsupported HTTP method: {method}")
+                client = self._get_client()
+                self.logger.debug(
+                    f"Sending {method} request to {url} with payload: {payload}"
+                )
+                if method == "POST":
+                    response = await client.post(url, json=payload)
+                elif method == "GET":
+                    response = await client.get(url, params=payload)  # params for GET
+                else:
+                    raise LLMManagerError(
+                        f"Unsupported HTTP method: {method}")
 
-                    response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-                    response_data = response.json()
-                    self.logger.debug(
-                        f"Received response from {url}: {response_data}")
-                    return response_data
+                response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+                response_data = response.json()
+                self.logger.debug(
+                    f"Received response from {url}: {response_data}")
+                return response_data
             except httpx.HTTPStatusError as e:
                 self.logger.error(
                     f"HTTP error {e.response.status_code} for {e.request.url}: {e.response.text}"
@@ -149,41 +278,14 @@ class LLMManager(LoggerMixin):
             f"Failed to get a response from LLM after {self.max_retries} retries."
         )
 
-    async def generate_chat_completion(
+    def _chat_request(
         self,
         messages: List[Dict[str, str]],
-        max_tokens: Optional[int] = None,
-        temperature: float = 0.7,
-        stream: bool = False,  # Placeholder for future streaming support
-    ) -> Dict[str, Any]:  # Adjust return type if streaming is implemented
-        """
-        Generates a chat completion using the configured LLM provider.
-
-        Args:
-            messages: A list of message dictionaries, e.g.,
-                      [{"role": "user", "content": "Hello!"}].
-            max_tokens: The maximum number of tokens to generate.
-            temperature: Sampling temperature.
-            stream: Whether to stream the response (not fully implemented for all providers).
-
-        Returns:
-            The LLM's response, typically a dictionary containing the completion.
-        """
-        if self.provider == "mock":
-            self.logger.info(
-                f"Mocking chat completion for messages: {messages}")
-            return {
-                "choices": [
-                    {
-                        "message": {
-                            "role": "assistant",
-                            "content": "This is a mock response.",
-                        }
-                    }
-                ],
-                "usage": {"total_tokens": 0},
-            }
-
+        max_tokens: Optional[int],
+        temperature: float,
+        stream: bool,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the provider's chat endpoint and payload."""
         if not self.model_name:
             raise LLMManagerError("LLM model name is not configured.")
 
@@ -200,7 +302,7 @@ class LLMManager(LoggerMixin):
         if self.provider == "openai" or self.provider == "deepseek":
             endpoint = "chat/completions"
             if stream:
-                payload["stream"] = True  # OpenAI/DeepSeek support stream
+                payload["stream"] = True  # Server-sent events
         elif self.provider == "ollama":
             # Ollama has a slightly different API structure
             endpoint = "chat"
@@ -208,7 +310,7 @@ class LLMManager(LoggerMixin):
             # It might not support `temperature` or `max_tokens` in the same way directly in /api/chat
             # Often, these are part of the Modelfile or model options when running the model.
             # For simplicity, we pass them, but their effect depends on Ollama setup.
-            payload["stream"] = stream
+            payload["stream"] = stream  # Newline-delimited JSON when streaming
             if "max_tokens" in payload:  # Ollama might use options for this
                 payload.setdefault("options", {})["num_predict"] = payload.pop(
                     "max_tokens"
@@ -221,6 +323,66 @@ class LLMManager(LoggerMixin):
             raise LLMManagerError(
                 f"Chat completion not implemented for provider: {self.provider}"
             )
+        return endpoint, payload
+
+    async def generate_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Generates a chat completion using the configured LLM provider.
+
+        Args:
+            messages: A list of message dictionaries, e.g.,
+                      [{"role": "user", "content": "Hello!"}].
+            max_tokens: The maximum number of tokens to generate.
+            temperature: Sampling temperature.
+            stream: Receive the completion as a stream and assemble it. Use
+                :meth:`stream_chat_completion` to consume the deltas directly.
+
+        Returns:
+            The LLM's response in OpenAI chat completion format.
+        """
+        if stream:
+            content, reasoning = [], []
+            finish_reason, usage = None, None
+            async for delta in self.stream_chat_completion(
+                messages, max_tokens=max_tokens, temperature=temperature
+            ):
+                if delta["type"] == "content":
+                    content.append(delta["text"])
+                elif delta["type"] == "reasoning":
+                    reasoning.append(delta["text"])
+                else:
+                    finish_reason, usage = delta["finish_reason"], delta["usage"]
+
+            message = {"role": "assistant", "content": "".join(content)}
+            if reasoning:
+                message["reasoning_content"] = "".join(reasoning)
+            return {
+                "choices": [{"message": message, "finish_reason": finish_reason}],
+                "usage": usage or {},
+            }
+
+        if self.provider == "mock":
+            self.logger.info(
+                f"Mocking chat completion for messages: {messages}")
+            return {
+                "choices": [
+                    {
+                        "message": {
+                            "role": "assistant",
+                            "content": "This is a mock response.",
+                        }
+                    }
+                ],
+                "usage": {"total_tokens": 0},
+            }
+
+        endpoint, payload = self._chat_request(messages, max_tokens, temperature, stream=False)
 
         try:
             response_data = await self._make_request(endpoint, payload)
@@ -232,6 +394,95 @@ class LLMManager(LoggerMixin):
                 f"Failed to generate chat completion: {e}", exc_info=True)
             raise
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion as it is generated.
+
+        OpenAI and DeepSeek are read as server-sent events, Ollama as
+        newline-delimited JSON. Deltas are dictionaries with a ``type``:
+
+        - ``reasoning``: ``text`` of the model's reasoning (deepseek-reasoner's
+          ``reasoning_content``, Ollama's ``thinking``), which arrives first
+        - ``content``: ``text`` of the answer
+        - ``done``: last delta, with ``finish_reason`` and ``usage`` (or None)
+
+        Connection failures are retried until the first delta arrives; after
+        that an interrupted stream raises :class:`LLMManagerError`.
+
+        Args:
+            messages: A list of message dictionaries.
+            max_tokens: The maximum number of tokens to generate.
+            temperature: Sampling temperature.
+
+        Yields:
+            Delta dictionaries
+        """
+        if self.provider == "mock":
+            self.logger.info(
+                f"Mocking streamed chat completion for messages: {messages}")
+            for i, word in enumerate("This is a mock response.".split(" ")):
+                yield {"type": "content", "text": word if i == 0 else f" {word}"}
+            yield {"type": "done", "finish_reason": "stop", "usage": {"total_tokens": 0}}
+            return
+
+        if not self.base_url:
+            raise LLMManagerError("LLM base URL is not configured.")
+        endpoint, payload = self._chat_request(messages, max_tokens, temperature, stream=True)
+        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        parse = (
+            _parse_ollama_stream if self.provider == "ollama" else _parse_sse_stream
+        )
+
+        for attempt in range(self.max_retries):
+            started = False
+            try:
+                client = self._get_client()
+                self.logger.debug(f"Streaming POST request to {url}")
+                async with client.stream("POST", url, json=payload) as response:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    async for delta in parse(response.aiter_lines()):
+                        started = True
+                        yield delta
+                return
+            except httpx.HTTPStatusError as e:
+                self.logger.error(
+                    f"HTTP error {e.response.status_code} for {e.request.url}: {e.response.text}"
+                )
+                if e.response.status_code in [401, 403]:
+                    raise LLMManagerError(
+                        f"Authentication error: {e.response.text}"
+                    ) from e
+                if attempt == self.max_retries - 1:
+                    raise LLMManagerError(
+                        f"HTTP error after {self.max_retries} retries: {e}"
+                    ) from e
+                if e.response.status_code == 429:  # Rate limit
+                    self.logger.warning(
+                        "Rate limit exceeded. Retrying after delay...")
+                    await asyncio.sleep(
+                        self.config.llm_rate_limit_delay * (attempt + 1)
+                    )
+                else:
+                    await asyncio.sleep(1 * (attempt + 1))
+            except httpx.RequestError as e:
+                self.logger.error(f"Stream error for {url}: {e}")
+                if started:
+                    raise LLMManagerError(f"Stream interrupted: {e}") from e
+                if attempt == self.max_retries - 1:
+                    raise LLMManagerError(
+                        f"Request error after {self.max_retries} retries: {e}"
+                    ) from e
+                await asyncio.sleep(1 * (attempt + 1))
+            except ValueError as e:
+                raise LLMManagerError(f"Malformed stream chunk: {e}") from e
+
     async def generate_embedding(
         self, input_texts: List[str], embedding_model: Optional[str] = None
     ) -> List[List[float]]:
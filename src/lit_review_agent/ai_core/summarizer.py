@@ -1,15 +1,20 @@
 """Literature summarizer for generating academic summaries."""
 
 import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from .llm_manager import LLMManager, LLMManagerError
 from ..processing.text_processor import TextProcessor
 from ..utils.logger import get_logger, LoggerMixin
 from ..utils.config import Config
+from ..utils.tokenizer import get_token_counter
 
 logger = get_logger(__name__)
 
+# Share of the context window a prompt may fill, leaving room for token
+# count estimation error
+CONTEXT_FILL_RATIO = 0.9
+
 
 class SummarizerError(Exception):
     """Custom exception for Summarizer errors."""
@@ -29,37 +34,70 @@ class Summarizer(LoggerMixin):
         self.config = config
         self.logger.info("Summarizer initialized.")
 
-    async def summarize_text(
+    def _fit_text_to_budget(
+        self, text: str, system_prompt: str, user_template: str, max_tokens: int
+    ) -> str:
+        """
+        Truncate text so the full prompt plus the completion fits the model's context.
+
+        Args:
+            text: Text to be inserted into the prompt
+            system_prompt: System prompt
+            user_template: User prompt containing the ``{text_to_summarize}`` placeholder
+            max_tokens: Tokens reserved for the completion
+
+        Returns:
+            The text, truncated if necessary
+        """
+        counter = get_token_counter()
+        overhead = counter.count(system_prompt) + counter.count(
+            user_template.replace("{text_to_summarize}", "")
+        )
+        context_window = self.llm_manager.context_window
+        # Leave headroom for the gap between estimated and real token counts
+        budget = int(context_window * CONTEXT_FILL_RATIO) - max_tokens - overhead
+        if budget <= 0:
+            self.logger.warning(
+                "Prompt overhead exceeds the model's context window; sending text unchanged."
+            )
+            return text
+
+        text_tokens = counter.count(text)
+        if text_tokens <= budget:
+            return text
+
+        self.logger.warning(
+            f"Truncating input text from {text_tokens} to {budget} tokens to fit the "
+            f"{context_window}-token context window of {self.llm_manager.model_name}."
+        )
+        return counter.truncate(text, budget)
+
+    def _build_summary_request(
         self,
         text: str,
-        summary_type: str = "general",  # e.g., "general", "key_findings", "abstract_enhancement"
-        max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None,
-        prompt_template: Optional[str] = None,
-        context: Optional[str] = None,  # Optional context like research topic
-    ) -> str:
+        summary_type: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        prompt_template: Optional[str],
+        context: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], int, float]:
         """
-        Generates a summary for the given text using the configured LLM.
+        Build the chat messages and generation settings for a summary.
 
         Args:
             text: The text to summarize.
-            summary_type: A hint for the type of summary to generate, influencing the prompt.
-            max_tokens: Maximum tokens for the summary. Uses provider default from config if None.
-            temperature: Temperature for generation. Uses provider default from config if None.
-            prompt_template: A custom f-string template for the user prompt.
-                             Must include '{text_to_summarize}' and optionally '{context}'.
-            context: Optional contextual information (e.g., research topic) for the prompt.
+            summary_type: A hint for the type of summary to generate.
+            max_tokens: Maximum tokens for the summary, or None for the provider default.
+            temperature: Temperature for generation, or None for the provider default.
+            prompt_template: Optional custom user prompt template.
+            context: Optional contextual information for the prompt.
 
         Returns:
-            The generated summary string.
+            Tuple of (messages, max_tokens, temperature)
 
         Raises:
-            SummarizerError: If summarization fails.
+            SummarizerError: If the prompt template is missing a key.
         """
-        if not text.strip():
-            self.logger.warning("Attempted to summarize empty text.")
-            return ""
-
         provider_defaults = self.config.default_llm_completion_config.get(
             self.llm_manager.provider, {}
         )
@@ -104,6 +142,9 @@ class Summarizer(LoggerMixin):
 
         # Fill the text_to_summarize placeholder if not using a custom template that already did
         if "{text_to_summarize}" in user_prompt:
+            text = self._fit_text_to_budget(
+                text, system_prompt, user_prompt, final_max_tokens
+            )
             user_prompt = user_prompt.format(text_to_summarize=text)
 
         messages = [
@@ -119,6 +160,43 @@ class Summarizer(LoggerMixin):
             f"User Prompt: {user_prompt[:200]}..."
         )  # Log beginning of prompt
 
+        return messages, final_max_tokens, final_temperature
+
+    async def summarize_text(
+        self,
+        text: str,
+        summary_type: str = "general",  # e.g., "general", "key_findings", "abstract_enhancement"
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        prompt_template: Optional[str] = None,
+        context: Optional[str] = None,  # Optional context like research topic
+    ) -> str:
+        """
+        Generates a summary for the given text using the configured LLM.
+
+        Args:
+            text: The text to summarize.
+            summary_type: A hint for the type of summary to generate, influencing the prompt.
+            max_tokens: Maximum tokens for the summary. Uses provider default from config if None.
+            temperature: Temperature for generation. Uses provider default from config if None.
+            prompt_template: A custom f-string template for the user prompt.
+                             Must include '{text_to_summarize}' and optionally '{context}'.
+            context: Optional contextual information (e.g., research topic) for the prompt.
+
+        Returns:
+            The generated summary string.
+
+        Raises:
+            SummarizerError: If summarization fails.
+        """
+        if not text.strip():
+            self.logger.warning("Attempted to summarize empty text.")
+            return ""
+
+        messages, final_max_tokens, final_temperature = self._build_summary_request(
+            text, summary_type, max_tokens, temperature, prompt_template, context
+        )
+
         try:
             response = await self.llm_manager.generate_chat_completion(
                 messages=messages,
@@ -157,6 +235,62 @@ class Summarizer(LoggerMixin):
             )
             raise SummarizerError(f"An unexpected error occurred: {e}") from e
 
+    async def stream_summary(
+        self,
+        text: str,
+        summary_type: str = "general",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        prompt_template: Optional[str] = None,
+        context: Optional[str] = None,
+        include_reasoning: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a summary as the LLM generates it.
+
+        Takes the same arguments as :meth:`summarize_text`. Deltas are
+        forwarded as soon as they arrive, so callers can show the first
+        tokens while the rest is still being generated.
+
+        Args:
+            text: The text to summarize.
+            summary_type: A hint for the type of summary to generate.
+            max_tokens: Maximum tokens for the summary.
+            temperature: Temperature for generation.
+            prompt_template: Optional custom user prompt template.
+            context: Optional contextual information for the prompt.
+            include_reasoning: Also yield ``reasoning`` deltas of reasoning
+                models (deepseek-reasoner)
+
+        Yields:
+            Delta dictionaries from :meth:`LLMManager.stream_chat_completion`
+
+        Raises:
+            SummarizerError: If summarization fails.
+        """
+        if not text.strip():
+            self.logger.warning("Attempted to summarize empty text.")
+            return
+
+        messages, final_max_tokens, final_temperature = self._build_summary_request(
+            text, summary_type, max_tokens, temperature, prompt_template, context
+        )
+
+        try:
+            async for delta in self.llm_manager.stream_chat_completion(
+                messages=messages,
+                max_tokens=final_max_tokens,
+                temperature=final_temperature,
+            ):
+                if delta["type"] == "reasoning" and not include_reasoning:
+                    continue
+                yield delta
+        except LLMManagerError as e:
+            self.logger.error(
+                f"LLMManager error during streamed summarization: {e}", exc_info=True
+            )
+            raise SummarizerError(f"LLM interaction failed: {e}") from e
+
 
 if __name__ == "__main__":
     # Test for Summarizer
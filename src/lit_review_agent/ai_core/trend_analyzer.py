@@ -9,6 +9,10 @@ from .llm_manager import LLMManager
 from ..processing.text_processor import TextProcessor
 from ..retrieval.base_retriever import LiteratureItem
 from ..utils.logger import LoggerMixin
+from ..utils.tokenizer import get_token_counter
+
+# Tokens kept free for the instructions and the completion in packed prompts
+PROMPT_RESERVED_TOKENS = 1024
 
 
 class TrendAnalyzer(LoggerMixin):
@@ -101,10 +105,10 @@ class TrendAnalyzer(LoggerMixin):
         """
         all_keywords = []
         keyword_cooccurrence = {}
+        keywords_per_paper = self._resolve_paper_keywords(papers)
 
-        for paper in papers:
-            if paper.keywords:
-                paper_keywords = [kw.lower().strip() for kw in paper.keywords]
+        for paper_keywords in keywords_per_paper:
+            if paper_keywords:
                 all_keywords.extend(paper_keywords)
 
                 # Analyze co-occurrence
@@ -119,7 +123,7 @@ class TrendAnalyzer(LoggerMixin):
         keyword_freq = Counter(all_keywords)
 
         # Find emerging vs declining keywords by year
-        keyword_by_year = self._analyze_keyword_by_year(papers)
+        keyword_by_year = self._analyze_keyword_by_year(papers, keywords_per_paper)
 
         trend_analysis = {
             "top_keywords": keyword_freq.most_common(20),
@@ -339,18 +343,58 @@ class TrendAnalyzer(LoggerMixin):
 
         return category_evolution
 
-    def _analyze_keyword_by_year(self, papers: List[LiteratureItem]) -> Dict[str, Dict]:
+    def _resolve_paper_keywords(self, papers: List[LiteratureItem]) -> List[List[str]]:
+        """
+        Get normalized keywords for each paper.
+
+        Papers without author keywords get keywords extracted from their text
+        in one batch, so corpus backends (TF-IDF/YAKE) see the whole set.
+        """
+        resolved = [
+            [kw.lower().strip() for kw in paper.keywords] if paper.keywords else []
+            for paper in papers
+        ]
+
+        missing = [
+            i
+            for i, paper in enumerate(papers)
+            if not paper.keywords and (paper.full_text or paper.abstract)
+        ]
+        if missing:
+            try:
+                # Score against the corpus statistics without refitting them
+                # on the trend subset
+                extracted = self.text_processor.extract_research_keywords_batch(
+                    [papers[i].full_text or papers[i].abstract for i in missing],
+                    max_keywords=10,
+                    fit=False,
+                )
+                for i, keywords in zip(missing, extracted):
+                    resolved[i] = [kw.lower().strip() for kw in keywords]
+            except Exception as e:
+                self.logger.warning(f"Could not extract keywords for trends: {e}")
+
+        return resolved
+
+    def _analyze_keyword_by_year(
+        self,
+        papers: List[LiteratureItem],
+        keywords_per_paper: Optional[List[List[str]]] = None,
+    ) -> Dict[str, Dict]:
         """Analyze keyword trends by year."""
         keyword_by_year = {}
+        if keywords_per_paper is None:
+            keywords_per_paper = [
+                [kw.lower().strip() for kw in paper.keywords or []] for paper in papers
+            ]
 
-        for paper in papers:
-            if paper.keywords and paper.publication_date:
+        for paper, keywords in zip(papers, keywords_per_paper):
+            if keywords and paper.publication_date:
                 year = str(paper.publication_date.year)
                 if year not in keyword_by_year:
                     keyword_by_year[year] = Counter()
 
-                for keyword in paper.keywords:
-                    keyword_by_year[year][keyword.lower().strip()] += 1
+                keyword_by_year[year].update(keywords)
 
         return {
             year: dict(counter.most_common(10))
@@ -430,6 +474,11 @@ class TrendAnalyzer(LoggerMixin):
 
         return emerging[:15]
 
+    def _pack_texts(self, texts: List[str], separator: str) -> List[str]:
+        """Keep as many texts as fit in the model's context window."""
+        budget = self.llm_manager.context_window - PROMPT_RESERVED_TOKENS
+        return get_token_counter().pack(texts, max(budget, 0), separator)
+
     async def _generate_temporal_analysis(
         self, yearly_texts: List[str]
     ) -> Optional[str]:
@@ -450,7 +499,8 @@ class TrendAnalyzer(LoggerMixin):
 
     async def _analyze_methodologies(self, texts: List[str]) -> Optional[str]:
         """Analyze methodological trends using AI."""
-        combined_text = "\n\n---\n\n".join(texts[:10])  # Limit for token constraints
+        separator = "\n\n---\n\n"
+        combined_text = separator.join(self._pack_texts(texts[:10], separator))
 
         system_prompt = (
             "You are a methodology expert. Analyze research methodologies, "
@@ -471,7 +521,8 @@ class TrendAnalyzer(LoggerMixin):
         self, texts: List[str], min_year: int
     ) -> Optional[str]:
         """Identify emerging topics using AI analysis."""
-        combined_text = "\n\n---\n\n".join(texts[:8])  # Limit for token constraints
+        separator = "\n\n---\n\n"
+        combined_text = separator.join(self._pack_texts(texts[:8], separator))
 
         system_prompt = (
             "You are a research trend analyst specializing in identifying "
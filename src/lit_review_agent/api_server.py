@@ -4,6 +4,7 @@ FastAPI 服务器 - 为 Vue3 前端提供 API 接口
 """
 
 import asyncio
+import json
 import sys
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -13,6 +14,7 @@ import time
 
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from datetime import timedelta
@@ -116,7 +118,10 @@ async def lifespan(app: FastAPI):
     global literature_agent
     if literature_agent:
         try:
-            # 清理资源
+            # 清理资源：关闭 LLM 连接池等
+            aclose = getattr(literature_agent, "aclose", None)
+            if aclose is not None:
+                await aclose()
             literature_agent = None
             print(">> 资源清理完成")
         except Exception as e:
@@ -177,6 +182,14 @@ class ReportRequest(BaseModel):
     title: str
 
 
+class SummaryStreamRequest(BaseModel):
+    text: Optional[str] = None  # Text to summarize
+    paperIds: List[str] = []  # Or stored papers to summarize together
+    summaryType: str = "general"
+    maxTokens: Optional[int] = None
+    includeReasoning: bool = False  # Forward deepseek-reasoner reasoning tokens
+
+
 # 响应模型
 class Paper(BaseModel):
     title: str
@@ -653,6 +666,61 @@ async def generate_report(
         raise HTTPException(status_code=500, detail=f"报告生成失败: {str(e)}")
 
 
+def _sse_event(event: str, data: Dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/summarize/stream")
+@rate_limit_api
+async def stream_summary(
+    request: SummaryStreamRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """以 SSE 流式返回摘要（reasoning / content / done / error 事件）"""
+    agent = get_agent()
+    summarizer = getattr(agent, "summarizer", None)
+    if summarizer is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Literature agent is not available for summarization"
+        )
+
+    text = request.text or ""
+    if not text.strip() and request.paperIds:
+        papers = await agent.vector_store.aget_items(request.paperIds)
+        text = "\n\n---\n\n".join(
+            paper["document"] for paper in papers if paper["document"])
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Nothing to summarize")
+
+    async def events():
+        try:
+            async for delta in summarizer.stream_summary(
+                text=text,
+                summary_type=request.summaryType,
+                max_tokens=request.maxTokens,
+                include_reasoning=request.includeReasoning,
+            ):
+                if delta["type"] == "done":
+                    yield _sse_event("done", {
+                        "finishReason": delta["finish_reason"],
+                        "usage": delta["usage"],
+                    })
+                else:
+                    yield _sse_event(delta["type"], {"text": delta["text"]})
+        except Exception as e:
+            print(f"流式摘要失败: {e}")
+            yield _sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so tokens reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -13,7 +13,7 @@ from rich.progress import track
 from rich.table import Table
 from rich.prompt import Prompt
 
-from .agent import LiteratureAgent
+from .agent import LiteratureAgent, configure_shared_models
 from .utils.config import Config
 from .utils.logger import get_logger, setup_logger
 from .__init__ import __version__ as agent_version
@@ -31,6 +31,30 @@ app = typer.Typer(
 console = Console()
 
 
+def _run_agent(agent: LiteratureAgent, coro):
+    """
+    Run an agent coroutine in its own event loop.
+
+    The agent's pooled LLM client is bound to the loop, so it is closed
+    before ``asyncio.run`` returns; the next call opens a fresh one.
+
+    Args:
+        agent: Agent the coroutine belongs to
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+
+    async def run():
+        try:
+            return await coro
+        finally:
+            await agent.llm_manager.aclose()
+
+    return asyncio.run(run())
+
+
 @app.callback(invoke_without_command=True)
 def main_callback(
     ctx: typer.Context,
@@ -197,7 +221,8 @@ def review(
         )
 
         # Run the literature review
-        review_results = asyncio.run(
+        review_results = _run_agent(
+            agent,
             agent.conduct_literature_review(
                 research_topic=research_topic,
                 max_papers=max_papers,
@@ -248,7 +273,8 @@ def review(
                         json.dump(review_results, f, indent=2, ensure_ascii=False)
                 elif output_format.lower() == "markdown":
                     # Generate markdown report
-                    report = asyncio.run(
+                    report = _run_agent(
+                        agent,
                         agent.generate_full_report(
                             papers=review_results["papers"],
                             topic=research_topic,
@@ -303,7 +329,8 @@ def generate_report(
         agent = LiteratureAgent(config=agent_config)
 
         # Generate report
-        report = asyncio.run(
+        report = _run_agent(
+            agent,
             agent.generate_full_report(
                 papers=review_data.get("papers", []), topic=title, output_format=format
             )
@@ -342,7 +369,7 @@ def search(
         agent = LiteratureAgent(config=agent_config)
 
         # Search
-        results = asyncio.run(agent.search_similar_papers(query, n_results))
+        results = _run_agent(agent, agent.search_similar_papers(query, n_results))
 
         if results:
             console.print(
@@ -403,6 +430,34 @@ def stats():
         console.print(f"[bold red]Error getting statistics:[/bold red] {e}")
 
 
+@app.command()
+def sidecar(
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", "-s",
+        help="Unix socket to listen on (defaults to INFERENCE_SIDECAR_SOCKET)",
+    ),
+    keyword_workers: int = typer.Option(
+        2, "--keyword-workers", help="Threads running keyword extraction"
+    ),
+):
+    """
+    Run the inference sidecar shared by API workers.
+    """
+    from .processing.inference_sidecar import run_sidecar
+
+    agent_config = Config()
+    socket_path = socket_path or agent_config.inference_sidecar_socket
+    if not socket_path:
+        console.print(
+            "[bold red]No socket given:[/bold red] use --socket or set INFERENCE_SIDECAR_SOCKET"
+        )
+        raise typer.Exit(1)
+
+    configure_shared_models(agent_config)
+    console.print(f"[bold cyan]🧠 Inference sidecar listening on[/bold cyan] {socket_path}")
+    run_sidecar(socket_path, keyword_workers=keyword_workers)
+
+
 if __name__ == "__main__":
     # This allows running the CLI directly with `python -m src.lit_review_agent.cli`
     # or just `python src/lit_review_agent/cli.py`
@@ -4,10 +4,17 @@ from .text_processor import TextProcessor
 from .embeddings_manager import EmbeddingsManager
 from .chunking_strategy import ChunkingStrategy
 from .vector_store import VectorStore
+from .sharded_vector_store import ShardedVectorStore
+from .reranker import CrossEncoderReranker
+from .inference_sidecar import InferenceSidecarClient, InferenceSidecarServer
 
 __all__ = [
     "TextProcessor",
     "EmbeddingsManager",
     "ChunkingStrategy",
     "VectorStore",
+    "ShardedVectorStore",
+    "CrossEncoderReranker",
+    "InferenceSidecarClient",
+    "InferenceSidecarServer",
 ]
@@ -0,0 +1,833 @@
+"""In-process NumPy ANN index with a ChromaDB-compatible collection interface.
+
+Vectors are stored L2-normalized in an append-only float32 file that is
+memory-mapped on open, documents and metadata live in SQLite, and an IVF
+(inverted file) index over spherical k-means centroids narrows each query to
+a few lists. Opening a collection reads no vectors, so it is instant even
+for millions of rows.
+
+Collections can also keep compact quantized codes next to the vectors: int8
+scalar codes (4x smaller) or 1-bit sign codes (32x smaller). Queries then
+scan only the codes to shortlist candidates and rescore that shortlist
+against the full-precision vectors, so the float32 file is mostly left on
+disk.
+
+Only the subset of the Chroma API used by :class:`VectorStore` is provided:
+``add``, ``upsert``, ``get``, ``query``, ``delete`` and ``count``. Distances
+are cosine distances (``1 - cosine similarity``).
+"""
+
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.logger import LoggerMixin
+
+# Collections smaller than this are searched exactly
+BRUTE_FORCE_THRESHOLD = 20_000
+# Rebuild the IVF index once this share of rows was added after the last build
+REBUILD_FRACTION = 0.1
+# Rows scored per matrix multiplication, bounding temporary memory
+SCORE_BLOCK_ROWS = 65_536
+
+QUANTIZATION_MODES = ("none", "int8", "binary")
+# Shortlisted candidates per requested result, rescored at full precision
+DEFAULT_RESCORE_FACTORS = {"none": 1, "int8": 4, "binary": 16}
+# int8 codes clip components above this quantile of the first batch written
+INT8_CALIBRATION_QUANTILE = 0.9999
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+_COMPARISON_OPERATORS = {
+    "$eq": "=",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+}
+
+
+def where_to_sql(where: Optional[Dict[str, Any]],
+                 column: str = "metadata") -> Tuple[str, List[Any]]:
+    """
+    Translate a Chroma ``where`` filter into an SQLite expression.
+
+    Supports ``$eq``, ``$ne``, ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$in``,
+    ``$nin``, ``$and`` and ``$or`` over a JSON metadata column.
+
+    Args:
+        where: Chroma-style metadata filter
+        column: Name of the JSON metadata column
+
+    Returns:
+        Tuple of (SQL expression, parameters)
+    """
+    if not where:
+        return "1", []
+
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [where_to_sql(sub, column) for sub in condition]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + joiner.join(sql for sql, _ in parts) + ")")
+            for _, sub_params in parts:
+                params.extend(sub_params)
+            continue
+
+        field = f"json_extract({column}, ?)"
+        path = f'$."{key}"'
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for op, value in condition.items():
+            if op in _COMPARISON_OPERATORS:
+                clauses.append(f"{field} {_COMPARISON_OPERATORS[op]} ?")
+                params.extend([path, value])
+            elif op in ("$in", "$nin"):
+                values = list(value)
+                if not values:
+                    clauses.append("0" if op == "$in" else "1")
+                    continue
+                placeholders = ", ".join("?" for _ in values)
+                negation = "NOT " if op == "$nin" else ""
+                clauses.append(f"{field} {negation}IN ({placeholders})")
+                params.append(path)
+                params.extend(values)
+            else:
+                raise ValueError(f"Unsupported where operator: {op}")
+
+    return " AND ".join(clauses), params
+
+
+class NumpyCollection(LoggerMixin):
+    """A persistent collection searched with an in-process IVF index."""
+
+    def __init__(self, directory: Path, name: str,
+                 metadata: Optional[Dict[str, Any]] = None,
+                 n_probe: int = 8,
+                 quantization: str = "none",
+                 rescore_factor: Optional[int] = None):
+        """
+        Open or create a collection.
+
+        Args:
+            directory: Directory holding the collection files
+            name: Collection name
+            metadata: Collection metadata (stored for reference)
+            n_probe: Number of IVF lists searched per query
+            quantization: ``none``, ``int8`` or ``binary`` codes used to
+                shortlist candidates before full-precision rescoring
+            rescore_factor: Candidates shortlisted per requested result.
+                Higher values raise recall at the cost of latency; defaults
+                depend on the quantization mode.
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization: {quantization}. "
+                f"Choose from: {', '.join(QUANTIZATION_MODES)}")
+
+        self.name = name
+        self.metadata = metadata or {}
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.n_probe = n_probe
+        # Bulk loads switch this off and build the index once at the end
+        self.auto_build_index = True
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor or DEFAULT_RESCORE_FACTORS[quantization])
+
+        self._vectors_path = self.directory / "vectors.f32"
+        self._codes_path = self.directory / f"codes.{quantization}"
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            str(self.directory / "records.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "row INTEGER PRIMARY KEY, id TEXT NOT NULL, document TEXT, "
+            "metadata TEXT, deleted INTEGER NOT NULL DEFAULT 0)")
+        self._db.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS records_live_id "
+            "ON records(id) WHERE deleted = 0")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+        self._dim: Optional[int] = None
+        dim = self._db.execute("SELECT value FROM info WHERE key = 'dim'").fetchone()
+        if dim:
+            self._dim = int(dim[0])
+        scale = self._db.execute(
+            "SELECT value FROM info WHERE key = 'int8_scale'").fetchone()
+        self._int8_scale: Optional[float] = float(scale[0]) if scale else None
+
+        self._rows = self._stored_rows()
+        self._mmap: Optional[np.memmap] = None
+        self._codes_mmap: Optional[np.memmap] = None
+        self._sync_codes()
+        self._alive = np.ones(self._rows, dtype=bool)
+        for (row,) in self._db.execute("SELECT row FROM records WHERE deleted = 1"):
+            self._alive[row] = False
+
+        self._centroids: Optional[np.ndarray] = None
+        self._list_rows: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        self._indexed_rows = 0
+        self._load_index()
+
+    # Storage
+
+    def _stored_rows(self) -> int:
+        """Number of vector rows on disk that have a record."""
+        if self._dim is None or not self._vectors_path.exists():
+            return 0
+        file_rows = self._vectors_path.stat().st_size // (self._dim * 4)
+        (max_row,) = self._db.execute("SELECT MAX(row) FROM records").fetchone()
+        record_rows = 0 if max_row is None else max_row + 1
+        rows = min(file_rows, record_rows)
+        if file_rows != rows:
+            # Drop vectors appended without a committed record
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(rows * self._dim * 4)
+        if record_rows != rows:
+            self._db.execute("DELETE FROM records WHERE row >= ?", (rows,))
+            self._db.commit()
+        return rows
+
+    def _vectors(self) -> np.ndarray:
+        """Memory map over every stored vector."""
+        if self._rows == 0:
+            return np.empty((0, self._dim or 0), dtype=np.float32)
+        if self._mmap is None or self._mmap.shape[0] != self._rows:
+            self._mmap = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                                   shape=(self._rows, self._dim))
+        return self._mmap
+
+    def _code_shape(self) -> Tuple[int, type]:
+        """Bytes per code row and code dtype for the quantization mode."""
+        if self.quantization == "binary":
+            return (self._dim + 7) // 8, np.uint8
+        return self._dim, np.int8
+
+    def _codes(self) -> Optional[np.ndarray]:
+        """Memory map over every stored code, or None without quantization."""
+        if self.quantization == "none" or self._rows == 0:
+            return None
+        width, dtype = self._code_shape()
+        if self._codes_mmap is None or self._codes_mmap.shape[0] != self._rows:
+            self._codes_mmap = np.memmap(self._codes_path, dtype=dtype, mode="r",
+                                         shape=(self._rows, width))
+        return self._codes_mmap
+
+    def _encode_codes(self, vectors: np.ndarray) -> np.ndarray:
+        """Quantize normalized vectors into codes."""
+        if self.quantization == "binary":
+            return np.packbits(vectors > 0, axis=1)
+
+        if self._int8_scale is None:
+            # Calibrate once; later appends reuse the stored scale
+            peak = float(np.quantile(np.abs(vectors), INT8_CALIBRATION_QUANTILE))
+            self._int8_scale = 127.0 / peak if peak > 0 else 127.0
+            self._db.execute("INSERT OR REPLACE INTO info VALUES ('int8_scale', ?)",
+                             (repr(self._int8_scale),))
+        return np.clip(np.rint(vectors * self._int8_scale), -127, 127).astype(np.int8)
+
+    def _sync_codes(self) -> None:
+        """Trim or backfill the code file so it covers exactly the stored rows."""
+        if self.quantization == "none" or self._dim is None:
+            return
+
+        width, _ = self._code_shape()
+        code_rows = (self._codes_path.stat().st_size // width
+                     if self._codes_path.exists() else 0)
+        if code_rows > self._rows:
+            with open(self._codes_path, "r+b") as f:
+                f.truncate(self._rows * width)
+        elif code_rows < self._rows:
+            # First use of this mode, or a crash before the codes were written
+            vectors = self._vectors()
+            with open(self._codes_path, "ab") as f:
+                for start in range(code_rows, self._rows, SCORE_BLOCK_ROWS):
+                    block = np.asarray(vectors[start:start + SCORE_BLOCK_ROWS])
+                    f.write(self._encode_codes(block).tobytes())
+            self._db.commit()
+            self.logger.info(
+                f"Encoded {self._rows - code_rows} {self.quantization} codes "
+                f"for '{self.name}'")
+
+    def _load_index(self) -> None:
+        """Memory-map a previously built IVF index."""
+        paths = [self.directory / f"{part}.npy"
+                 for part in ("centroids", "list_rows", "list_offsets")]
+        if not all(path.exists() for path in paths):
+            return
+        self._centroids = np.load(paths[0], mmap_mode="r")
+        self._list_rows = np.load(paths[1], mmap_mode="r")
+        self._list_offsets = np.load(paths[2])
+        self._indexed_rows = int(self._list_offsets[-1])
+
+    # Chroma-compatible API
+
+    def count(self) -> int:
+        """Number of live records."""
+        return int(self._alive.sum())
+
+    def add(self, ids: List[str], embeddings: Sequence[Sequence[float]],
+            documents: Optional[List[str]] = None,
+            metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Add new records. Raises ValueError if an ID already exists."""
+        with self._lock:
+            vectors, records = self._prepare(ids, embeddings, documents, metadatas)
+            existing = self._live_rows(ids)
+            if existing:
+                raise ValueError(f"IDs already exist: {sorted(existing)[:5]}")
+            self._append(vectors, records)
+
+    def upsert(self, ids: List[str], embeddings: Sequence[Sequence[float]],
+               documents: Optional[List[str]] = None,
+               metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Insert new records and replace existing ones."""
+        with self._lock:
+            # Validate before anything is tombstoned; a rejected call changes nothing
+            vectors, records = self._prepare(ids, embeddings, documents, metadatas)
+            self._append(vectors, records,
+                         replaced_rows=list(self._live_rows(ids).values()))
+
+    def delete(self, ids: Optional[List[str]] = None,
+               where: Optional[Dict[str, Any]] = None) -> None:
+        """Delete records by ID and/or metadata filter."""
+        with self._lock:
+            sql, params = self._select_sql(ids, where)
+            rows = [row for (row,) in self._db.execute(
+                f"SELECT row FROM records WHERE {sql}", params)]
+            self._mark_deleted(rows)
+
+    def get(self, ids: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None,
+            limit: Optional[int] = None, offset: Optional[int] = None,
+            include: Iterable[str] = ("metadatas", "documents")) -> Dict[str, Any]:
+        """Get records by ID and/or metadata filter."""
+        sql, params = self._select_sql(ids, where)
+        query = f"SELECT row, id, document, metadata FROM records WHERE {sql} ORDER BY row"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params = params + [-1 if limit is None else limit, offset or 0]
+
+        with self._lock:
+            records = self._db.execute(query, params).fetchall()
+            vectors = self._vectors() if "embeddings" in include else None
+
+        if ids is not None:
+            # Preserve the requested ID order, as Chroma does
+            position = {item_id: i for i, item_id in enumerate(ids)}
+            records.sort(key=lambda record: position.get(record[1], len(position)))
+
+        return self._format_records(records, include, vectors)
+
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 10,
+              where: Optional[Dict[str, Any]] = None,
+              include: Iterable[str] = ("metadatas", "documents", "distances")
+              ) -> Dict[str, Any]:
+        """Find the nearest records for each query embedding."""
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+
+        # Snapshot a consistent view; scoring then runs without the lock
+        with self._lock:
+            vectors = self._vectors()
+            codes = self._codes()
+            allowed = self._allowed_rows(where)
+            candidates = [self._candidate_rows(query, allowed) for query in queries]
+
+        results: Dict[str, List[Any]] = {
+            "ids": [], "distances": [], "documents": [], "metadatas": []}
+        for query, query_candidates in zip(queries, candidates):
+            rows, scores = self._search(vectors, codes, query, query_candidates,
+                                        n_results)
+            with self._lock:
+                records = self._records_by_row(rows)
+            formatted = self._format_records(records, include, None)
+            results["ids"].append(formatted["ids"])
+            results["distances"].append([float(1.0 - s) for s in scores])
+            results["documents"].append(formatted["documents"] or [])
+            results["metadatas"].append(formatted["metadatas"] or [])
+
+        for key in ("documents", "metadatas", "distances"):
+            if key not in include:
+                results[key] = None
+        results["embeddings"] = None
+        return results
+
+    def evaluate_quantization(self, n_queries: int = 100, k: int = 10,
+                              seed: int = 0) -> Dict[str, Any]:
+        """
+        Measure recall and latency of quantized search against exact search.
+
+        Stored vectors are sampled as queries and searched over every live
+        row, once exactly and once through the quantized shortlist, so the
+        report isolates the effect of quantization and ``rescore_factor``.
+
+        Args:
+            n_queries: Number of sampled queries
+            k: Results per query
+            seed: Random seed for sampling queries
+
+        Returns:
+            Dictionary with recall@k, mean latencies and memory per vector
+        """
+        with self._lock:
+            vectors = self._vectors()
+            codes = self._codes()
+            alive_rows = np.flatnonzero(self._alive)
+
+        report: Dict[str, Any] = {
+            "quantization": self.quantization,
+            "rescore_factor": self.rescore_factor,
+            "vectors": len(alive_rows),
+            "k": k,
+        }
+        if len(alive_rows) == 0:
+            return report
+
+        width, dtype = self._code_shape()
+        float_bytes = self._dim * 4
+        code_bytes = width * np.dtype(dtype).itemsize if codes is not None else float_bytes
+
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(alive_rows, size=min(n_queries, len(alive_rows)), replace=False)
+        queries = np.asarray(vectors[np.sort(sample)])
+
+        exact_seconds = quantized_seconds = 0.0
+        overlap = 0
+        for query in queries:
+            started = time.perf_counter()
+            exact_rows, _ = self._score(vectors, query, alive_rows, k)
+            exact_seconds += time.perf_counter() - started
+
+            started = time.perf_counter()
+            rows, _ = self._search(vectors, codes, query, alive_rows, k)
+            quantized_seconds += time.perf_counter() - started
+
+            overlap += len(np.intersect1d(exact_rows, rows))
+
+        expected = len(queries) * min(k, len(alive_rows))
+        report.update({
+            "queries": len(queries),
+            "recall_at_k": overlap / expected,
+            "exact_ms": 1000 * exact_seconds / len(queries),
+            "quantized_ms": 1000 * quantized_seconds / len(queries),
+            "float_bytes_per_vector": float_bytes,
+            "code_bytes_per_vector": code_bytes,
+            "compression": float_bytes / code_bytes,
+        })
+        return report
+
+    # Index management
+
+    def build_index(self, n_lists: Optional[int] = None, iterations: int = 10,
+                    sample_size: int = 100_000, seed: int = 0) -> None:
+        """
+        Build (or rebuild) the IVF index with spherical k-means.
+
+        Args:
+            n_lists: Number of inverted lists (defaults to ~sqrt of the row count)
+            iterations: k-means iterations
+            sample_size: Rows sampled to train the centroids
+            seed: Random seed
+        """
+        with self._lock:
+            vectors = self._vectors()
+            alive_rows = np.flatnonzero(self._alive)
+            if len(alive_rows) == 0:
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(len(alive_rows))))
+            n_lists = min(n_lists, len(alive_rows))
+
+            rng = np.random.default_rng(seed)
+            sample = rng.choice(alive_rows, size=min(sample_size, len(alive_rows)),
+                                replace=False)
+            sample_vectors = np.asarray(vectors[np.sort(sample)])
+            centroids = sample_vectors[rng.choice(len(sample_vectors), n_lists,
+                                                  replace=False)].copy()
+
+            for _ in range(iterations):
+                assignment = _assign(sample_vectors, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample_vectors)
+                empty = np.bincount(assignment, minlength=n_lists) == 0
+                sums[empty] = centroids[empty]
+                centroids = _normalize(sums)
+
+            # Assign every row (deleted rows too, they are masked at query time)
+            assignment = np.concatenate([
+                _assign(np.asarray(vectors[start:start + SCORE_BLOCK_ROWS]), centroids)
+                for start in range(0, self._rows, SCORE_BLOCK_ROWS)
+            ])
+            list_rows = np.argsort(assignment, kind="stable").astype(np.int64)
+            list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+            np.cumsum(np.bincount(assignment, minlength=n_lists), out=list_offsets[1:])
+
+            for part, array in (("centroids", centroids), ("list_rows", list_rows),
+                                ("list_offsets", list_offsets)):
+                tmp = self.directory / f"{part}.tmp.npy"
+                np.save(tmp, array)
+                tmp.replace(self.directory / f"{part}.npy")
+
+            self._load_index()
+            self.logger.info(
+                f"Built IVF index for '{self.name}': {n_lists} lists over {self._rows} rows")
+
+    # Internals
+
+    def _prepare(self, ids: List[str], embeddings: Sequence[Sequence[float]],
+                 documents: Optional[List[str]],
+                 metadatas: Optional[List[Dict[str, Any]]]
+                 ) -> Tuple[np.ndarray, List[Tuple[str, Optional[str], str]]]:
+        """
+        Validate records and convert them to their stored form.
+
+        Args:
+            ids: Record IDs
+            embeddings: One embedding per ID
+            documents: Optional document per ID
+            metadatas: Optional metadata dict per ID
+
+        Returns:
+            Tuple of (normalized vectors, (id, document, metadata JSON) rows)
+
+        Raises:
+            ValueError: On duplicate IDs, mismatched lengths or a wrong
+                embedding dimension
+            TypeError: If metadata cannot be serialized to JSON
+        """
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate IDs in a single call")
+        for name, values in (("documents", documents), ("metadatas", metadatas)):
+            if values and len(values) != len(ids):
+                raise ValueError(f"Got {len(values)} {name} for {len(ids)} IDs")
+        if not ids:
+            return np.empty((0, self._dim or 0), dtype=np.float32), []
+
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids):
+            raise ValueError(f"Got {len(vectors)} embeddings for {len(ids)} IDs")
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match {self._dim}")
+
+        records = [
+            (item_id,
+             documents[i] if documents else None,
+             json.dumps(metadatas[i] if metadatas else {}))
+            for i, item_id in enumerate(ids)
+        ]
+        return vectors, records
+
+    def _append(self, vectors: np.ndarray,
+                records: List[Tuple[str, Optional[str], str]],
+                replaced_rows: Sequence[int] = ()) -> None:
+        """
+        Append prepared records, tombstoning the rows they replace.
+
+        The tombstones and inserts form one transaction, and the vector and
+        code files are written at the offset of the first new row. On any
+        failure the transaction is rolled back and both files are truncated
+        back, so record rows and vector rows stay aligned.
+
+        Args:
+            vectors: Normalized vectors from :meth:`_prepare`
+            records: Stored records from :meth:`_prepare`
+            replaced_rows: Live rows of the same IDs to tombstone
+        """
+        if not records:
+            return
+
+        start = self._rows
+        new_dim = self._dim is None
+        int8_scale = self._int8_scale
+        if new_dim:
+            self._dim = vectors.shape[1]
+        code_width, _ = self._code_shape()
+        offsets = [(self._vectors_path, start * self._dim * 4)]
+        if self.quantization != "none":
+            offsets.append((self._codes_path, start * code_width))
+
+        try:
+            if new_dim:
+                self._db.execute("INSERT OR REPLACE INTO info VALUES ('dim', ?)",
+                                 (str(self._dim),))
+            self._db.executemany("UPDATE records SET deleted = 1 WHERE row = ?",
+                                 [(row,) for row in replaced_rows])
+            self._db.executemany(
+                "INSERT INTO records (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                [(start + i, *record) for i, record in enumerate(records)])
+
+            _write_at(self._vectors_path, offsets[0][1], vectors.tobytes())
+            if self.quantization != "none":
+                _write_at(self._codes_path, offsets[1][1],
+                          self._encode_codes(vectors).tobytes())
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            for path, size in offsets:
+                if path.exists() and path.stat().st_size > size:
+                    with open(path, "r+b") as f:
+                        f.truncate(size)
+            self._int8_scale = int8_scale
+            if new_dim:
+                self._dim = None
+            raise
+
+        if len(replaced_rows):
+            self._alive[list(replaced_rows)] = False
+        self._rows += len(records)
+        self._alive = np.concatenate([self._alive, np.ones(len(records), dtype=bool)])
+
+        if (self.auto_build_index and self._rows >= BRUTE_FORCE_THRESHOLD
+                and self._rows - self._indexed_rows > REBUILD_FRACTION * self._rows):
+            self.build_index()
+
+    def _live_rows(self, ids: List[str]) -> Dict[str, int]:
+        """Map IDs that exist to their current row."""
+        rows: Dict[str, int] = {}
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows.update(self._db.execute(
+                f"SELECT id, row FROM records WHERE deleted = 0 AND id IN ({placeholders})",
+                batch).fetchall())
+        return rows
+
+    def _mark_deleted(self, rows: List[int]) -> None:
+        """Tombstone rows; their vectors stay on disk until a rebuild."""
+        if not rows:
+            return
+        self._db.executemany("UPDATE records SET deleted = 1 WHERE row = ?",
+                             [(row,) for row in rows])
+        self._db.commit()
+        self._alive[rows] = False
+
+    def _select_sql(self, ids: Optional[List[str]],
+                    where: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """SQL condition selecting live records by ID and filter."""
+        sql, params = where_to_sql(where)
+        sql = f"deleted = 0 AND ({sql})"
+        if ids is not None:
+            placeholders = ", ".join("?" for _ in ids) or "NULL"
+            sql += f" AND id IN ({placeholders})"
+            params = params + list(ids)
+        return sql, params
+
+    def _allowed_rows(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Boolean mask of live rows matching a filter."""
+        if not where:
+            return self._alive
+        sql, params = self._select_sql(None, where)
+        mask = np.zeros(self._rows, dtype=bool)
+        rows = [row for (row,) in self._db.execute(
+            f"SELECT row FROM records WHERE {sql}", params)]
+        mask[rows] = True
+        return mask
+
+    def _candidate_rows(self, query: np.ndarray, allowed: np.ndarray) -> np.ndarray:
+        """Rows to score for a query: probed IVF lists plus unindexed rows."""
+        allowed_count = int(allowed.sum())
+        if (self._centroids is None or self._rows < BRUTE_FORCE_THRESHOLD
+                or allowed_count < BRUTE_FORCE_THRESHOLD):
+            # Small collections and selective filters are scored exactly
+            return np.flatnonzero(allowed)
+
+        n_probe = min(self.n_probe, len(self._centroids))
+        centroid_scores = self._centroids @ query
+        probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        parts = [self._list_rows[self._list_offsets[i]:self._list_offsets[i + 1]]
+                 for i in probe]
+        parts.append(np.arange(self._indexed_rows, self._rows))
+        candidates = np.concatenate(parts)
+        return candidates[allowed[candidates]]
+
+    def _search(self, vectors: np.ndarray, codes: Optional[np.ndarray],
+                query: np.ndarray, candidates: np.ndarray,
+                k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score candidates, shortlisting them by their codes first if quantized."""
+        shortlist_size = k * self.rescore_factor
+        if codes is not None and len(candidates) > shortlist_size:
+            candidates = self._shortlist(codes, query, candidates, shortlist_size)
+        return self._score(vectors, query, candidates, k)
+
+    def _shortlist(self, codes: np.ndarray, query: np.ndarray,
+                   candidates: np.ndarray, size: int) -> np.ndarray:
+        """Select the ``size`` candidates whose codes best match the query."""
+        candidates = np.sort(candidates)
+        if self.quantization == "binary":
+            query_code = np.packbits(query > 0)
+            coarse = np.concatenate([
+                -_popcount(np.bitwise_xor(
+                    np.asarray(codes[candidates[start:start + SCORE_BLOCK_ROWS]]),
+                    query_code)).sum(axis=1, dtype=np.int32)
+                for start in range(0, len(candidates), SCORE_BLOCK_ROWS)
+            ])
+        else:
+            # The common int8 scale does not change the ranking
+            coarse = np.concatenate([
+                np.asarray(codes[candidates[start:start + SCORE_BLOCK_ROWS]],
+                           dtype=np.float32) @ query
+                for start in range(0, len(candidates), SCORE_BLOCK_ROWS)
+            ])
+        return candidates[_top_k(coarse, size)]
+
+    @staticmethod
+    def _score(vectors: np.ndarray, query: np.ndarray, candidates: np.ndarray,
+               k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score candidate rows and return the top ``k`` rows and scores."""
+        if len(candidates) == 0:
+            return candidates, np.empty(0, dtype=np.float32)
+
+        candidates = np.sort(candidates)  # sequential reads from the memmap
+        scores = np.concatenate([
+            np.asarray(vectors[candidates[start:start + SCORE_BLOCK_ROWS]]) @ query
+            for start in range(0, len(candidates), SCORE_BLOCK_ROWS)
+        ])
+        top = _top_k(scores, k)
+        return candidates[top], scores[top]
+
+    def _records_by_row(self, rows: np.ndarray) -> List[Tuple[int, str, str, str]]:
+        """Fetch records for rows, in the given order."""
+        by_row = {}
+        for start in range(0, len(rows), 500):
+            batch = [int(row) for row in rows[start:start + 500]]
+            placeholders = ", ".join("?" for _ in batch)
+            for record in self._db.execute(
+                    f"SELECT row, id, document, metadata FROM records "
+                    f"WHERE row IN ({placeholders})", batch):
+                by_row[record[0]] = record
+        return [by_row[int(row)] for row in rows]
+
+    @staticmethod
+    def _format_records(records: List[Tuple[int, str, str, str]],
+                        include: Iterable[str],
+                        vectors: Optional[np.ndarray]) -> Dict[str, Any]:
+        """Convert SQLite records into the Chroma result layout."""
+        return {
+            "ids": [record[1] for record in records],
+            "documents": ([record[2] for record in records]
+                          if "documents" in include else None),
+            "metadatas": ([json.loads(record[3]) if record[3] else {} for record in records]
+                          if "metadatas" in include else None),
+            "embeddings": (np.asarray(vectors[[record[0] for record in records]])
+                           if vectors is not None and records else None),
+        }
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
+
+
+class NumpyClient(LoggerMixin):
+    """Client managing :class:`NumpyCollection` directories, like Chroma's PersistentClient."""
+
+    def __init__(self, path: str, n_probe: int = 8, quantization: str = "none",
+                 rescore_factor: Optional[int] = None):
+        """
+        Initialize the client.
+
+        Args:
+            path: Root directory for collections
+            n_probe: Number of IVF lists searched per query
+            quantization: ``none``, ``int8`` or ``binary`` candidate codes
+            rescore_factor: Candidates shortlisted per requested result
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.n_probe = n_probe
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self._collections: Dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str,
+                                 metadata: Optional[Dict[str, Any]] = None
+                                 ) -> NumpyCollection:
+        """Open a collection, creating it if needed."""
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = NumpyCollection(self.path / name, name, metadata,
+                                             n_probe=self.n_probe,
+                                             quantization=self.quantization,
+                                             rescore_factor=self.rescore_factor)
+                self._collections[name] = collection
+            return collection
+
+    def create_collection(self, name: str,
+                          metadata: Optional[Dict[str, Any]] = None) -> NumpyCollection:
+        """Create a collection."""
+        if (self.path / name).exists():
+            raise ValueError(f"Collection {name} already exists")
+        return self.get_or_create_collection(name, metadata)
+
+    def get_collection(self, name: str) -> NumpyCollection:
+        """Open an existing collection."""
+        if not (self.path / name).exists():
+            raise ValueError(f"Collection {name} does not exist")
+        return self.get_or_create_collection(name)
+
+    def delete_collection(self, name: str) -> None:
+        """Delete a collection and its files."""
+        with self._lock:
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.close()
+            shutil.rmtree(self.path / name, ignore_errors=True)
+
+    def list_collections(self) -> List[NumpyCollection]:
+        """Open every collection under the root directory."""
+        return [self.get_or_create_collection(path.name)
+                for path in sorted(self.path.iterdir()) if path.is_dir()]
+
+
+def _write_at(path: Path, offset: int, data: bytes) -> None:
+    """Write data at a byte offset, dropping anything stored beyond it."""
+    with open(path, "r+b" if path.exists() else "wb") as f:
+        f.seek(offset)
+        f.truncate()
+        f.write(data)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (a 1-D input is treated as one row)."""
+    vectors = np.atleast_2d(vectors).astype(np.float32, copy=False)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each row."""
+    return np.argmax(vectors @ centroids.T, axis=1)
+
+
+def _popcount(codes: np.ndarray) -> np.ndarray:
+    """Number of set bits in each byte."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(codes)
+    return _POPCOUNT_TABLE[codes]
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first."""
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
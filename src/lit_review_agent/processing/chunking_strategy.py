@@ -1,9 +1,22 @@
-"""Text chunking strategies for processing long documents."""
+"""Text chunking strategies for processing long documents.
+
+Strategies scan the document by offset and yield ``(start, end)`` spans
+lazily; strings are only materialized by :meth:`ChunkingStrategy.iter_chunks`
+and :meth:`ChunkingStrategy.chunk_text`.
+"""
 
 import re
-from typing import List, Optional
+from bisect import bisect_right
+from itertools import chain
+from typing import Generator, Iterator, List, Optional, Tuple
 
+from ..utils.helpers import find_break_point, trim_span
 from ..utils.logger import LoggerMixin
+from ..utils.tokenizer import TokenCounter, get_token_counter
+
+Span = Tuple[int, int]
+
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?])\s+")
 
 
 class ChunkingStrategy(LoggerMixin):
@@ -27,40 +40,69 @@ class ChunkingStrategy(LoggerMixin):
             f"Initialized chunking strategy: size={chunk_size}, overlap={overlap}"
         )
 
-    def chunk_text(self, text: str) -> List[str]:
+    def iter_spans(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Span]:
         """
-        Split text into chunks.
+        Lazily yield chunk spans.
 
         Args:
             text: Text to chunk
+            start: Offset to start chunking from
+            end: Offset to stop chunking at (defaults to the end of the text)
 
-        Returns:
-            List of text chunks
+        Yields:
+            Whitespace-trimmed, non-empty ``(start, end)`` spans into ``text``
         """
-        if not text or len(text) <= self.chunk_size:
-            return [text] if text else []
+        limit = len(text) if end is None else end
 
-        chunks = []
-        start = 0
-
-        while start < len(text):
+        while start < limit:
             # Determine end position
-            end = start + self.chunk_size
+            chunk_end = start + self.chunk_size
 
-            if end >= len(text):
+            if chunk_end >= limit:
                 # Last chunk
-                chunks.append(text[start:])
-                break
+                chunk_end = limit
+            else:
+                # Try to find a good break point
+                chunk_end = self._find_break_point(text, start, chunk_end)
+
+            span = trim_span(text, start, chunk_end)
+            if span[1] > span[0]:
+                yield span
 
-            # Try to find a good break point
-            chunk_end = self._find_break_point(text, start, end)
-            chunks.append(text[start:chunk_end].strip())
+            if chunk_end >= limit:
+                break
 
             # Move start position with overlap
             start = max(start + 1, chunk_end - self.overlap)
 
-        # Filter out empty chunks
-        return [chunk for chunk in chunks if chunk.strip()]
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """
+        Lazily yield chunk strings.
+
+        Args:
+            text: Text to chunk
+
+        Yields:
+            Text chunks
+        """
+        if not text:
+            return
+        for start, end in self.iter_spans(text):
+            yield text[start:end]
+
+    def chunk_text(self, text: str) -> List[str]:
+        """
+        Split text into chunks.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of text chunks
+        """
+        return list(self.iter_chunks(text))
 
     def _find_break_point(self, text: str, start: int, end: int) -> int:
         """
@@ -74,28 +116,7 @@ class ChunkingStrategy(LoggerMixin):
         Returns:
             Actual end position
         """
-        chunk_text = text[start:end]
-
-        # Try to find separator within the last part of the chunk
-        sep_pos = chunk_text.rfind(self.separator)
-        if (
-            sep_pos > self.chunk_size // 2
-        ):  # Only use if separator is in the latter half
-            return start + sep_pos + len(self.separator)
-
-        # Look for sentence endings
-        for punct in [". ", "! ", "? "]:
-            punct_pos = chunk_text.rfind(punct)
-            if punct_pos > self.chunk_size // 2:
-                return start + punct_pos + len(punct)
-
-        # Look for word boundaries
-        space_pos = chunk_text.rfind(" ")
-        if space_pos > self.chunk_size // 2:
-            return start + space_pos + 1
-
-        # If no good break point found, use the proposed end
-        return end
+        return find_break_point(text, start, end, self.chunk_size, self.separator)
 
 
 class SemanticChunkingStrategy(ChunkingStrategy):
@@ -115,84 +136,113 @@ class SemanticChunkingStrategy(ChunkingStrategy):
         super().__init__(chunk_size, overlap, "\n\n")
         self.min_chunk_size = min_chunk_size
 
-    def chunk_text(self, text: str) -> List[str]:
+    def iter_spans(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Span]:
         """
-        Split text into semantic chunks.
+        Lazily yield semantic chunk spans.
+
+        Paragraphs are merged until the chunk size is reached; paragraphs
+        that are too large on their own are split by sentences.
 
         Args:
             text: Text to chunk
+            start: Offset to start chunking from
+            end: Offset to stop chunking at (defaults to the end of the text)
 
-        Returns:
-            List of semantic chunks
+        Yields:
+            ``(start, end)`` spans into ``text``
         """
-        if not text:
-            return []
+        limit = len(text) if end is None else end
+        current: Optional[Span] = None
 
-        # First, try to split by paragraphs
-        paragraphs = text.split("\n\n")
-        chunks = []
-        current_chunk = ""
-
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
+        for paragraph in self._iter_paragraph_spans(text, start, limit):
+            current_len = current[1] - current[0] if current else 0
 
             # If adding this paragraph would exceed chunk size
-            if len(current_chunk) + len(paragraph) > self.chunk_size:
-                if current_chunk and len(current_chunk) >= self.min_chunk_size:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = paragraph
+            if current_len + paragraph[1] - paragraph[0] > self.chunk_size:
+                if current and current_len >= self.min_chunk_size:
+                    yield current
+                    current = paragraph
                 else:
                     # If current chunk is too small, merge with paragraph
-                    current_chunk += "\n\n" + paragraph if current_chunk else paragraph
+                    current = (current[0] if current else paragraph[0], paragraph[1])
 
                     # If still too large, use sentence-based splitting
-                    if len(current_chunk) > self.chunk_size:
-                        sentence_chunks = self._split_by_sentences(current_chunk)
-                        chunks.extend(sentence_chunks[:-1])
-                        current_chunk = sentence_chunks[-1] if sentence_chunks else ""
+                    if current[1] - current[0] > self.chunk_size:
+                        current = yield from self._split_by_sentences(text, *current)
             else:
-                current_chunk += "\n\n" + paragraph if current_chunk else paragraph
+                current = (current[0] if current else paragraph[0], paragraph[1])
 
         # Add the last chunk
-        if current_chunk and len(current_chunk) >= self.min_chunk_size:
-            chunks.append(current_chunk.strip())
-
-        return chunks
-
-    def _split_by_sentences(self, text: str) -> List[str]:
+        if current and current[1] - current[0] >= self.min_chunk_size:
+            yield current
+
+    def _iter_paragraph_spans(self, text: str, start: int, end: int) -> Iterator[Span]:
+        """Yield trimmed, non-empty paragraph spans between two offsets."""
+        while start < end:
+            boundary = text.find(self.separator, start, end)
+            if boundary == -1:
+                boundary = end
+            span = trim_span(text, start, boundary)
+            if span[1] > span[0]:
+                yield span
+            start = boundary + len(self.separator)
+
+    def _split_by_sentences(
+        self, text: str, start: int, end: int
+    ) -> Generator[Span, None, Optional[Span]]:
         """
-        Split text by sentences when paragraph splitting is not sufficient.
+        Split a span by sentences when paragraph splitting is not sufficient.
+
+        Yields every complete sentence-based chunk and returns the trailing
+        partial chunk, which the caller keeps accumulating into.
 
         Args:
-            text: Text to split
+            text: Full text
+            start: Span start offset
+            end: Span end offset
 
-        Returns:
-            List of sentence-based chunks
+        Yields:
+            Sentence-based chunk spans
         """
-        # Simple sentence splitting using regex
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        chunks = []
-        current_chunk = ""
-
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) > self.chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = sentence
+        current: Optional[Span] = None
+        # The most recent finished chunk; held back so the last one can be returned
+        pending: Optional[Span] = None
+
+        breaks = chain(
+            (
+                (m.start(), m.end())
+                for m in SENTENCE_BREAK_PATTERN.finditer(text, start, end)
+            ),
+            [(end, end)],
+        )
+        sentence_start = start
+
+        for break_start, break_end in breaks:
+            sentence = (sentence_start, break_start)
+            sentence_start = break_end
+
+            current_len = current[1] - current[0] if current else 0
+            if current_len + sentence[1] - sentence[0] > self.chunk_size:
+                if current:
+                    finished = [current]
+                    current = sentence
                 else:
                     # If single sentence is too large, use character-based splitting
-                    char_chunks = super().chunk_text(sentence)
-                    chunks.extend(char_chunks)
-                    current_chunk = ""
+                    finished = ChunkingStrategy.iter_spans(self, text, *sentence)
+                for span in finished:
+                    if pending:
+                        yield pending
+                    pending = span
             else:
-                current_chunk += " " + sentence if current_chunk else sentence
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+                current = (current[0] if current else sentence[0], sentence[1])
 
-        return chunks
+        if current:
+            if pending:
+                yield pending
+            pending = current
+        return pending
 
 
 class FixedSizeChunkingStrategy(ChunkingStrategy):
@@ -208,49 +258,50 @@ class FixedSizeChunkingStrategy(ChunkingStrategy):
         """
         super().__init__(chunk_size, overlap, " ")
 
-    def chunk_text(self, text: str) -> List[str]:
+    def iter_spans(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Span]:
         """
-        Split text into fixed-size chunks.
+        Lazily yield fixed-size chunk spans.
 
         Args:
             text: Text to chunk
+            start: Offset to start chunking from
+            end: Offset to stop chunking at (defaults to the end of the text)
 
-        Returns:
-            List of fixed-size chunks
+        Yields:
+            ``(start, end)`` spans into ``text``
         """
-        if not text:
-            return []
-
-        chunks = []
-        start = 0
+        limit = len(text) if end is None else end
 
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
+        while start < limit:
+            chunk_end = min(start + self.chunk_size, limit)
 
             # Try to end at word boundary if possible
-            if end < len(text):
-                # Find last space within chunk
-                space_pos = text[:end].rfind(" ", start)
+            if chunk_end < limit:
+                space_pos = text.rfind(" ", start, chunk_end)
                 if space_pos > start:
-                    end = space_pos
+                    chunk_end = space_pos
 
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+            span = trim_span(text, start, chunk_end)
+            if span[1] > span[0]:
+                yield span
 
-            start = max(start + 1, end - self.overlap)
+            if chunk_end >= limit:
+                break
 
-        return chunks
+            start = max(start + 1, chunk_end - self.overlap)
 
 
 class TokenBasedChunkingStrategy(ChunkingStrategy):
-    """Token-based chunking strategy that estimates token counts."""
+    """Token-based chunking strategy that packs chunks to an exact token budget."""
 
     def __init__(
         self,
         max_tokens: int = 250,
         overlap_tokens: int = 50,
         chars_per_token: float = 4.0,
+        token_counter: Optional[TokenCounter] = None,
     ):
         """
         Initialize token-based chunking strategy.
@@ -258,7 +309,10 @@ class TokenBasedChunkingStrategy(ChunkingStrategy):
         Args:
             max_tokens: Maximum tokens per chunk
             overlap_tokens: Number of tokens to overlap
-            chars_per_token: Estimated characters per token
+            chars_per_token: Estimated characters per token, used only to
+                report the nominal character chunk size
+            token_counter: Token counter to measure chunks with (defaults
+                to the shared counter)
         """
         chunk_size = int(max_tokens * chars_per_token)
         overlap = int(overlap_tokens * chars_per_token)
@@ -267,64 +321,72 @@ class TokenBasedChunkingStrategy(ChunkingStrategy):
         self.max_tokens = max_tokens
         self.overlap_tokens = overlap_tokens
         self.chars_per_token = chars_per_token
+        self.token_counter = token_counter or get_token_counter()
 
     def estimate_tokens(self, text: str) -> int:
         """
-        Estimate the number of tokens in text.
+        Count the number of tokens in text.
 
         Args:
             text: Input text
 
         Returns:
-            Estimated token count
+            Token count
         """
-        return int(len(text) / self.chars_per_token)
+        return self.token_counter.count(text)
 
-    def chunk_text(self, text: str) -> List[str]:
+    def iter_spans(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Span]:
         """
-        Split text into token-based chunks.
+        Lazily yield chunk spans of at most ``max_tokens`` tokens.
 
-        Args:
-            text: Text to chunk
-
-        Returns:
-            List of chunks within token limits
-        """
-        if not text:
-            return []
-
-        estimated_tokens = self.estimate_tokens(text)
-        if estimated_tokens <= self.max_tokens:
-            return [text]
-
-        # Use base chunking strategy with token-adjusted sizes
-        chunks = super().chunk_text(text)
-
-        # Verify and adjust chunks that might exceed token limits
-        adjusted_chunks = []
-        for chunk in chunks:
-            if self.estimate_tokens(chunk) > self.max_tokens:
-                # Further split large chunks
-                sub_chunks = self._split_large_chunk(chunk)
-                adjusted_chunks.extend(sub_chunks)
-            else:
-                adjusted_chunks.append(chunk)
-
-        return adjusted_chunks
-
-    def _split_large_chunk(self, chunk: str) -> List[str]:
-        """
-        Split a chunk that exceeds token limits.
+        The text is tokenized once; each chunk takes up to ``max_tokens``
+        tokens and is then shortened to the nearest paragraph, sentence or
+        word break in its latter half.
 
         Args:
-            chunk: Chunk to split
+            text: Text to chunk
+            start: Offset to start chunking from
+            end: Offset to stop chunking at (defaults to the end of the text)
 
-        Returns:
-            List of smaller chunks
+        Yields:
+            ``(start, end)`` spans into ``text``
         """
-        # Use a smaller chunk size for splitting
-        smaller_strategy = FixedSizeChunkingStrategy(
-            chunk_size=int(self.max_tokens * self.chars_per_token * 0.8),
-            overlap=int(self.overlap_tokens * self.chars_per_token),
-        )
-        return smaller_strategy.chunk_text(chunk)
+        limit = len(text) if end is None else end
+        if start >= limit:
+            return
+
+        segment = text if (start, limit) == (0, len(text)) else text[start:limit]
+        offsets = self.token_counter.token_offsets(segment)
+        if not offsets:
+            return
+        if start:
+            offsets = [(s + start, e + start) for s, e in offsets]
+        token_ends = [e for _, e in offsets]
+
+        first = 0
+        while first < len(offsets):
+            last = min(first + self.max_tokens, len(offsets))
+            chunk_start = offsets[first][0]
+            chunk_end = offsets[last - 1][1]
+
+            if last < len(offsets):
+                # Pull the end back to a natural break inside the window
+                chunk_end = find_break_point(
+                    text,
+                    chunk_start,
+                    chunk_end,
+                    chunk_end - chunk_start,
+                    self.separator,
+                )
+                last = max(bisect_right(token_ends, chunk_end, first), first + 1)
+                chunk_end = max(chunk_end, offsets[last - 1][1])
+
+            span = trim_span(text, chunk_start, chunk_end)
+            if span[1] > span[0]:
+                yield span
+
+            if last >= len(offsets):
+                break
+            first = max(first + 1, last - self.overlap_tokens)
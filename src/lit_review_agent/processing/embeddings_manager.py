@@ -3,9 +3,10 @@
 from typing import Dict, List, Optional, Union
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 from ..utils.logger import LoggerMixin
+from ..utils.embedding_scheduler import get_embedding_scheduler
+from ..utils.model_registry import get_model_registry
 
 
 class EmbeddingsManager(LoggerMixin):
@@ -19,17 +20,18 @@ class EmbeddingsManager(LoggerMixin):
             model_name: Name of the sentence transformer model
         """
         self.model_name = model_name
-        self.model = None
-        self._load_model()
 
-    def _load_model(self):
-        """Load the sentence transformer model."""
-        try:
-            self.model = SentenceTransformer(self.model_name)
-            self.logger.info(f"Loaded embeddings model: {self.model_name}")
-        except Exception as e:
-            self.logger.error(f"Failed to load embeddings model: {e}")
-            self.model = None
+        # Model is shared process-wide and loaded lazily on first use
+        registry = get_model_registry()
+        self._model_handle = registry.acquire(
+            registry.SENTENCE_TRANSFORMER, model_name
+        )
+        self.scheduler = get_embedding_scheduler(model_name)
+
+    @property
+    def model(self):
+        """Shared sentence transformer, or None if it could not be loaded."""
+        return self._model_handle.model
 
     def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """
@@ -45,8 +47,7 @@ class EmbeddingsManager(LoggerMixin):
             return None
 
         try:
-            embedding = self.model.encode(text)
-            return embedding
+            return self.scheduler.encode([text])[0]
         except Exception as e:
             self.logger.error(f"Error generating embedding: {e}")
             return None
@@ -65,7 +66,30 @@ class EmbeddingsManager(LoggerMixin):
             return []
 
         try:
-            embeddings = self.model.encode(texts)
+            embeddings = self.scheduler.encode(texts)
+            return [emb for emb in embeddings]
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings: {e}")
+            return [None] * len(texts)
+
+    async def agenerate_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Async variant of :meth:`generate_embeddings`.
+
+        Concurrent calls from different coroutines are coalesced into shared
+        model batches by the embedding scheduler.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List of embedding vectors
+        """
+        if not self.model or not texts:
+            return []
+
+        try:
+            embeddings = await self.scheduler.aencode(texts)
             return [emb for emb in embeddings]
         except Exception as e:
             self.logger.error(f"Error generating embeddings: {e}")
@@ -100,36 +124,93 @@ class EmbeddingsManager(LoggerMixin):
             self.logger.error(f"Error calculating similarity: {e}")
             return 0.0
 
+    @staticmethod
+    def normalize_embeddings(
+        embeddings: Union[List[Optional[np.ndarray]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Stack embeddings into an L2-normalized float32 matrix.
+
+        Build this once for a candidate set that is searched repeatedly and
+        pass it to :meth:`find_most_similar` with ``normalized=True``.
+        Missing (None) or zero embeddings become zero rows, which score 0.
+
+        Args:
+            embeddings: List of embedding vectors or a 2-D array
+
+        Returns:
+            Matrix with one unit-length (or zero) row per embedding
+        """
+        if isinstance(embeddings, np.ndarray):
+            matrix = np.array(embeddings, dtype=np.float32, ndmin=2)
+        else:
+            dim = next((len(e) for e in embeddings if e is not None), 0)
+            matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+            for i, embedding in enumerate(embeddings):
+                if embedding is not None:
+                    matrix[i] = embedding
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
     def find_most_similar(
         self,
         query_embedding: np.ndarray,
-        candidate_embeddings: List[np.ndarray],
+        candidate_embeddings: Union[List[Optional[np.ndarray]], np.ndarray],
         top_k: int = 5,
+        normalized: bool = False,
     ) -> List[tuple]:
         """
         Find most similar embeddings to a query embedding.
 
+        All similarities are computed with one matrix-vector product and the
+        top ``k`` are selected with ``argpartition``.
+
         Args:
             query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embeddings
+            candidate_embeddings: List of candidate embeddings, or a matrix
+                with one candidate per row
             top_k: Number of top results to return
+            normalized: Whether ``candidate_embeddings`` is already a matrix
+                from :meth:`normalize_embeddings`
 
         Returns:
             List of (index, similarity_score) tuples
         """
-        if not candidate_embeddings:
+        if candidate_embeddings is None or len(candidate_embeddings) == 0 or top_k <= 0:
             return []
 
-        similarities = []
-        for i, candidate in enumerate(candidate_embeddings):
-            if candidate is not None:
-                similarity = self.calculate_similarity(query_embedding, candidate)
-                similarities.append((i, similarity))
-
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
-
-        return similarities[:top_k]
+        if normalized:
+            matrix = candidate_embeddings
+            indices = np.arange(len(matrix))
+        elif isinstance(candidate_embeddings, np.ndarray):
+            matrix = self.normalize_embeddings(candidate_embeddings)
+            indices = np.arange(len(matrix))
+        else:
+            # Missing candidates are skipped, not scored
+            indices = np.array(
+                [i for i, c in enumerate(candidate_embeddings) if c is not None],
+                dtype=np.int64,
+            )
+            if len(indices) == 0:
+                return []
+            matrix = self.normalize_embeddings(
+                [candidate_embeddings[i] for i in indices]
+            )
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            similarities = np.zeros(len(matrix), dtype=np.float32)
+        else:
+            similarities = matrix @ (query / query_norm)
+
+        k = min(top_k, len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+
+        return [(int(indices[i]), float(similarities[i])) for i in top]
 
     def get_model_info(self) -> Dict[str, str]:
         """
@@ -0,0 +1,427 @@
+"""Local inference sidecar serving embeddings and keywords over a Unix socket.
+
+One sidecar process holds the sentence-transformer and spaCy models; API
+workers talk to it through :class:`InferenceSidecarClient` instead of
+loading their own copies. Encode requests from all workers go through the
+sidecar's embedding scheduler, so they are batched together as well.
+
+Wire format (little-endian). Every frame starts with a 12-byte header::
+
+    magic "LS" | version u8 | op/status u8 | request id u32 | payload length u32
+
+Payload fields are ``u8``/``u16``/``u32`` integers, strings as a ``u32``
+byte length followed by UTF-8, and text lists as a ``u32`` count followed by
+strings. Embeddings are returned as ``rows u32 | dim u32`` followed by the
+raw float32 matrix. An error response carries one string, the message.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import signal
+import socket
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.embedding_scheduler import get_embedding_scheduler
+from ..utils.logger import LoggerMixin
+
+PROTOCOL_MAGIC = b"LS"
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct("<2sBBII")
+# Refuse frames above this size instead of allocating for a corrupt header
+MAX_PAYLOAD_BYTES = 256 * 1024 * 1024
+
+OP_PING = 0
+OP_ENCODE = 1
+OP_KEYWORDS = 2
+OP_STATS = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+
+def _pack_str(value: str) -> bytes:
+    """Length-prefixed UTF-8 string."""
+    data = value.encode("utf-8", "surrogatepass")
+    return _U32.pack(len(data)) + data
+
+
+def _pack_texts(texts: Sequence[str]) -> bytes:
+    """Count-prefixed list of strings."""
+    return _U32.pack(len(texts)) + b"".join(_pack_str(text) for text in texts)
+
+
+class _Reader:
+    """Sequential reader over a payload."""
+
+    def __init__(self, payload: bytes):
+        self._view = memoryview(payload)
+        self._offset = 0
+
+    def _unpack(self, fmt: struct.Struct) -> int:
+        value = fmt.unpack_from(self._view, self._offset)[0]
+        self._offset += fmt.size
+        return value
+
+    def u8(self) -> int:
+        return self._unpack(_U8)
+
+    def u16(self) -> int:
+        return self._unpack(_U16)
+
+    def u32(self) -> int:
+        return self._unpack(_U32)
+
+    def raw(self, size: int) -> memoryview:
+        if self._offset + size > len(self._view):
+            raise ValueError("Truncated sidecar payload")
+        data = self._view[self._offset:self._offset + size]
+        self._offset += size
+        return data
+
+    def string(self) -> str:
+        return bytes(self.raw(self.u32())).decode("utf-8", "surrogatepass")
+
+    def strings(self) -> List[str]:
+        return [self.string() for _ in range(self.u32())]
+
+
+def _frame(code: int, request_id: int, payload: bytes) -> bytes:
+    """Header plus payload."""
+    return HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, code, request_id,
+                       len(payload)) + payload
+
+
+def _check_header(header: bytes) -> Tuple[int, int, int]:
+    """Validate a frame header and return (op or status, request id, length)."""
+    magic, version, code, request_id, length = HEADER.unpack(header)
+    if magic != PROTOCOL_MAGIC or version != PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported sidecar frame (magic {magic!r}, version {version})")
+    if length > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"Sidecar frame too large: {length} bytes")
+    return code, request_id, length
+
+
+class InferenceSidecarServer(LoggerMixin):
+    """Serve encode and keyword requests on a Unix domain socket."""
+
+    def __init__(self, socket_path: str, keyword_workers: int = 2):
+        """
+        Initialize the server.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            keyword_workers: Threads running keyword extraction
+        """
+        self.socket_path = Path(socket_path)
+        self._keyword_executor = ThreadPoolExecutor(
+            max_workers=keyword_workers, thread_name_prefix="sidecar-keywords")
+        self._processors: Dict[Tuple[str, str], Tuple[Any, threading.Lock]] = {}
+        self._processors_lock = threading.Lock()
+        self._connections = 0
+        self._requests: Dict[int, int] = {}
+
+    async def serve_forever(self) -> None:
+        """Listen until cancelled, then remove the socket file."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # stale socket of a previous run
+
+        server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o660)
+        self.logger.info(f"Inference sidecar listening on {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._keyword_executor.shutdown(wait=False)
+            self.socket_path.unlink(missing_ok=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Answer requests on one connection until the client hangs up."""
+        self._connections += 1
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                op, request_id, length = _check_header(header)
+                payload = await reader.readexactly(length)
+
+                self._requests[op] = self._requests.get(op, 0) + 1
+                try:
+                    response = _frame(STATUS_OK, request_id, await self._dispatch(op, payload))
+                except Exception as e:
+                    self.logger.error(f"Sidecar request (op {op}) failed: {e}")
+                    response = _frame(STATUS_ERROR, request_id, _pack_str(str(e)))
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            self.logger.warning(f"Dropping sidecar connection: {e}")
+        finally:
+            self._connections -= 1
+            writer.close()
+
+    async def _dispatch(self, op: int, payload: bytes) -> bytes:
+        """Run one request and return its response payload."""
+        request = _Reader(payload)
+        if op == OP_PING:
+            return b""
+
+        if op == OP_ENCODE:
+            model_name = request.string()
+            max_batch_size = request.u32() or None
+            texts = request.strings()
+            embeddings = await get_embedding_scheduler(model_name).aencode(
+                texts, max_batch_size=max_batch_size)
+            embeddings = np.ascontiguousarray(embeddings, dtype="<f4")
+            rows, dim = embeddings.shape if embeddings.size else (len(texts), 0)
+            return _U32.pack(rows) + _U32.pack(dim) + embeddings.tobytes()
+
+        if op == OP_KEYWORDS:
+            spacy_model = request.string()
+            keyword_backend = request.string()
+            max_keywords = request.u16()
+            batch = bool(request.u8())
+            texts = request.strings()
+            loop = asyncio.get_running_loop()
+            keywords = await loop.run_in_executor(
+                self._keyword_executor, self._extract_keywords,
+                spacy_model, keyword_backend, texts, max_keywords, batch)
+            return _U32.pack(len(keywords)) + b"".join(_pack_texts(k) for k in keywords)
+
+        if op == OP_STATS:
+            return _pack_str(json.dumps(self.get_stats()))
+
+        raise ValueError(f"Unknown sidecar op: {op}")
+
+    def _extract_keywords(self, spacy_model: str, keyword_backend: str,
+                          texts: List[str], max_keywords: int,
+                          batch: bool) -> List[List[str]]:
+        """Extract keywords with the sidecar's text processor for a backend."""
+        from .text_processor import TextProcessor
+
+        key = (spacy_model, keyword_backend)
+        with self._processors_lock:
+            if key not in self._processors:
+                # Keywords only; the processor's sentence model is never loaded
+                self._processors[key] = (
+                    TextProcessor(spacy_model=spacy_model, keyword_backend=keyword_backend),
+                    threading.Lock(),
+                )
+            processor, lock = self._processors[key]
+
+        # Corpus backends keep fitted statistics between calls
+        with lock:
+            if batch:
+                return processor.extract_research_keywords_batch(
+                    texts, max_keywords=max_keywords)
+            return [processor.extract_research_keywords(text, max_keywords=max_keywords)
+                    for text in texts]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get server statistics.
+
+        Returns:
+            Open connections, requests per op and embedding scheduler stats
+        """
+        from ..utils.model_registry import get_model_registry
+
+        names = {OP_PING: "ping", OP_ENCODE: "encode", OP_KEYWORDS: "keywords",
+                 OP_STATS: "stats"}
+        return {
+            "pid": os.getpid(),
+            "connections": self._connections,
+            "requests": {names.get(op, str(op)): n for op, n in self._requests.items()},
+            "models": get_model_registry().get_stats(),
+        }
+
+
+def run_sidecar(socket_path: str, keyword_workers: int = 2) -> None:
+    """
+    Run an inference sidecar in the foreground until interrupted.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on
+        keyword_workers: Threads running keyword extraction
+    """
+    server = InferenceSidecarServer(socket_path, keyword_workers=keyword_workers)
+
+    async def serve() -> None:
+        # Stop cleanly (removing the socket file) when a supervisor sends SIGTERM
+        task = asyncio.current_task()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+class InferenceSidecarClient(LoggerMixin):
+    """
+    Blocking client for an inference sidecar.
+
+    Thread-safe: each request borrows a connection from a small pool, so
+    concurrent callers (e.g. a vector store's executor threads) run their
+    requests in parallel and the sidecar can batch them together.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60.0,
+                 max_connections: int = 8):
+        """
+        Initialize the client. Connections are opened on demand.
+
+        Args:
+            socket_path: Path of the sidecar's Unix socket
+            timeout: Seconds to wait for a response
+            max_connections: Connections kept open to the sidecar
+        """
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[socket.socket]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._request_ids = iter(range(1, 2 ** 32))
+        self._ids_lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        """Open a new connection to the sidecar."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _request(self, op: int, payload: bytes = b"") -> bytes:
+        """Send one request and return the response payload."""
+        with self._ids_lock:
+            request_id = next(self._request_ids)
+        frame = _frame(op, request_id, payload)
+
+        with self._slots:
+            # Pooled connections are closed by a sidecar restart; retry once
+            # on a fresh one
+            for attempt in range(2):
+                try:
+                    sock = self._idle.get_nowait()
+                    reused = True
+                except queue.Empty:
+                    sock = self._connect()
+                    reused = False
+                try:
+                    sock.sendall(frame)
+                    status, response_id, length = _check_header(
+                        _recv_exactly(sock, HEADER.size))
+                    response = _recv_exactly(sock, length)
+                except (OSError, ConnectionError, ValueError):
+                    sock.close()
+                    if reused and attempt == 0:
+                        self.close()  # the other pooled connections are stale too
+                        continue
+                    raise
+                if response_id != request_id:
+                    sock.close()
+                    raise ConnectionError("Sidecar response does not match the request")
+                self._idle.put(sock)
+                break
+
+        if status != STATUS_OK:
+            raise RuntimeError(f"Inference sidecar error: {_Reader(response).string()}")
+        return response
+
+    def encode(self, texts: Sequence[str], model_name: str,
+               max_batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Encode texts with a sentence-transformer model held by the sidecar.
+
+        Args:
+            texts: Texts to encode
+            model_name: Sentence transformer model name
+            max_batch_size: Cap on texts per forward pass
+
+        Returns:
+            float32 array with one row per text
+        """
+        response = _Reader(self._request(
+            OP_ENCODE,
+            _pack_str(model_name) + _U32.pack(max_batch_size or 0) + _pack_texts(texts)))
+        rows, dim = response.u32(), response.u32()
+        return np.frombuffer(response.raw(rows * dim * 4), dtype="<f4").reshape(rows, dim)
+
+    def extract_keywords(self, texts: Sequence[str], spacy_model: str,
+                         keyword_backend: str = "spacy", max_keywords: int = 20,
+                         batch: bool = True) -> List[List[str]]:
+        """
+        Extract research keywords in the sidecar.
+
+        Args:
+            texts: Input texts
+            spacy_model: spaCy model name
+            keyword_backend: ``spacy``, ``tfidf`` or ``yake``
+            max_keywords: Maximum keywords per text
+            batch: Treat the texts as one corpus (and refit corpus backends)
+                rather than scoring each against the sidecar's fitted corpus
+
+        Returns:
+            One keyword list per text, in input order
+        """
+        response = _Reader(self._request(
+            OP_KEYWORDS,
+            _pack_str(spacy_model) + _pack_str(keyword_backend)
+            + _U16.pack(max_keywords) + _U8.pack(int(batch)) + _pack_texts(texts)))
+        return [response.strings() for _ in range(response.u32())]
+
+    def ping(self) -> bool:
+        """Check that the sidecar is reachable."""
+        try:
+            self._request(OP_PING)
+            return True
+        except (OSError, RuntimeError):
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the sidecar's statistics."""
+        return json.loads(_Reader(self._request(OP_STATS)).string())
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly ``size`` bytes from a socket."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Inference sidecar closed the connection")
+        received += n
+    return bytes(buffer)
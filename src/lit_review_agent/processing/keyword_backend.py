@@ -0,0 +1,377 @@
+"""Corpus-level keyword extraction backends.
+
+Unlike the per-document spaCy extractor, these backends score candidate
+terms against the whole corpus of a review, so terms that appear in every
+paper ("method", "result") are pushed down. Term counts are held as sparse
+(document, term, count) triples in NumPy arrays and every score is computed
+with vectorized operations.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..utils.helpers import _get_stopwords
+from ..utils.logger import LoggerMixin
+
+# Stopword floor used when NLTK stopwords are not installed, plus filler
+# verbs common in abstracts
+_BASE_STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because
+    been before being below between both but by can could did do does doing down
+    during each et al few for from further had has have having he her here hers
+    him his how i if in into is it its itself just me more most my no nor not now
+    of off on once only or other our ours out over own same she should so some
+    such than that the their them then there these they this those through to too
+    under until up use used using very via was we were what when where which while
+    who whom why will with would you your
+    paper present presented presents propose proposed proposes show shown shows
+    """.split()
+)
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:[-_][A-Za-z0-9]+)*|[.,;:!?()\[\]]")
+
+
+class KeywordBackend(LoggerMixin, ABC):
+    """
+    Base class for corpus-level keyword backends.
+
+    Subclasses implement :meth:`_score`, which receives the sparse term
+    counts of the corpus and returns one score per (document, term) entry.
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        max_ngram: int = 2,
+        min_length: int = 3,
+        min_df: int = 1,
+        stopwords: Optional[Set[str]] = None,
+    ):
+        """
+        Initialize the keyword backend.
+
+        Args:
+            max_ngram: Longest candidate phrase, in words
+            min_length: Minimum length of single-word candidates
+            min_df: Minimum number of documents a candidate must appear in
+            stopwords: Stopwords that split candidate phrases
+        """
+        self.max_ngram = max_ngram
+        self.min_length = min_length
+        self.min_df = min_df
+        self.stopwords = set(_BASE_STOPWORDS) | set(
+            stopwords if stopwords is not None else _get_stopwords("english")
+        )
+
+        # Corpus statistics from the last fit, reused for single documents
+        self._vocabulary: Dict[str, int] = {}
+        self._df: Optional[np.ndarray] = None
+        self._n_docs = 0
+
+    def _candidates(self, text: str) -> Tuple[List[str], List[int], List[bool]]:
+        """
+        Split text into candidate terms.
+
+        Returns:
+            Tuple of (terms, token positions, capitalised flags)
+        """
+        terms: List[str] = []
+        positions: List[int] = []
+        capitalised: List[bool] = []
+
+        phrase: List[Tuple[str, int, bool]] = []
+        position = 0
+
+        def flush() -> None:
+            for size in range(1, self.max_ngram + 1):
+                for i in range(len(phrase) - size + 1):
+                    words = phrase[i : i + size]
+                    if size == 1 and len(words[0][0]) < self.min_length:
+                        continue
+                    terms.append(" ".join(w[0] for w in words))
+                    positions.append(words[0][1])
+                    capitalised.append(all(w[2] for w in words))
+            phrase.clear()
+
+        for token in _TOKEN_PATTERN.findall(text):
+            if not token[0].isalpha():
+                flush()
+                continue
+            lower = token.lower()
+            position += 1
+            if lower in self.stopwords or lower.isdigit():
+                flush()
+                continue
+            phrase.append((lower, position, token[0].isupper()))
+        flush()
+
+        return terms, positions, capitalised
+
+    def _build_matrix(self, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Build the sparse term matrix of a corpus.
+
+        Returns:
+            Dictionary of aligned COO arrays: ``doc``, ``term``, ``count``,
+            ``first_pos``, ``capitalised`` plus per-document ``doc_len``
+        """
+        vocabulary: Dict[str, int] = {}
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        position_list: List[int] = []
+        cap_list: List[bool] = []
+        doc_len = np.zeros(len(texts), dtype=np.float64)
+
+        for doc_index, text in enumerate(texts):
+            terms, positions, capitalised = self._candidates(text or "")
+            doc_len[doc_index] = max(positions[-1] if positions else 0, 1)
+            for term in terms:
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+            doc_ids.extend([doc_index] * len(terms))
+            position_list.extend(positions)
+            cap_list.extend(capitalised)
+
+        doc = np.asarray(doc_ids, dtype=np.int64)
+        term = np.asarray(term_ids, dtype=np.int64)
+        pos = np.asarray(position_list, dtype=np.float64)
+        cap = np.asarray(cap_list, dtype=np.float64)
+
+        # Collapse occurrences into unique (doc, term) entries
+        n_terms = max(len(vocabulary), 1)
+        keys = doc * n_terms + term
+        unique_keys, inverse, counts = np.unique(
+            keys, return_inverse=True, return_counts=True
+        )
+        first_pos = np.full(len(unique_keys), np.inf)
+        np.minimum.at(first_pos, inverse, pos)
+        cap_counts = np.bincount(inverse, weights=cap, minlength=len(unique_keys))
+
+        return {
+            "vocabulary": vocabulary,
+            "doc": unique_keys // n_terms,
+            "term": unique_keys % n_terms,
+            "count": counts.astype(np.float64),
+            "first_pos": first_pos,
+            "capitalised": cap_counts,
+            "doc_len": doc_len,
+        }
+
+    def fit(self, texts: Sequence[str]) -> "KeywordBackend":
+        """
+        Compute corpus statistics (document frequencies) for ``texts``.
+
+        Args:
+            texts: Corpus documents
+
+        Returns:
+            self
+        """
+        matrix = self._build_matrix(texts)
+        self._vocabulary = matrix["vocabulary"]
+        self._df = np.bincount(
+            matrix["term"], minlength=len(self._vocabulary)
+        ).astype(np.float64)
+        self._n_docs = len(texts)
+        return self
+
+    def extract_batch(
+        self, texts: Sequence[str], max_keywords: int = 20, fit: bool = True
+    ) -> List[List[str]]:
+        """
+        Extract keywords for every document of a corpus.
+
+        Args:
+            texts: Corpus documents
+            max_keywords: Maximum number of keywords per document
+            fit: Whether to compute document frequencies from ``texts`` and
+                keep them as the corpus statistics. When False the statistics
+                of the last fit are used, which suits scoring a handful of
+                new documents against a corpus.
+
+        Returns:
+            One keyword list per document, in input order
+        """
+        if not texts:
+            return []
+
+        matrix = self._build_matrix(texts)
+        vocabulary = matrix["vocabulary"]
+        terms = matrix["term"]
+
+        if fit or self._df is None:
+            df = np.bincount(terms, minlength=len(vocabulary)).astype(np.float64)
+            n_docs = len(texts)
+            if fit:
+                self._vocabulary, self._df, self._n_docs = vocabulary, df, n_docs
+        else:
+            # Map the batch vocabulary onto the fitted corpus statistics
+            fitted = np.array(
+                [
+                    self._df[self._vocabulary[t]] if t in self._vocabulary else 0
+                    for t in vocabulary
+                ],
+                dtype=np.float64,
+            )
+            df = fitted + np.bincount(terms, minlength=len(vocabulary))
+            n_docs = self._n_docs + len(texts)
+
+        scores = self._score(matrix, df, n_docs)
+
+        keep = df[terms] >= self.min_df
+        return self._top_k(
+            matrix["doc"][keep],
+            terms[keep],
+            scores[keep],
+            vocabulary,
+            len(texts),
+            max_keywords,
+        )
+
+    def extract(self, text: str, max_keywords: int = 20) -> List[str]:
+        """Extract keywords for one document against the fitted corpus."""
+        return self.extract_batch([text], max_keywords=max_keywords, fit=False)[0]
+
+    @abstractmethod
+    def _score(
+        self, matrix: Dict[str, np.ndarray], df: np.ndarray, n_docs: int
+    ) -> np.ndarray:
+        """Score every (document, term) entry. Higher is better."""
+        pass
+
+    @staticmethod
+    def _top_k(
+        doc: np.ndarray,
+        term: np.ndarray,
+        scores: np.ndarray,
+        vocabulary: Dict[str, int],
+        n_docs: int,
+        k: int,
+    ) -> List[List[str]]:
+        """Select the ``k`` best-scoring terms of each document."""
+        results: List[List[str]] = [[] for _ in range(n_docs)]
+        if len(doc) == 0:
+            return results
+
+        id_to_term = np.empty(len(vocabulary), dtype=object)
+        for text, index in vocabulary.items():
+            id_to_term[index] = text
+
+        # Sort by document, then by descending score
+        order = np.lexsort((-scores, doc))
+        doc_sorted = doc[order]
+        starts = np.searchsorted(doc_sorted, np.arange(n_docs), side="left")
+        ends = np.searchsorted(doc_sorted, np.arange(n_docs), side="right")
+
+        for d in range(n_docs):
+            selected = order[starts[d] : min(ends[d], starts[d] + k)]
+            results[d] = list(id_to_term[term[selected]])
+        return results
+
+
+class TfidfKeywordBackend(KeywordBackend):
+    """TF-IDF keyword scoring across the review corpus."""
+
+    name = "tfidf"
+
+    def __init__(self, ngram_boost: float = 0.5, **kwargs):
+        """
+        Initialize the TF-IDF backend.
+
+        Args:
+            ngram_boost: Extra weight per additional word in a phrase
+            **kwargs: Passed to :class:`KeywordBackend`
+        """
+        super().__init__(**kwargs)
+        self.ngram_boost = ngram_boost
+
+    def _score(
+        self, matrix: Dict[str, np.ndarray], df: np.ndarray, n_docs: int
+    ) -> np.ndarray:
+        terms = matrix["term"]
+        tf = matrix["count"] / matrix["doc_len"][matrix["doc"]]
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+        ngram_sizes = np.fromiter(
+            (text.count(" ") + 1 for text in matrix["vocabulary"]),
+            dtype=np.float64,
+            count=len(matrix["vocabulary"]),
+        )
+        boost = 1.0 + self.ngram_boost * (ngram_sizes[terms] - 1.0)
+        return tf * idf[terms] * boost
+
+
+class YakeKeywordBackend(KeywordBackend):
+    """
+    YAKE-style keyword scoring extended with corpus spread.
+
+    Combines the YAKE features that can be computed from term counts (early
+    position, casing, normalised frequency) with a document-frequency
+    penalty, so terms common across the corpus rank lower.
+    """
+
+    name = "yake"
+
+    def _score(
+        self, matrix: Dict[str, np.ndarray], df: np.ndarray, n_docs: int
+    ) -> np.ndarray:
+        doc = matrix["doc"]
+        terms = matrix["term"]
+        counts = matrix["count"]
+
+        # Position: terms that first appear early matter more
+        t_pos = np.log(np.log(3.0 + matrix["first_pos"]))
+
+        # Casing: share of capitalised occurrences (acronyms, names)
+        t_case = matrix["capitalised"] / counts
+
+        # Frequency normalised by the document's mean and spread
+        n_docs_batch = len(matrix["doc_len"])
+        entries = np.bincount(doc, minlength=n_docs_batch).astype(np.float64)
+        mean = np.bincount(doc, weights=counts, minlength=n_docs_batch) / np.maximum(
+            entries, 1.0
+        )
+        sq_mean = np.bincount(
+            doc, weights=counts**2, minlength=n_docs_batch
+        ) / np.maximum(entries, 1.0)
+        std = np.sqrt(np.maximum(sq_mean - mean**2, 0.0))
+        t_freq = counts / (mean[doc] + std[doc] + 1e-9)
+
+        # Corpus spread: terms found in most documents are generic
+        t_spread = df[terms] / max(n_docs, 1)
+
+        # YAKE scores are "lower is better"; invert for ranking
+        yake = t_pos * (1.0 + t_spread) / (1.0 + t_case + t_freq)
+        return 1.0 / (yake + 1e-9)
+
+
+KEYWORD_BACKENDS = {
+    TfidfKeywordBackend.name: TfidfKeywordBackend,
+    YakeKeywordBackend.name: YakeKeywordBackend,
+}
+
+
+def get_keyword_backend(name: str, **kwargs) -> Optional[KeywordBackend]:
+    """
+    Create a corpus keyword backend by name.
+
+    Args:
+        name: Backend name (``tfidf`` or ``yake``); ``spacy`` returns None,
+            meaning the per-document spaCy extractor is used
+        **kwargs: Backend options
+
+    Returns:
+        Keyword backend instance or None
+    """
+    if name == "spacy":
+        return None
+    if name not in KEYWORD_BACKENDS:
+        raise ValueError(
+            f"Unknown keyword backend: {name}. "
+            f"Choose from: spacy, {', '.join(KEYWORD_BACKENDS)}"
+        )
+    return KEYWORD_BACKENDS[name](**kwargs)
@@ -0,0 +1,212 @@
+"""Persistent BM25 inverted index for exact-term retrieval.
+
+Embedding search blurs rare technical terms (model names, dataset names,
+acronyms); a lexical index matches them exactly. Postings live in SQLite so
+the index updates incrementally as papers are ingested and survives restarts.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger import LoggerMixin
+from .keyword_backend import _BASE_STOPWORDS
+
+# Keeps versioned and hyphenated names ("gpt-3.5", "resnet-50") as one token
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+_COMPOUND_SEPARATORS = re.compile(r"[-_.]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms.
+
+    Compound terms are indexed whole and by their parts, so "BERT-base"
+    matches queries for both "bert-base" and "bert".
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of terms, with repeats
+    """
+    terms: List[str] = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token not in _BASE_STOPWORDS and len(token) > 1:
+            terms.append(token)
+        parts = _COMPOUND_SEPARATORS.split(token)
+        if len(parts) > 1:
+            terms.extend(part for part in parts
+                         if len(part) > 1 and part not in _BASE_STOPWORDS)
+    return terms
+
+
+class BM25Index(LoggerMixin):
+    """Okapi BM25 index over documents keyed by ID."""
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        """
+        Open or create an index.
+
+        Args:
+            path: SQLite file holding the index
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents (id TEXT PRIMARY KEY, length INTEGER NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, doc_id TEXT NOT NULL, "
+            "tf INTEGER NOT NULL, PRIMARY KEY (term, doc_id)) WITHOUT ROWID")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS postings_doc ON postings(doc_id)")
+        self._db.commit()
+
+        self._doc_count, self._total_length = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents").fetchone()
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        return self._doc_count
+
+    def add_documents(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        Index documents, replacing any previous version of the same IDs.
+
+        Args:
+            ids: Document IDs
+            texts: Document texts, one per ID
+        """
+        if not ids:
+            return
+
+        with self._lock:
+            self._delete(ids)
+            documents = []
+            postings = []
+            for doc_id, text in zip(ids, texts):
+                terms = tokenize(text or "")
+                documents.append((doc_id, len(terms)))
+                postings.extend((term, doc_id, tf) for term, tf in Counter(terms).items())
+
+            self._db.executemany("INSERT INTO documents VALUES (?, ?)", documents)
+            self._db.executemany("INSERT INTO postings VALUES (?, ?, ?)", postings)
+            self._db.commit()
+
+            self._doc_count += len(documents)
+            self._total_length += sum(length for _, length in documents)
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """
+        Remove documents from the index.
+
+        Args:
+            ids: Document IDs
+        """
+        with self._lock:
+            self._delete(ids)
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every document."""
+        with self._lock:
+            self._db.execute("DELETE FROM postings")
+            self._db.execute("DELETE FROM documents")
+            self._db.commit()
+            self._doc_count = 0
+            self._total_length = 0
+
+    def search(self, query: str, n_results: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank documents by BM25 score.
+
+        Args:
+            query: Search query
+            n_results: Maximum number of results
+
+        Returns:
+            List of (document ID, score), best first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or n_results <= 0:
+            return []
+
+        placeholders = ", ".join("?" for _ in terms)
+        with self._lock:
+            doc_count = self._doc_count
+            if doc_count == 0:
+                return []
+            average_length = self._total_length / doc_count
+            rows = self._db.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p "
+                f"JOIN documents d ON d.id = p.doc_id WHERE p.term IN ({placeholders})",
+                terms).fetchall()
+
+        by_term: Dict[str, List[Tuple[str, int, int]]] = {}
+        for term, doc_id, tf, length in rows:
+            by_term.setdefault(term, []).append((doc_id, tf, length))
+
+        scores: Dict[str, float] = {}
+        for term, postings in by_term.items():
+            df = len(postings)
+            idf = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf, length in postings:
+                norm = self.k1 * (1.0 - self.b + self.b * length / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+        return ranked[:n_results]
+
+    def _delete(self, ids: Sequence[str]) -> None:
+        """Delete documents and their postings without committing."""
+        for start in range(0, len(ids), 500):
+            batch = list(ids[start:start + 500])
+            placeholders = ", ".join("?" for _ in batch)
+            removed = self._db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents "
+                f"WHERE id IN ({placeholders})", batch).fetchone()
+            self._db.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", batch)
+            self._db.execute(f"DELETE FROM documents WHERE id IN ({placeholders})", batch)
+            self._doc_count -= removed[0]
+            self._total_length -= removed[1]
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]],
+                           weights: Optional[Sequence[float]] = None,
+                           k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists with weighted reciprocal-rank fusion.
+
+    Each list contributes ``weight / (k + rank)`` for every ID it ranks,
+    with ranks starting at 1.
+
+    Args:
+        rankings: Ranked ID lists, best first
+        weights: Weight per ranking (defaults to 1.0 each)
+        k: Rank offset damping the influence of top positions
+
+    Returns:
+        List of (ID, fused score), best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
@@ -0,0 +1,186 @@
+"""Secondary indexes over paper metadata for planning filtered searches.
+
+Vector stores evaluate ``where`` filters while (or after) walking the ANN
+graph, which degrades to over-fetching when a filter is selective. This side
+store keeps B-tree indexes on year, category and author in SQLite so a
+planner can count the matching papers first and, when few match, score just
+those papers exactly.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..utils.logger import LoggerMixin
+
+# Prefix of the boolean per-category fields in flattened metadata
+CATEGORY_FIELD_PREFIX = "category:"
+
+
+def category_field(category: str) -> str:
+    """Name of the flattened metadata field flagging a category."""
+    return f"{CATEGORY_FIELD_PREFIX}{category}"
+
+
+def _json_list(value: Any) -> List[str]:
+    """Decode a list stored as a JSON string in metadata."""
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return [str(v) for v in decoded] if isinstance(decoded, list) else []
+
+
+class MetadataIndex(LoggerMixin):
+    """SQLite secondary indexes mapping year, category and author to paper IDs."""
+
+    def __init__(self, path: str):
+        """
+        Open or create the index.
+
+        Args:
+            path: SQLite file holding the index
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                id TEXT PRIMARY KEY, year INTEGER, primary_category TEXT);
+            CREATE TABLE IF NOT EXISTS paper_categories (
+                id TEXT NOT NULL, category TEXT NOT NULL, PRIMARY KEY (category, id))
+                WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS paper_authors (
+                id TEXT NOT NULL, author TEXT NOT NULL, PRIMARY KEY (author, id))
+                WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS papers_year ON papers(year);
+            CREATE INDEX IF NOT EXISTS paper_categories_id ON paper_categories(id);
+            CREATE INDEX IF NOT EXISTS paper_authors_id ON paper_authors(id);
+            """
+        )
+        self._db.commit()
+
+    def count(self) -> int:
+        """Number of indexed papers."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def add(self, ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]) -> None:
+        """
+        Index papers from their stored metadata, replacing earlier entries.
+
+        Args:
+            ids: Paper IDs
+            metadatas: Stored metadata, one per ID
+        """
+        if not ids:
+            return
+
+        papers = []
+        categories = []
+        authors = []
+        for paper_id, metadata in zip(ids, metadatas):
+            metadata = metadata or {}
+            paper_categories = _json_list(metadata.get('categories'))
+            papers.append((paper_id, metadata.get('year'),
+                           paper_categories[0] if paper_categories else None))
+            categories.extend((paper_id, c) for c in dict.fromkeys(paper_categories))
+            authors.extend(
+                (paper_id, a) for a in dict.fromkeys(
+                    author.strip().lower()
+                    for author in _json_list(metadata.get('authors')) if author.strip()))
+
+        with self._lock:
+            self._delete(ids)
+            self._db.executemany("INSERT INTO papers VALUES (?, ?, ?)", papers)
+            self._db.executemany("INSERT INTO paper_categories VALUES (?, ?)", categories)
+            self._db.executemany("INSERT INTO paper_authors VALUES (?, ?)", authors)
+            self._db.commit()
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """
+        Remove papers from the index.
+
+        Args:
+            ids: Paper IDs
+        """
+        with self._lock:
+            self._delete(ids)
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every paper."""
+        with self._lock:
+            self._db.executescript(
+                "DELETE FROM papers; DELETE FROM paper_categories; DELETE FROM paper_authors;")
+            self._db.commit()
+
+    def match(self,
+              categories: Optional[Sequence[str]] = None,
+              year_from: Optional[int] = None,
+              year_to: Optional[int] = None,
+              authors: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None) -> List[str]:
+        """
+        Find papers matching every given filter.
+
+        Args:
+            categories: Match papers in any of these categories
+            year_from: Earliest publication year (inclusive)
+            year_to: Latest publication year (inclusive)
+            authors: Match papers by any of these authors (case-insensitive)
+            limit: Stop after this many IDs
+
+        Returns:
+            Matching paper IDs
+        """
+        clauses = []
+        params: List[Any] = []
+        if year_from is not None:
+            clauses.append("p.year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append("p.year <= ?")
+            params.append(year_to)
+        if categories:
+            placeholders = ", ".join("?" for _ in categories)
+            clauses.append(
+                f"p.id IN (SELECT id FROM paper_categories WHERE category IN ({placeholders}))")
+            params.extend(categories)
+        if authors:
+            placeholders = ", ".join("?" for _ in authors)
+            clauses.append(
+                f"p.id IN (SELECT id FROM paper_authors WHERE author IN ({placeholders}))")
+            params.extend(author.strip().lower() for author in authors)
+
+        query = "SELECT p.id FROM papers p"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [paper_id for (paper_id,) in self._db.execute(query, params)]
+
+    def _delete(self, ids: Sequence[str]) -> None:
+        """Delete papers from every table without committing."""
+        for start in range(0, len(ids), 500):
+            batch = list(ids[start:start + 500])
+            placeholders = ", ".join("?" for _ in batch)
+            for table in ("papers", "paper_categories", "paper_authors"):
+                self._db.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", batch)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,212 @@
+"""Cross-encoder reranking of vector search results."""
+
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import LoggerMixin
+from ..utils.model_registry import ModelRegistry, get_model_registry
+
+# Assumed cost of one (query, document) pair before any batch has been timed
+INITIAL_PAIR_MS = 5.0
+# Smoothing of the measured per-pair cost
+PAIR_COST_DECAY = 0.8
+
+
+class CrossEncoderReranker(LoggerMixin):
+    """
+    Rescore the top of a result list with a cross-encoder.
+
+    Pairs are scored in batches; scores are cached by (query hash, document
+    ID) so repeated or refined queries only score new candidates. The rerank
+    depth is capped both by ``max_depth`` and by how many uncached pairs fit
+    in ``latency_budget_ms`` at the measured per-pair cost. Candidates beyond
+    the depth keep their original order below the reranked ones.
+    """
+
+    def __init__(self,
+                 model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+                 batch_size: int = 32,
+                 max_depth: int = 50,
+                 latency_budget_ms: Optional[float] = None,
+                 cache_size: int = 10000,
+                 max_document_chars: int = 2000):
+        """
+        Initialize the reranker.
+
+        Args:
+            model_name: Local or hub cross-encoder model
+            batch_size: Pairs per model call
+            max_depth: Most candidates reranked per query
+            latency_budget_ms: Scoring time budget per query (None disables)
+            cache_size: Maximum cached pair scores
+            max_document_chars: Document prefix passed to the model
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_depth = max_depth
+        self.latency_budget_ms = latency_budget_ms
+        self.cache_size = cache_size
+        self.max_document_chars = max_document_chars
+
+        self._model_handle = get_model_registry().acquire(
+            ModelRegistry.CROSS_ENCODER, model_name)
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pair_ms = INITIAL_PAIR_MS
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def model(self) -> Any:
+        """Shared cross-encoder model (loaded on first use)."""
+        return self._model_handle.model
+
+    def _query_key(self, query: str) -> str:
+        """Cache key component for a query under this model."""
+        return hashlib.sha256(f"{self.model_name}\x00{query}".encode("utf-8")).hexdigest()
+
+    def _document_text(self, result: Dict[str, Any]) -> str:
+        """Text of a search result passed to the cross-encoder."""
+        text = result.get("document") or ""
+        if not text:
+            metadata = result.get("metadata") or {}
+            text = f"{metadata.get('title', '')}. {metadata.get('abstract', '')}"
+        return text[:self.max_document_chars]
+
+    def _rerank_depth(self, candidates: List[Dict[str, Any]], query_key: str,
+                      latency_budget_ms: Optional[float]) -> int:
+        """Number of leading candidates whose uncached pairs fit the budget."""
+        depth = min(self.max_depth, len(candidates))
+        if latency_budget_ms is None:
+            return depth
+
+        affordable = int(latency_budget_ms / self._pair_ms)
+        with self._lock:
+            for i, result in enumerate(candidates[:depth]):
+                if (query_key, str(result["id"])) not in self._cache:
+                    affordable -= 1
+                    if affordable < 0:
+                        return i
+        return depth
+
+    def _score_pairs(self, query: str, query_key: str,
+                     candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """Scores of (query, candidate) pairs, using and filling the cache."""
+        scores = np.empty(len(candidates), dtype=np.float32)
+        missing = []
+        with self._lock:
+            for i, result in enumerate(candidates):
+                key = (query_key, str(result["id"]))
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[i] = self._cache[key]
+                else:
+                    missing.append(i)
+            self._hits += len(candidates) - len(missing)
+            self._misses += len(missing)
+
+        if not missing:
+            return scores
+
+        model = self.model
+        if model is None:
+            raise RuntimeError(f"Cross-encoder model '{self.model_name}' is not available")
+
+        pairs = [(query, self._document_text(candidates[i])) for i in missing]
+        start = time.perf_counter()
+        predicted = np.asarray(
+            model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False),
+            dtype=np.float32).reshape(len(pairs), -1)[:, -1]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self._pair_ms = (PAIR_COST_DECAY * self._pair_ms
+                             + (1 - PAIR_COST_DECAY) * elapsed_ms / len(pairs))
+            for i, score in zip(missing, predicted):
+                scores[i] = score
+                self._cache[(query_key, str(candidates[i]["id"]))] = float(score)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return scores
+
+    def rerank(self,
+               query: str,
+               results: List[Dict[str, Any]],
+               top_k: Optional[int] = None,
+               latency_budget_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Rerank search results for a query.
+
+        Args:
+            query: Search query
+            results: Candidates in first-stage order (need ``id`` and
+                ``document`` or title/abstract metadata)
+            top_k: Number of results to return (all if None)
+            latency_budget_ms: Override of the configured scoring budget
+
+        Returns:
+            Results ordered by cross-encoder score, each reranked one with a
+            ``rerank_score``; candidates beyond the rerank depth follow in
+            their original order
+        """
+        top_k = len(results) if top_k is None else top_k
+        if not results or top_k <= 0:
+            return []
+
+        budget = self.latency_budget_ms if latency_budget_ms is None else latency_budget_ms
+        query_key = self._query_key(query)
+        depth = self._rerank_depth(results, query_key, budget)
+        if depth < min(self.max_depth, len(results)):
+            self.logger.debug(f"Rerank depth capped at {depth} by the latency budget")
+
+        head = results[:depth]
+        try:
+            scores = self._score_pairs(query, query_key, head) if head else np.empty(0)
+        except Exception as e:
+            self.logger.error(f"Reranking failed, keeping vector order: {e}")
+            return results[:top_k]
+
+        reranked = []
+        for i in np.argsort(-scores, kind="stable"):
+            reranked.append(dict(head[i], rerank_score=float(scores[i])))
+        return (reranked + results[depth:])[:top_k]
+
+    async def arerank(self, query: str, results: List[Dict[str, Any]],
+                      top_k: Optional[int] = None,
+                      latency_budget_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`rerank`, run on the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.rerank, query, results, top_k, latency_budget_ms))
+
+    def clear_cache(self) -> None:
+        """Drop all cached pair scores."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get reranker statistics.
+
+        Returns:
+            Cache size and hit rate, and the measured per-pair cost
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "model": self.model_name,
+                "cached_pairs": len(self._cache),
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "pair_ms": round(self._pair_ms, 3),
+                "max_depth": self.max_depth,
+                "latency_budget_ms": self.latency_budget_ms,
+            }
@@ -0,0 +1,639 @@
+"""Vector store sharded across several collections by a paper key."""
+
+import asyncio
+import functools
+import hashlib
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.logger import LoggerMixin
+from ..utils.onnx_encoder import MIN_COSINE_FP32
+from ..retrieval.base_retriever import LiteratureItem
+from .vector_store import VectorStore
+
+SHARD_KEYS = ("year", "category", "hash")
+
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.-]+")
+
+
+class ShardedVectorStore(LoggerMixin):
+    """
+    Vector store split into one :class:`VectorStore` per shard.
+
+    Papers are routed to a shard by publication year bucket, primary
+    category or a hash of the ID, and each shard lives in its own directory.
+    Queries are encoded once, fanned out to the shards in parallel and the
+    per-shard top-k lists merged by distance, which gives the exact global
+    top-k because every shard uses the same model and distance space. Shards
+    that a ``where`` filter rules out (a year range for year sharding, a
+    primary category for category sharding) are not queried.
+    """
+
+    def __init__(self,
+                 persist_directory: str = "./data/chroma_db",
+                 collection_name: str = "literature_collection",
+                 shard_key: str = "hash",
+                 n_shards: int = 8,
+                 year_bucket: int = 5,
+                 max_parallel_shards: int = 8,
+                 executor_workers: int = 2,
+                 **store_kwargs: Any):
+        """
+        Initialize the sharded vector store.
+
+        Args:
+            persist_directory: Root directory; each shard gets a subdirectory
+            collection_name: Collection name used inside every shard
+            shard_key: ``year``, ``category`` or ``hash``
+            n_shards: Number of shards for ``hash`` sharding
+            year_bucket: Years per shard for ``year`` sharding
+            max_parallel_shards: Shards queried or written concurrently
+            executor_workers: Threads running the ``a*`` async methods
+            **store_kwargs: Passed to each shard's :class:`VectorStore`
+                (embedding model, backend, cache directory, ...)
+        """
+        if shard_key not in SHARD_KEYS:
+            raise ValueError(
+                f"Unknown shard key: {shard_key}. Choose from: {', '.join(SHARD_KEYS)}")
+
+        self.persist_directory = Path(persist_directory)
+        self.collection_name = collection_name
+        self.shard_key = shard_key
+        self.n_shards = n_shards
+        self.year_bucket = year_bucket
+        self.store_kwargs = store_kwargs
+        self.embedding_model_name = store_kwargs.get("embedding_model", "all-MiniLM-L6-v2")
+
+        # Searches go through the shards' dense indexes only
+        self.lexical_index = None
+        self.index_chunks = False
+
+        self.shards_directory = self.persist_directory / "shards"
+        self.shards_directory.mkdir(parents=True, exist_ok=True)
+        self._check_layout()
+
+        self._shards: Dict[str, VectorStore] = {}
+        self._shards_lock = threading.Lock()
+        for path in sorted(self.shards_directory.iterdir()):
+            if path.is_dir():
+                self._get_shard(path.name)
+
+        self._fanout_executor = ThreadPoolExecutor(
+            max_workers=max_parallel_shards, thread_name_prefix="shard-fanout")
+        # Separate pool: async calls block on fan-out work and must not
+        # occupy the threads that work needs
+        self._executor = ThreadPoolExecutor(
+            max_workers=executor_workers, thread_name_prefix="sharded-store")
+
+        self.logger.info(
+            f"Opened {len(self._shards)} shards by {shard_key} at {self.shards_directory}")
+
+    # Routing
+
+    def _check_layout(self) -> None:
+        """Record the sharding layout, refusing to reopen with a different one."""
+        layout = {"shard_key": self.shard_key}
+        if self.shard_key == "hash":
+            layout["n_shards"] = self.n_shards
+        elif self.shard_key == "year":
+            layout["year_bucket"] = self.year_bucket
+
+        layout_path = self.shards_directory / "layout.json"
+        if layout_path.exists():
+            stored = json.loads(layout_path.read_text())
+            if stored != layout:
+                raise ValueError(
+                    f"Shards at {self.shards_directory} use layout {stored}, not {layout}")
+        else:
+            layout_path.write_text(json.dumps(layout))
+
+    def shard_for(self, item: LiteratureItem) -> str:
+        """
+        Get the name of the shard a paper belongs to.
+
+        Args:
+            item: Literature item
+
+        Returns:
+            Shard name, also used as its directory name
+        """
+        if self.shard_key == "year":
+            if item.year is None:
+                return "year_unknown"
+            return f"year_{item.year // self.year_bucket * self.year_bucket}"
+        if self.shard_key == "category":
+            category = item.categories[0] if item.categories else "none"
+            return f"category_{_UNSAFE_NAME_CHARS.sub('_', category)}"
+
+        digest = hashlib.blake2b(item.id.encode("utf-8"), digest_size=8).digest()
+        return f"hash_{int.from_bytes(digest, 'big') % self.n_shards:03d}"
+
+    def _get_shard(self, name: str) -> VectorStore:
+        """Open a shard, creating it if needed."""
+        with self._shards_lock:
+            shard = self._shards.get(name)
+            if shard is None:
+                shard = VectorStore(
+                    persist_directory=str(self.shards_directory / name),
+                    collection_name=self.collection_name,
+                    executor_workers=1,
+                    **self.store_kwargs
+                )
+                self._shards[name] = shard
+            return shard
+
+    def _shard_list(self) -> List[Tuple[str, VectorStore]]:
+        """Snapshot of the open shards."""
+        with self._shards_lock:
+            return list(self._shards.items())
+
+    def _prune(self, where: Optional[Dict[str, Any]] = None,
+               year_from: Optional[int] = None,
+               year_to: Optional[int] = None) -> List[Tuple[str, VectorStore]]:
+        """Shards that can hold papers matching the filters."""
+        shards = self._shard_list()
+
+        if self.shard_key == "year":
+            low, high = _year_bounds(where)
+            if year_from is not None:
+                low = year_from if low is None else max(low, year_from)
+            if year_to is not None:
+                high = year_to if high is None else min(high, year_to)
+            if low is None and high is None:
+                return shards
+
+            kept = []
+            for name, shard in shards:
+                if name == "year_unknown":
+                    continue
+                start = int(name.split("_", 1)[1])
+                end = start + self.year_bucket - 1
+                if (low is None or end >= low) and (high is None or start <= high):
+                    kept.append((name, shard))
+            return kept
+
+        if self.shard_key == "category":
+            categories = _equality_values(where, "primary_category")
+            if categories is not None:
+                names = {f"category_{_UNSAFE_NAME_CHARS.sub('_', str(c))}"
+                         for c in categories}
+                return [(name, shard) for name, shard in shards if name in names]
+
+        return shards
+
+    def _fan_out(self, shards: Sequence[Tuple[str, VectorStore]], func) -> List[Any]:
+        """Run ``func(name, shard)`` on every shard in parallel."""
+        if len(shards) == 1:
+            return [func(*shards[0])]
+        futures = [self._fanout_executor.submit(func, name, shard)
+                   for name, shard in shards]
+        return [future.result() for future in futures]
+
+    def _encode(self, queries: List[str]) -> Optional[np.ndarray]:
+        """Encode queries once for every shard."""
+        shards = self._shard_list()
+        if not shards:
+            return None
+        return shards[0][1]._encode_texts(queries)
+
+    # Ingest
+
+    def upsert_literature_items(self, items: List[LiteratureItem]) -> Dict[str, int]:
+        """
+        Route items to their shards and upsert them, shards in parallel.
+
+        A paper whose year or primary category changed is moved: once it is
+        stored in its new shard, the copy in its old shard is deleted.
+
+        Args:
+            items: List of literature items
+
+        Returns:
+            Counts of ``inserted``, ``updated``, ``skipped`` and ``failed`` items
+        """
+        routed: Dict[str, List[LiteratureItem]] = {}
+        for item in items:
+            routed.setdefault(self.shard_for(item), []).append(item)
+
+        shards = [(name, self._get_shard(name)) for name in routed]
+        results = self._fan_out(
+            shards, lambda name, shard: shard.upsert_literature_items(routed[name]))
+
+        if self.shard_key != "hash":
+            self._drop_moved_copies(routed)
+
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+        for shard_counts in results:
+            for key in counts:
+                counts[key] += shard_counts[key]
+        return counts
+
+    @staticmethod
+    def _stored_ids(shard: VectorStore, item_ids: List[str]) -> List[str]:
+        """IDs among ``item_ids`` that a shard holds."""
+        stored = []
+        for start in range(0, len(item_ids), 500):
+            stored.extend(shard.collection.get(
+                ids=item_ids[start:start + 500], include=[])['ids'])
+        return stored
+
+    def _drop_moved_copies(self, routed: Dict[str, List[LiteratureItem]]) -> None:
+        """Delete copies of routed items from shards other than their own."""
+        home: Dict[str, str] = {}
+        for name, shard_items in routed.items():
+            # Only items their new shard actually stored; a failed write
+            # keeps the old copy
+            for item_id in self._stored_ids(self._get_shard(name),
+                                            [item.id for item in shard_items]):
+                home[item_id] = name
+        if not home:
+            return
+
+        item_ids = list(home)
+
+        def drop(name: str, shard: VectorStore) -> int:
+            stale = [item_id for item_id in self._stored_ids(shard, item_ids)
+                     if home[item_id] != name]
+            return sum(shard.delete_item(item_id) for item_id in stale)
+
+        moved = sum(self._fan_out(self._shard_list(), drop))
+        if moved:
+            self.logger.info(f"Moved {moved} items to new shards")
+
+    def add_literature_items(self, items: List[LiteratureItem]) -> int:
+        """
+        Add multiple literature items.
+
+        Args:
+            items: List of literature items to add
+
+        Returns:
+            Number of items stored (added, updated or already current)
+        """
+        counts = self.upsert_literature_items(items)
+        return counts['inserted'] + counts['updated'] + counts['skipped']
+
+    def add_literature_item(self, item: LiteratureItem) -> bool:
+        """
+        Add a literature item.
+
+        Args:
+            item: Literature item to add
+
+        Returns:
+            True if the item is stored
+        """
+        return self.upsert_literature_items([item])['failed'] == 0
+
+    # Search
+
+    def search_similar(self,
+                       query: str,
+                       n_results: int = 10,
+                       where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Search every relevant shard and merge the results.
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            where: Optional metadata filters
+
+        Returns:
+            List of search results with metadata and their ``shard``
+        """
+        return self.search_similar_batch([query], n_results, where)[0]
+
+    def search_similar_batch(self,
+                             queries: List[str],
+                             n_results: int = 10,
+                             where: Optional[Dict[str, Any]] = None
+                             ) -> List[List[Dict[str, Any]]]:
+        """
+        Search every relevant shard for several queries and merge the results.
+
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+            where: Optional metadata filters applied to every query
+
+        Returns:
+            One result list per query, in query order
+        """
+        if not queries:
+            return []
+
+        try:
+            shards = self._prune(where)
+            query_embeddings = self._encode(queries) if shards else None
+            if query_embeddings is None:
+                return [[] for _ in queries]
+
+            def query_shard(name: str, shard: VectorStore) -> List[List[Dict[str, Any]]]:
+                if shard.collection.count() == 0:
+                    return [[] for _ in queries]
+                results = shard._query_embeddings(query_embeddings, n_results, where)
+                for query_results in results:
+                    for result in query_results:
+                        result['shard'] = name
+                return results
+
+            per_shard = self._fan_out(shards, query_shard)
+            merged = [
+                _merge([shard_results[q] for shard_results in per_shard], n_results)
+                for q in range(len(queries))
+            ]
+            self.logger.info(
+                f"Searched {len(shards)} of {len(self._shards)} shards "
+                f"for {len(queries)} queries")
+            return merged
+
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Invalid search parameters: {e}")
+            return [[] for _ in queries]
+        except Exception as e:
+            self.logger.error(f"Unexpected error searching shards: {e}")
+            return [[] for _ in queries]
+
+    def search_filtered(self,
+                        query: str,
+                        n_results: int = 10,
+                        categories: Optional[List[str]] = None,
+                        year_from: Optional[int] = None,
+                        year_to: Optional[int] = None,
+                        authors: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search within papers matching category, year and author filters.
+
+        Each shard plans the filtered search on its own side indexes; year
+        filters also prune shards when sharding by year.
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            categories: Match papers in any of these categories
+            year_from: Earliest publication year (inclusive)
+            year_to: Latest publication year (inclusive)
+            authors: Match papers by any of these authors
+
+        Returns:
+            List of search results with metadata and their ``shard``
+        """
+        try:
+            shards = self._prune(year_from=year_from, year_to=year_to)
+            query_embeddings = self._encode([query]) if shards else None
+            if query_embeddings is None:
+                return []
+
+            def search_shard(name: str, shard: VectorStore) -> List[Dict[str, Any]]:
+                results = shard._search_filtered_embedding(
+                    query_embeddings[0], n_results, categories, year_from, year_to, authors)
+                for result in results:
+                    result['shard'] = name
+                return results
+
+            return _merge(self._fan_out(shards, search_shard), n_results)
+
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Invalid search parameters: {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Unexpected error in filtered shard search: {e}")
+            return []
+
+    # Items
+
+    def get_items(self, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several items by ID from whichever shards hold them.
+
+        Args:
+            item_ids: Literature item IDs
+
+        Returns:
+            Found items in the requested order; missing IDs are omitted
+        """
+        if not item_ids or not self._shards:
+            return []
+
+        found: Dict[str, Dict[str, Any]] = {}
+        for shard_items in self._fan_out(
+                self._shard_list(),
+                lambda name, shard: shard.get_items(item_ids)):
+            for item in shard_items:
+                found[item['id']] = item
+        return [found[item_id] for item_id in item_ids if item_id in found]
+
+    def get_item_by_id(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific item by ID.
+
+        Args:
+            item_id: Literature item ID
+
+        Returns:
+            Item data or None if not found
+        """
+        items = self.get_items([item_id])
+        return items[0] if items else None
+
+    def delete_item(self, item_id: str) -> bool:
+        """
+        Delete an item from every shard that holds it.
+
+        Args:
+            item_id: Literature item ID
+
+        Returns:
+            True if successful, False otherwise
+        """
+        results = self._fan_out(self._shard_list(),
+                                lambda name, shard: shard.delete_item(item_id))
+        return all(results)
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """
+        Get totals and per-shard statistics.
+
+        Returns:
+            Dictionary with collection statistics
+        """
+        shards = self._shard_list()
+        shard_stats = dict(zip(
+            [name for name, _ in shards],
+            self._fan_out(shards, lambda name, shard: shard.get_collection_stats())
+        )) if shards else {}
+        return {
+            'total_items': sum(stats.get('total_items', 0) for stats in shard_stats.values()),
+            'collection_name': self.collection_name,
+            'embedding_model': self.embedding_model_name,
+            'shard_key': self.shard_key,
+            'shard_count': len(shard_stats),
+            'shards': shard_stats,
+        }
+
+    def check_embedding_compatibility(self, min_cosine: float = MIN_COSINE_FP32,
+                                      sample_size: int = 16) -> Dict[str, Any]:
+        """
+        Compare stored vectors with the current encoder on a sample.
+
+        Every shard uses the same model, so the first non-empty shard is
+        sampled.
+
+        Args:
+            min_cosine: Smallest acceptable per-document cosine similarity
+            sample_size: Number of stored documents to re-encode
+
+        Returns:
+            Similarity report, or an empty dictionary if no shard holds data
+        """
+        for _, shard in self._shard_list():
+            if shard.collection.count():
+                return shard.check_embedding_compatibility(min_cosine, sample_size)
+        return {}
+
+    def reset_collection(self) -> bool:
+        """
+        Reset (clear) every shard.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        results = self._fan_out(self._shard_list(),
+                                lambda name, shard: shard.reset_collection())
+        return all(results)
+
+    # Async API
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        """Run a blocking call on the store's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    async def asearch_similar(self, query: str, n_results: int = 10,
+                              where: Optional[Dict[str, Any]] = None
+                              ) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`search_similar`."""
+        return await self._run_in_executor(self.search_similar, query, n_results, where)
+
+    async def asearch_similar_batch(self, queries: List[str], n_results: int = 10,
+                                    where: Optional[Dict[str, Any]] = None
+                                    ) -> List[List[Dict[str, Any]]]:
+        """Async variant of :meth:`search_similar_batch`."""
+        return await self._run_in_executor(
+            self.search_similar_batch, queries, n_results, where)
+
+    async def asearch_filtered(self, query: str, n_results: int = 10,
+                               **filters: Any) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`search_filtered`."""
+        return await self._run_in_executor(
+            self.search_filtered, query, n_results, **filters)
+
+    async def aadd_literature_items(self, items: List[LiteratureItem]) -> int:
+        """Async variant of :meth:`add_literature_items`."""
+        return await self._run_in_executor(self.add_literature_items, items)
+
+    async def aupsert_literature_items(self, items: List[LiteratureItem]) -> Dict[str, int]:
+        """Async variant of :meth:`upsert_literature_items`."""
+        return await self._run_in_executor(self.upsert_literature_items, items)
+
+    async def aget_items(self, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`get_items`."""
+        return await self._run_in_executor(self.get_items, item_ids)
+
+    def close(self) -> None:
+        """Stop worker threads and close every shard."""
+        self._executor.shutdown(wait=True)
+        self._fanout_executor.shutdown(wait=True)
+        for shard in self._shards.values():
+            shard.close()
+
+
+def _merge(result_lists: Sequence[List[Dict[str, Any]]], n_results: int) -> List[Dict[str, Any]]:
+    """
+    Merge per-shard result lists into the global top ``n_results``.
+
+    A paper returned by several shards appears once, with its best distance.
+    """
+    ranked = sorted(
+        chain.from_iterable(result_lists),
+        key=lambda result: result['distance'] if result['distance'] is not None else float("inf"))
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    for result in ranked:
+        if len(merged) >= n_results:
+            break
+        if result['id'] not in seen:
+            seen.add(result['id'])
+            merged.append(result)
+    return merged
+
+
+def _year_bounds(where: Optional[Dict[str, Any]]) -> Tuple[Optional[int], Optional[int]]:
+    """Inclusive year range implied by a ``where`` filter (None if unbounded)."""
+    low: Optional[float] = None
+    high: Optional[float] = None
+    if not where:
+        return None, None
+
+    for key, condition in where.items():
+        if key == "$and":
+            for clause in condition:
+                clause_low, clause_high = _year_bounds(clause)
+                if clause_low is not None:
+                    low = clause_low if low is None else max(low, clause_low)
+                if clause_high is not None:
+                    high = clause_high if high is None else min(high, clause_high)
+            continue
+        if key != "year":
+            continue
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        bounds = []
+        for op, value in condition.items():
+            if op == "$eq":
+                bounds.append((value, value))
+            elif op in ("$gt", "$gte"):
+                bounds.append((value + (1 if op == "$gt" else 0), None))
+            elif op in ("$lt", "$lte"):
+                bounds.append((None, value - (1 if op == "$lt" else 0)))
+            elif op == "$in" and value:
+                bounds.append((min(value), max(value)))
+        for bound_low, bound_high in bounds:
+            if bound_low is not None:
+                low = bound_low if low is None else max(low, bound_low)
+            if bound_high is not None:
+                high = bound_high if high is None else min(high, bound_high)
+
+    return (None if low is None else int(np.ceil(low)),
+            None if high is None else int(np.floor(high)))
+
+
+def _equality_values(where: Optional[Dict[str, Any]], field: str) -> Optional[List[Any]]:
+    """Values a field is restricted to by ``$eq``/``$in`` (None if unrestricted)."""
+    if not where:
+        return None
+
+    for key, condition in where.items():
+        if key == "$and":
+            for clause in condition:
+                values = _equality_values(clause, field)
+                if values is not None:
+                    return values
+        elif key == field:
+            if not isinstance(condition, dict):
+                return [condition]
+            if "$eq" in condition:
+                return [condition["$eq"]]
+            if "$in" in condition:
+                return list(condition["$in"])
+    return None
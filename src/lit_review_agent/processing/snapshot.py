@@ -0,0 +1,209 @@
+"""Columnar snapshots of vector collections (Parquet or Arrow IPC).
+
+A snapshot stores every record's ID, embedding, document and metadata, so a
+collection can be moved or rebuilt without re-embedding. Files are written
+and read in record batches; neither side holds the whole collection in
+memory.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_VERSION = 1
+# Suffixes written as Arrow IPC files; everything else is Parquet
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+Batch = Tuple[List[str], np.ndarray, List[Optional[str]], List[Dict[str, Any]]]
+
+
+def _require_pyarrow() -> None:
+    """Raise a helpful error when pyarrow is missing."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError(
+            "Collection snapshots require pyarrow. Install it with: pip install pyarrow")
+
+
+def snapshot_format(path: Path) -> str:
+    """Get the snapshot format (``arrow`` or ``parquet``) implied by a path."""
+    return "arrow" if Path(path).suffix.lower() in ARROW_SUFFIXES else "parquet"
+
+
+def _schema(dim: int, info: Dict[str, Any]) -> "pa.Schema":
+    """Arrow schema of a snapshot with embeddings of dimension ``dim``."""
+    return pa.schema(
+        [
+            pa.field("id", pa.string(), nullable=False),
+            pa.field("embedding", pa.list_(pa.float32(), dim), nullable=False),
+            pa.field("document", pa.string()),
+            # Metadata keys differ per record (category flags), so it stays JSON
+            pa.field("metadata", pa.string()),
+        ],
+        metadata={"snapshot": json.dumps(info)},
+    )
+
+
+def _record_batch(schema: "pa.Schema", batch: Batch) -> "pa.RecordBatch":
+    """Convert one batch of records into an Arrow record batch."""
+    ids, embeddings, documents, metadatas = batch
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    dim = schema.field("embedding").type.list_size
+    return pa.record_batch(
+        [
+            pa.array(ids, type=pa.string()),
+            pa.FixedSizeListArray.from_arrays(pa.array(embeddings.reshape(-1)), dim),
+            pa.array(documents, type=pa.string()),
+            pa.array([json.dumps(m or {}) for m in metadatas], type=pa.string()),
+        ],
+        schema=schema,
+    )
+
+
+def write_snapshot(path: str, batches: Iterator[Batch],
+                   info: Dict[str, Any]) -> int:
+    """
+    Stream record batches into a snapshot file.
+
+    The file is written next to its destination and renamed into place when
+    complete, so an interrupted export never leaves a truncated snapshot.
+
+    Args:
+        path: Destination file; ``.arrow``/``.feather``/``.ipc`` selects Arrow
+            IPC, anything else Parquet
+        batches: Iterator of (ids, embeddings, documents, metadatas)
+        info: Snapshot-level information stored in the schema metadata
+
+    Returns:
+        Number of records written
+    """
+    _require_pyarrow()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    file_format = snapshot_format(path)
+
+    writer = None
+    rows = 0
+    try:
+        for batch in batches:
+            if not batch[0]:
+                continue
+            if writer is None:
+                dim = int(np.asarray(batch[1]).shape[1])
+                schema = _schema(dim, dict(info, version=SNAPSHOT_VERSION, dim=dim,
+                                           created_at=time.time()))
+                writer = (pa_ipc.new_file(str(tmp_path), schema)
+                          if file_format == "arrow"
+                          else pq.ParquetWriter(str(tmp_path), schema, compression="zstd"))
+            record_batch = _record_batch(schema, batch)
+            if file_format == "arrow":
+                writer.write_batch(record_batch)
+            else:
+                writer.write_table(pa.Table.from_batches([record_batch]))
+            rows += len(batch[0])
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if writer is None:
+        raise ValueError("Cannot write an empty snapshot")
+    writer.close()
+    tmp_path.replace(path)
+    return rows
+
+
+def read_snapshot_info(path: str) -> Dict[str, Any]:
+    """
+    Read snapshot-level information without loading any records.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Information dictionary (model, dimension, record count, ...)
+    """
+    _require_pyarrow()
+    if snapshot_format(Path(path)) == "arrow":
+        with pa.memory_map(str(path)) as source:
+            schema = pa_ipc.open_file(source).schema
+    else:
+        schema = pq.read_schema(str(path))
+    raw = (schema.metadata or {}).get(b"snapshot")
+    return json.loads(raw) if raw else {}
+
+
+def iter_snapshot(path: str, batch_size: int = 5000) -> Iterator[Batch]:
+    """
+    Stream records out of a snapshot file.
+
+    Args:
+        path: Snapshot file
+        batch_size: Maximum records per yielded batch
+
+    Yields:
+        Tuples of (ids, embeddings, documents, metadatas)
+    """
+    _require_pyarrow()
+    if snapshot_format(Path(path)) == "arrow":
+        with pa.memory_map(str(path)) as source:
+            reader = pa_ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                record_batch = reader.get_batch(i)
+                for start in range(0, record_batch.num_rows, batch_size):
+                    yield _to_batch(record_batch.slice(start, batch_size))
+    else:
+        for record_batch in pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size):
+            yield _to_batch(record_batch)
+
+
+def _to_batch(record_batch: "pa.RecordBatch") -> Batch:
+    """Convert an Arrow record batch back into Python lists and an array."""
+    embedding_column = record_batch.column("embedding")
+    dim = embedding_column.type.list_size
+    embeddings = embedding_column.flatten().to_numpy(zero_copy_only=False)
+    return (
+        record_batch.column("id").to_pylist(),
+        embeddings.reshape(-1, dim),
+        record_batch.column("document").to_pylist(),
+        [json.loads(m) if m else {} for m in record_batch.column("metadata").to_pylist()],
+    )
+
+
+def collection_batches(collection, batch_size: int = 5000) -> Iterator[Batch]:
+    """
+    Page through a Chroma-compatible collection.
+
+    Args:
+        collection: Collection supporting ``count`` and paged ``get``
+        batch_size: Records fetched per page
+
+    Yields:
+        Tuples of (ids, embeddings, documents, metadatas)
+    """
+    for offset in range(0, collection.count(), batch_size):
+        page = collection.get(limit=batch_size, offset=offset,
+                              include=["embeddings", "documents", "metadatas"])
+        if not page["ids"]:
+            continue
+        yield (
+            list(page["ids"]),
+            np.asarray(page["embeddings"], dtype=np.float32),
+            list(page["documents"]) if page["documents"] is not None
+            else [None] * len(page["ids"]),
+            list(page["metadatas"]) if page["metadatas"] is not None
+            else [{}] * len(page["ids"]),
+        )
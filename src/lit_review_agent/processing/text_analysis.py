@@ -0,0 +1,232 @@
+"""Single-pass text analysis engine with precompiled patterns.
+
+The analyzer walks a document once with a single compiled scanner and
+records section boundaries, text statistics and research-gap statements as
+character offsets into the original string, so no intermediate copies of the
+text are made until a caller asks for them.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+Span = Tuple[int, int]
+
+# Canonical section name for every recognised heading word
+SECTION_HEADINGS: Dict[str, Optional[str]] = {
+    "abstract": "abstract",
+    "introduction": "introduction",
+    "methodology": "methodology",
+    "methods": "methodology",
+    "approach": "methodology",
+    "results": "results",
+    "experiments": "results",
+    "evaluation": "results",
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+    "summary": "conclusion",
+    # Headings that only close the previous section
+    "keywords": None,
+    "background": None,
+    "related work": None,
+    "discussion": None,
+    "limitations": None,
+    "references": None,
+    "bibliography": None,
+    "acknowledgments": None,
+    "acknowledgements": None,
+    "appendix": None,
+}
+
+# Statements that usually introduce limitations or open problems
+GAP_CUES = ("limitations", "limitation", "future work", "however", "although", "despite")
+
+_HEADING_WORDS = "|".join(
+    sorted((re.escape(word) for word in SECTION_HEADINGS), key=len, reverse=True)
+)
+_GAP_WORDS = "|".join(re.escape(cue) for cue in GAP_CUES)
+# First letters of the gap cues; a cheap guard before the full alternation
+_GAP_INITIALS = "".join(sorted({cue[0] for cue in GAP_CUES} | {cue[0].upper() for cue in GAP_CUES}))
+_WORD = r"\w+(?:['’-]\w+)*"
+
+# One scanner for the whole document. Alternatives are tried in order at each
+# position: headings only at line starts, gap cues as zero-width markers so
+# the cue words are still counted, then paragraph breaks, sentence ends and
+# runs of single-space separated words (counted without copying them).
+_SCANNER = re.compile(
+    rf"""
+    (?P<heading>
+        ^[ \t]*
+        (?:(?P<num>(?:\d{{1,2}}|[IVX]{{1,4}})\.|\d{{1,2}})[ \t]+)?
+        (?P<head>(?i:{_HEADING_WORDS}))\b
+        [ \t]*(?P<delim>[:.—-]|$)?
+    )
+    |(?P<numbered>^[ \t]*\d{{1,2}}\.?[ \t]+(?=(?P<title>[A-Z][^\n]{{0,80}})$))
+    |(?P<gap>(?=[{_GAP_INITIALS}])\b(?=(?i:{_GAP_WORDS})\b))
+    |(?P<para>\n(?:[ \t]*\n)+)
+    |(?P<sent>[.!?]+(?=\s|$))
+    |(?P<words>{_WORD}(?:[ ](?!(?=[{_GAP_INITIALS}])(?i:{_GAP_WORDS})\b){_WORD})*)
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# Matches a known heading word anywhere in a numbered line
+_HEADING_WORD_PATTERN = re.compile(rf"\b(?i:{_HEADING_WORDS})\b")
+# Lower-case words allowed in a title-case heading
+_TITLE_SMALL_WORDS = frozenset(
+    "a an and as at by for from in into of on or the to via vs with".split()
+)
+# Longer numbered lines are list items or wrapped body text
+MAX_NUMBERED_HEADING_WORDS = 10
+
+# Skips the cue (and a trailing colon or comma) to where the gap statement starts
+_GAP_PREFIX = re.compile(
+    rf"(?i:{_GAP_WORDS})[ \t]*[:,]?\s*",
+)
+
+# Removed during preprocessing: citations, URLs and email addresses
+NOISE_PATTERN = re.compile(r"\[[\d\w\s,\.]+\]|https?://\S+|\S+@\S+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\s*\n")
+HORIZONTAL_SPACE_PATTERN = re.compile(r"[ \t]+")
+
+
+class TextAnalysis:
+    """Offsets and statistics produced by :func:`analyze_text`."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sections: Dict[str, Span] = {}
+        self.gaps: List[Span] = []
+        self.characters = len(text)
+        self.words = 0
+        self.sentences = 0
+        self.paragraphs = 0
+
+    def section_text(self, name: str) -> str:
+        """Get the raw text of a section, or an empty string if absent."""
+        span = self.sections.get(name)
+        return self.text[span[0] : span[1]] if span else ""
+
+    def gap_texts(self, min_length: int = 20) -> List[str]:
+        """Get gap statements longer than ``min_length`` characters."""
+        gaps = []
+        for start, end in self.gaps:
+            statement = self.text[start:end].strip()
+            if len(statement) > min_length:
+                gaps.append(statement)
+        return gaps
+
+    def statistics(self) -> Dict[str, float]:
+        """Get text statistics in the format of ``TextProcessor.get_text_statistics``."""
+        return {
+            "characters": self.characters,
+            "words": self.words,
+            "sentences": self.sentences,
+            "paragraphs": self.paragraphs,
+            "avg_words_per_sentence": self.words / max(self.sentences, 1),
+            "avg_chars_per_word": self.characters / max(self.words, 1),
+        }
+
+
+def _is_numbered_heading(title: str) -> bool:
+    """
+    Whether the text after a line's leading number reads as a section heading.
+
+    Args:
+        title: Rest of the line after the number
+
+    Returns:
+        True for short lines without closing punctuation that contain a known
+        heading word or are written in title case
+    """
+    words = title.split()
+    if len(words) > MAX_NUMBERED_HEADING_WORDS or title.rstrip()[-1:] in ".!?,;:":
+        return False
+    if _HEADING_WORD_PATTERN.search(title):
+        return True
+    return all(
+        word[0].isupper() or not word[0].isalpha() or word.lower() in _TITLE_SMALL_WORDS
+        for word in words
+    )
+
+
+def analyze_text(text: str) -> TextAnalysis:
+    """
+    Analyze a document in a single pass.
+
+    Args:
+        text: Full document text
+
+    Returns:
+        TextAnalysis with section spans, gap spans and statistics
+    """
+    analysis = TextAnalysis(text)
+    if not text:
+        return analysis
+
+    # (section name or None, heading start, content start)
+    boundaries: List[Tuple[Optional[str], int, int]] = []
+    in_paragraph = False
+    words_in_sentence = 0
+
+    for match in _SCANNER.finditer(text):
+        kind = match.lastgroup
+
+        if kind == "words":
+            count = text.count(" ", match.start(), match.end()) + 1
+            analysis.words += count
+            words_in_sentence += count
+            if not in_paragraph:
+                analysis.paragraphs += 1
+                in_paragraph = True
+        elif kind == "sent":
+            if words_in_sentence:
+                analysis.sentences += 1
+                words_in_sentence = 0
+        elif kind == "para":
+            in_paragraph = False
+        elif kind == "gap":
+            start = _GAP_PREFIX.match(text, match.start()).end()
+            end = text.find(".", start)
+            analysis.gaps.append((start, end if end != -1 else len(text)))
+        elif kind == "heading":
+            head = match.group("head")
+            # Reject ordinary sentences that merely start with a heading word
+            if match.group("num") or match.group("delim") is not None or head.isupper():
+                boundaries.append(
+                    (SECTION_HEADINGS[head.lower()], match.start(), match.end())
+                )
+                analysis.words += len(head.split())
+                if head.lower().startswith("limitation"):
+                    # The cue was consumed as a heading; keep its statement
+                    end = text.find(".", match.end())
+                    analysis.gaps.append((match.end(), end if end != -1 else len(text)))
+            else:
+                # Not a heading: count it as regular text and resume scanning
+                analysis.words += len(head.split())
+                words_in_sentence += len(head.split())
+            if not in_paragraph:
+                analysis.paragraphs += 1
+                in_paragraph = True
+        elif kind == "numbered":
+            # Only the number is consumed; the title is scanned as text either
+            # way, so a rejected line ("1. We propose ...") stays in its section
+            if _is_numbered_heading(match.group("title")):
+                boundaries.append((None, match.start(), match.end("title")))
+
+    if words_in_sentence:
+        analysis.sentences += 1
+
+    for i, (name, _, content_start) in enumerate(boundaries):
+        if name is None or name in analysis.sections:
+            continue
+        end = boundaries[i + 1][1] if i + 1 < len(boundaries) else len(text)
+        # Trim surrounding whitespace by moving offsets, not by copying
+        while content_start < end and text[content_start].isspace():
+            content_start += 1
+        while end > content_start and text[end - 1].isspace():
+            end -= 1
+        if end > content_start:
+            analysis.sections[name] = (content_start, end)
+
+    return analysis
@@ -3,13 +3,25 @@
 import re
 from typing import Dict, List, Optional, Set, Tuple
 
-import spacy
 from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from sentence_transformers import SentenceTransformer
 
 from ..utils.logger import LoggerMixin
-from ..utils.helpers import clean_text, extract_keywords
+from ..utils.embedding_scheduler import get_embedding_scheduler
+from ..utils.model_registry import get_model_registry
+from ..utils.helpers import clean_text, extract_keywords_batch
+from .inference_sidecar import InferenceSidecarClient
+from .keyword_backend import KeywordBackend, get_keyword_backend
+from .text_analysis import (
+    HORIZONTAL_SPACE_PATTERN,
+    NOISE_PATTERN,
+    PARAGRAPH_BREAK_PATTERN,
+    WHITESPACE_PATTERN,
+    TextAnalysis,
+    analyze_text,
+)
+
+
+CAMEL_CASE_PATTERN = re.compile(r"^[a-z]+[A-Z][a-z]*")
 
 
 class TextProcessor(LoggerMixin):
@@ -19,6 +31,8 @@ class TextProcessor(LoggerMixin):
         self,
         spacy_model: str = "en_core_web_sm",
         sentence_model: str = "all-MiniLM-L6-v2",
+        keyword_backend: str = "spacy",
+        sidecar: Optional[InferenceSidecarClient] = None,
     ):
         """
         Initialize the text processor.
@@ -26,26 +40,26 @@ class TextProcessor(LoggerMixin):
         Args:
             spacy_model: SpaCy model name for NLP processing
             sentence_model: Sentence transformer model for embeddings
+            keyword_backend: Keyword extractor: ``spacy`` (per document),
+                ``tfidf`` or ``yake`` (scored across the whole corpus)
+            sidecar: Client of an inference sidecar; keyword extraction and
+                similarity embeddings then run there instead of loading the
+                models in this process
         """
         self.spacy_model_name = spacy_model
         self.sentence_model_name = sentence_model
-
-        # Load models
-        try:
-            self.nlp = spacy.load(spacy_model)
-            self.logger.info(f"Loaded spaCy model: {spacy_model}")
-        except OSError:
-            self.logger.warning(
-                f"Could not load spaCy model {spacy_model}, using basic processing"
-            )
-            self.nlp = None
-
-        try:
-            self.sentence_model = SentenceTransformer(sentence_model)
-            self.logger.info(f"Loaded sentence transformer: {sentence_model}")
-        except Exception as e:
-            self.logger.warning(f"Could not load sentence transformer: {e}")
-            self.sentence_model = None
+        self.keyword_backend_name = keyword_backend
+        self.sidecar = sidecar
+        self.keyword_backend: Optional[KeywordBackend] = get_keyword_backend(
+            keyword_backend
+        )
+
+        # Models are shared process-wide and loaded lazily on first use
+        registry = get_model_registry()
+        self._nlp_handle = registry.acquire(registry.SPACY, spacy_model)
+        self._sentence_model_handle = registry.acquire(
+            registry.SENTENCE_TRANSFORMER, sentence_model
+        )
 
         # Initialize stopwords
         try:
@@ -55,6 +69,16 @@ class TextProcessor(LoggerMixin):
 
         self.logger.info("Initialized TextProcessor")
 
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, or None if it could not be loaded."""
+        return self._nlp_handle.model
+
+    @property
+    def sentence_model(self):
+        """Shared sentence transformer, or None if it could not be loaded."""
+        return self._sentence_model_handle.model
+
     def preprocess_text(self, text: str, preserve_structure: bool = False) -> str:
         """
         Preprocess text for analysis.
@@ -72,25 +96,31 @@ class TextProcessor(LoggerMixin):
         # Basic cleaning
         processed = clean_text(text, remove_special_chars=False)
 
-        # Remove citations (e.g., [1], [Smith et al., 2020])
-        processed = re.sub(r"\[[\d\w\s,\.]+\]", "", processed)
-
-        # Remove URLs
-        processed = re.sub(r"http[s]?://\S+", "", processed)
-
-        # Remove email addresses
-        processed = re.sub(r"\S+@\S+", "", processed)
+        # Remove citations (e.g., [1], [Smith et al., 2020]), URLs and emails
+        processed = NOISE_PATTERN.sub("", processed)
 
         # Normalize whitespace
         if preserve_structure:
             # Keep paragraph breaks
-            processed = re.sub(r"\n\s*\n", "\n\n", processed)
-            processed = re.sub(r"[ \t]+", " ", processed)
+            processed = PARAGRAPH_BREAK_PATTERN.sub("\n\n", processed)
+            processed = HORIZONTAL_SPACE_PATTERN.sub(" ", processed)
         else:
-            processed = re.sub(r"\s+", " ", processed)
+            processed = WHITESPACE_PATTERN.sub(" ", processed)
 
         return processed.strip()
 
+    def analyze_text(self, text: str) -> TextAnalysis:
+        """
+        Analyze text in a single pass.
+
+        Args:
+            text: Full paper text
+
+        Returns:
+            TextAnalysis with section offsets, research-gap offsets and statistics
+        """
+        return analyze_text(text or "")
+
     def extract_sections(self, text: str) -> Dict[str, str]:
         """
         Extract standard academic paper sections from text.
@@ -103,21 +133,11 @@ class TextProcessor(LoggerMixin):
         """
         sections = {}
 
-        # Common section headers
-        section_patterns = {
-            "abstract": r"(?i)abstract\s*:?\s*(.*?)(?=\n\s*(?:introduction|keywords|1\.|background))",
-            "introduction": r"(?i)(?:1\.\s*)?introduction\s*:?\s*(.*?)(?=\n\s*(?:2\.|related work|methodology|background))",
-            "methodology": r"(?i)(?:2\.\s*)?(?:methodology|methods|approach)\s*:?\s*(.*?)(?=\n\s*(?:3\.|results|experiments|evaluation))",
-            "results": r"(?i)(?:3\.\s*)?(?:results|experiments|evaluation)\s*:?\s*(.*?)(?=\n\s*(?:4\.|discussion|conclusion|limitations))",
-            "conclusion": r"(?i)(?:4\.\s*)?(?:conclusion|conclusions|summary)\s*:?\s*(.*?)(?=\n\s*(?:references|acknowledgments|appendix|$))",
-        }
-
-        for section_name, pattern in section_patterns.items():
-            match = re.search(pattern, text, re.DOTALL)
-            if match:
-                section_content = match.group(1).strip()
-                if section_content:
-                    sections[section_name] = self.preprocess_text(section_content)
+        analysis = analyze_text(text or "")
+        for section_name in analysis.sections:
+            section_content = analysis.section_text(section_name)
+            if section_content:
+                sections[section_name] = self.preprocess_text(section_content)
 
         # If no sections found, treat entire text as content
         if not sections:
@@ -174,25 +194,9 @@ class TextProcessor(LoggerMixin):
 
         return entities
 
-    def extract_research_keywords(self, text: str, max_keywords: int = 20) -> List[str]:
-        """
-        Extract research-specific keywords from text.
-
-        Args:
-            text: Input text
-            max_keywords: Maximum number of keywords to return
-
-        Returns:
-            List of research keywords
-        """
-        # Get basic keywords
-        basic_keywords = extract_keywords(text, max_keywords=max_keywords * 2)
-
-        # Research-specific filtering
-        research_keywords = []
-
-        # Academic terms that indicate research concepts
-        research_indicators = {
+    # Academic terms that indicate research concepts
+    RESEARCH_INDICATORS = frozenset(
+        {
             "algorithm",
             "model",
             "method",
@@ -220,16 +224,100 @@ class TextProcessor(LoggerMixin):
             "artificial",
             "intelligence",
         }
+    )
+
+    def extract_research_keywords(self, text: str, max_keywords: int = 20) -> List[str]:
+        """
+        Extract research-specific keywords from text.
+
+        Args:
+            text: Input text
+            max_keywords: Maximum number of keywords to return
+
+        Returns:
+            List of research keywords
+        """
+        if self.sidecar is not None:
+            return self.sidecar.extract_keywords(
+                [text], self.spacy_model_name, self.keyword_backend_name,
+                max_keywords=max_keywords, batch=False)[0]
+
+        if self.keyword_backend is not None:
+            # Scored against the corpus of the last batch call, if any
+            return self.keyword_backend.extract(text, max_keywords=max_keywords)
+
+        # Get basic keywords
+        basic_keywords = extract_keywords_batch(
+            [text], max_keywords=max_keywords * 2, spacy_model=self.spacy_model_name
+        )[0]
+        return self._filter_research_keywords(basic_keywords, max_keywords)
+
+    def extract_research_keywords_batch(
+        self,
+        texts: List[str],
+        max_keywords: int = 20,
+        n_process: int = 1,
+        batch_size: int = 32,
+        fit: bool = True,
+    ) -> List[List[str]]:
+        """
+        Extract research-specific keywords from many texts in one pass.
+
+        With a corpus backend (``tfidf``/``yake``) and ``fit`` set, the texts
+        are treated as one corpus and the backend keeps its statistics for
+        later :meth:`extract_research_keywords` calls.
+
+        Args:
+            texts: Input texts
+            max_keywords: Maximum number of keywords to return per text
+            n_process: Number of worker processes for ``nlp.pipe``
+            batch_size: Number of texts buffered per ``nlp.pipe`` batch
+            fit: Refit a corpus backend on ``texts``. When False the texts are
+                scored against the statistics of the last fit, which is left
+                unchanged
+
+        Returns:
+            One keyword list per input text, in input order
+        """
+        if self.sidecar is not None:
+            return self.sidecar.extract_keywords(
+                texts, self.spacy_model_name, self.keyword_backend_name,
+                max_keywords=max_keywords, batch=fit)
+
+        if self.keyword_backend is not None:
+            return self.keyword_backend.extract_batch(
+                texts, max_keywords=max_keywords, fit=fit
+            )
+
+        basic_keywords = extract_keywords_batch(
+            texts,
+            max_keywords=max_keywords * 2,
+            n_process=n_process,
+            batch_size=batch_size,
+            spacy_model=self.spacy_model_name,
+        )
+        return [
+            self._filter_research_keywords(keywords, max_keywords)
+            for keywords in basic_keywords
+        ]
+
+    def _filter_research_keywords(
+        self, basic_keywords: List[str], max_keywords: int
+    ) -> List[str]:
+        """Keep the keyword candidates that look like research concepts."""
+        research_keywords = []
 
         for keyword in basic_keywords:
             # Prefer multi-word terms
             if len(keyword.split()) > 1:
                 research_keywords.append(keyword)
             # Include single words that are research-related
-            elif any(indicator in keyword.lower() for indicator in research_indicators):
+            elif any(
+                indicator in keyword.lower() for indicator in self.RESEARCH_INDICATORS
+            ):
                 research_keywords.append(keyword)
             # Include technical terms (often have specific patterns)
-            elif re.match(r"^[a-z]+[A-Z][a-z]*", keyword):  # camelCase
+            elif CAMEL_CASE_PATTERN.match(keyword):  # camelCase
                 research_keywords.append(keyword)
             elif "-" in keyword or "_" in keyword:  # hyphenated or underscored
                 research_keywords.append(keyword)
@@ -249,25 +337,7 @@ class TextProcessor(LoggerMixin):
         if not text:
             return {}
 
-        # Basic counts
-        char_count = len(text)
-        word_count = len(word_tokenize(text))
-
-        try:
-            sentence_count = len(sent_tokenize(text))
-        except:
-            sentence_count = len([s for s in text.split(".") if s.strip()])
-
-        paragraph_count = len([p for p in text.split("\n\n") if p.strip()])
-
-        return {
-            "characters": char_count,
-            "words": word_count,
-            "sentences": sentence_count,
-            "paragraphs": paragraph_count,
-            "avg_words_per_sentence": word_count / max(sentence_count, 1),
-            "avg_chars_per_word": char_count / max(word_count, 1),
-        }
+        return analyze_text(text).statistics()
 
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -280,12 +350,18 @@ class TextProcessor(LoggerMixin):
         Returns:
             Similarity score between 0 and 1
         """
-        if not self.sentence_model or not text1 or not text2:
+        if not text1 or not text2:
+            return 0.0
+        if self.sidecar is None and not self.sentence_model:
             return 0.0
 
         try:
             # Get embeddings
-            embeddings = self.sentence_model.encode([text1, text2])
+            if self.sidecar is not None:
+                embeddings = self.sidecar.encode([text1, text2], self.sentence_model_name)
+            else:
+                embeddings = get_embedding_scheduler(self.sentence_model_name).encode(
+                    [text1, text2])
 
             # Calculate cosine similarity
             from numpy import dot
@@ -317,20 +393,8 @@ class TextProcessor(LoggerMixin):
         gaps = []
 
         # Look for limitation statements
-        limitation_patterns = [
-            r"(?i)limitation[s]?\s*:?\s*([^.]+)",
-            r"(?i)future work\s*:?\s*([^.]+)",
-            r"(?i)however[,]?\s*([^.]+)",
-            r"(?i)although\s*([^.]+)",
-            r"(?i)despite\s*([^.]+)",
-        ]
-
         for text in texts:
-            for pattern in limitation_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if len(match.strip()) > 20:  # Only meaningful statements
-                        gaps.append(match.strip())
+            gaps.extend(analyze_text(text or "").gap_texts(min_length=20))
 
         # Remove duplicates and return top gaps
         unique_gaps = list(dict.fromkeys(gaps))
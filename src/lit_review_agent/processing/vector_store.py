@@ -1,26 +1,62 @@
 """Vector store for managing literature embeddings and similarity search."""
 
+import asyncio
+import functools
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
 from ..utils.logger import LoggerMixin
-from ..utils.cache_manager import get_cache_manager, cache_embeddings
+from ..utils.model_registry import get_model_registry
+from ..utils.embedding_cache import EmbeddingCache, get_embedding_cache
+from ..utils.embedding_scheduler import get_embedding_scheduler
+from ..utils.onnx_encoder import MIN_COSINE_FP32, compare_vectors
 from ..utils.performance_monitor import monitor_performance, get_performance_monitor
 from ..retrieval.base_retriever import LiteratureItem
+from .chunking_strategy import ChunkingStrategy, TokenBasedChunkingStrategy
+from .lexical_index import BM25Index, reciprocal_rank_fusion
+from .metadata_index import MetadataIndex, category_field
+from .inference_sidecar import InferenceSidecarClient
+from .snapshot import collection_batches, iter_snapshot, read_snapshot_info, write_snapshot
+
+# Separator between a paper ID and its chunk number in chunk IDs
+CHUNK_ID_SEPARATOR = "#chunk_"
+# Filters matching at most this many papers are scored exactly over just
+# those papers instead of being pushed into the ANN query
+PREFILTER_MAX_CANDIDATES = 2000
 
 
 class VectorStore(LoggerMixin):
-    """Vector store for literature embeddings using ChromaDB."""
+    """
+    Vector store for literature embeddings.
+
+    Backed by ChromaDB by default, or by the in-process NumPy IVF index
+    (``backend="numpy"``) for read-heavy serving.
+    """
+
+    BACKENDS = ("chroma", "numpy")
 
     def __init__(self,
                  persist_directory: str = "./data/chroma_db",
                  collection_name: str = "literature_collection",
-                 embedding_model: str = "all-MiniLM-L6-v2"):
+                 embedding_model: str = "all-MiniLM-L6-v2",
+                 index_chunks: bool = False,
+                 chunking_strategy: Optional[ChunkingStrategy] = None,
+                 encode_batch_size: int = 32,
+                 embedding_cache_dir: Optional[str] = "./data/cache/embeddings",
+                 backend: str = "chroma",
+                 quantization: str = "none",
+                 rescore_factor: Optional[int] = None,
+                 hybrid_search: bool = False,
+                 fusion_weights: Tuple[float, float] = (1.0, 1.0),
+                 rrf_k: int = 60,
+                 index_metadata: bool = True,
+                 executor_workers: int = 2,
+                 sidecar: Optional[InferenceSidecarClient] = None):
         """
         Initialize the vector store.
 
@@ -28,27 +64,70 @@ class VectorStore(LoggerMixin):
             persist_directory: Directory to persist the database
             collection_name: Name of the collection
             embedding_model: Sentence transformer model for embeddings
+            index_chunks: Also embed every full-text chunk into a separate
+                chunk collection for passage-level search
+            chunking_strategy: Strategy used to split full text into chunks
+            encode_batch_size: Upper bound on texts per embedding model
+                forward pass; the shared embedding scheduler may use smaller
+                batches for long texts
+            embedding_cache_dir: Directory of the persistent embedding cache;
+                None disables caching
+            backend: ``chroma`` or ``numpy``
+            quantization: ``none``, ``int8`` or ``binary`` codes that the
+                ``numpy`` backend scans before rescoring at full precision
+            rescore_factor: Candidates shortlisted per requested result when
+                quantized; None uses the mode's default
+            hybrid_search: Keep a BM25 index next to the vector index for
+                :meth:`search_hybrid`
+            fusion_weights: Default (vector, lexical) weights for
+                reciprocal-rank fusion
+            rrf_k: Rank offset for reciprocal-rank fusion
+            index_metadata: Keep year, category and author indexes in a
+                side store for planning :meth:`search_filtered`
+            executor_workers: Threads running the ``a*`` async methods;
+                bounds how many embedding and query calls run at once
+            sidecar: Client of an inference sidecar that holds the embedding
+                model; when given, the model is never loaded in this process
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown vector store backend: {backend}. "
+                f"Choose from: {', '.join(self.BACKENDS)}")
+
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
+        self.chunk_collection_name = f"{collection_name}_chunks"
         self.embedding_model_name = embedding_model
+        self.backend = backend
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        if quantization != "none" and backend != "numpy":
+            self.logger.warning(
+                f"Quantization is only supported by the numpy backend; "
+                f"ignoring '{quantization}' for {backend}")
+        self.index_chunks = index_chunks
+        self.fusion_weights = fusion_weights
+        self.rrf_k = rrf_k
+        self.encode_batch_size = encode_batch_size
+        self.sidecar = sidecar
+        self.embedding_cache: Optional[EmbeddingCache] = (
+            get_embedding_cache(embedding_model, embedding_cache_dir)
+            if embedding_cache_dir else None
+        )
+        self.chunking_strategy = chunking_strategy or TokenBasedChunkingStrategy(
+            max_tokens=200, overlap_tokens=30
+        )
 
         # Create directory if it doesn't exist
         self.persist_directory.mkdir(parents=True, exist_ok=True)
 
-        # Initialize ChromaDB client
+        # Initialize the database client
         try:
-            self.client = chromadb.PersistentClient(
-                path=str(self.persist_directory),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
+            self.client = self._create_client()
             self.logger.info(
-                f"Initialized ChromaDB client at {persist_directory}")
+                f"Initialized {backend} vector store client at {persist_directory}")
         except Exception as e:
-            self.logger.error(f"Failed to initialize ChromaDB: {e}")
+            self.logger.error(f"Failed to initialize {backend} vector store: {e}")
             raise
 
         # Get or create collection
@@ -62,16 +141,47 @@ class VectorStore(LoggerMixin):
             self.logger.error(f"Failed to create collection: {e}")
             raise
 
-        # Initialize embedding model
-        try:
-            self.embedding_model = SentenceTransformer(embedding_model)
-            self.logger.info(f"Loaded embedding model: {embedding_model}")
-        except (OSError, ImportError, ValueError) as e:
-            self.logger.error(f"Failed to load embedding model: {e}")
-            self.embedding_model = None
-        except Exception as e:
-            self.logger.error(f"Unexpected error loading embedding model: {e}")
-            self.embedding_model = None
+        self.chunk_collection = None
+        if index_chunks:
+            try:
+                self.chunk_collection = self._get_chunk_collection()
+                self.logger.info(f"Using chunk collection: {self.chunk_collection_name}")
+            except Exception as e:
+                self.logger.error(f"Failed to create chunk collection: {e}")
+                raise
+
+        # Async methods run blocking model and database calls here, off the
+        # event loop and apart from the default executor used for network I/O
+        self._executor = ThreadPoolExecutor(
+            max_workers=executor_workers, thread_name_prefix="vector-store")
+
+        self.lexical_index: Optional[BM25Index] = None
+        self._hybrid_executor: Optional[ThreadPoolExecutor] = None
+        if hybrid_search:
+            self.lexical_index = BM25Index(
+                str(self.persist_directory / "lexical_index" / f"{collection_name}.sqlite"))
+            # Lexical retrieval runs here while the caller runs the vector query
+            self._hybrid_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="lexical-search")
+            self._sync_lexical_index()
+
+        self.metadata_index: Optional[MetadataIndex] = None
+        if index_metadata:
+            self.metadata_index = MetadataIndex(
+                str(self.persist_directory / "metadata_index" / f"{collection_name}.sqlite"))
+            self._sync_metadata_index()
+
+        # Embedding model is shared process-wide and loaded lazily on first use
+        registry = get_model_registry()
+        self._embedding_model_handle = registry.acquire(
+            registry.SENTENCE_TRANSFORMER, embedding_model
+        )
+        self.embedding_scheduler = get_embedding_scheduler(embedding_model)
+
+    @property
+    def embedding_model(self):
+        """Shared sentence transformer, or None if it could not be loaded."""
+        return self._embedding_model_handle.model
 
     @monitor_performance
     def add_literature_item(self, item: LiteratureItem) -> bool:
@@ -82,43 +192,10 @@ class VectorStore(LoggerMixin):
             item: Literature item to add
 
         Returns:
-            True if successful, False otherwise
+            True if the item is stored (added, updated or already current)
         """
-        try:
-            # Prepare text for embedding
-            text_content = self._prepare_text_for_embedding(item)
-
-            if not text_content or not self.embedding_model:
-                self.logger.warning(
-                    f"Cannot create embedding for item {item.id}")
-                return False
-
-            # Generate embedding
-            embedding = self.embedding_model.encode(text_content).tolist()
-
-            # Prepare metadata
-            metadata = self._prepare_metadata(item)
-
-            # Add to collection
-            self.collection.add(
-                ids=[item.id],
-                embeddings=[embedding],
-                documents=[text_content],
-                metadatas=[metadata]
-            )
-
-            self.logger.info(
-                f"Added literature item to vector store: {item.id}")
-            return True
-
-        except (ValueError, TypeError) as e:
-            self.logger.error(
-                f"Invalid data for item {item.id}: {e}")
-            return False
-        except Exception as e:
-            self.logger.error(
-                f"Unexpected error adding item {item.id} to vector store: {e}")
-            return False
+        counts = self.upsert_literature_items([item])
+        return counts['failed'] == 0
 
     def add_literature_items(self, items: List[LiteratureItem]) -> int:
         """
@@ -128,64 +205,140 @@ class VectorStore(LoggerMixin):
             items: List of literature items to add
 
         Returns:
-            Number of items successfully added
+            Number of items stored (added, updated or already current)
+        """
+        counts = self.upsert_literature_items(items)
+        return counts['inserted'] + counts['updated'] + counts['skipped']
+
+    def upsert_literature_items(self, items: List[LiteratureItem]) -> Dict[str, int]:
         """
+        Insert new items and re-embed changed ones, skipping unchanged items.
+
+        Each stored item carries a content fingerprint in its metadata, so
+        re-ingesting an overlapping set of papers only embeds the delta.
+
+        Args:
+            items: List of literature items
+
+        Returns:
+            Counts of ``inserted``, ``updated``, ``skipped`` and ``failed`` items
+        """
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
         if not items:
-            return 0
+            return counts
 
-        successful_additions = 0
+        # The last occurrence of a duplicated ID wins
+        unique_items = list({item.id: item for item in items}.values())
         batch_size = 100  # Process in batches
 
-        for i in range(0, len(items), batch_size):
-            batch = items[i:i + batch_size]
-            batch_ids = []
-            batch_embeddings = []
-            batch_documents = []
-            batch_metadatas = []
+        for i in range(0, len(unique_items), batch_size):
+            batch = unique_items[i:i + batch_size]
+            prepared = []
 
             for item in batch:
                 try:
                     # Prepare text for embedding
                     text_content = self._prepare_text_for_embedding(item)
 
-                    if not text_content or not self.embedding_model:
+                    if not text_content:
+                        counts['failed'] += 1
                         continue
 
-                    # Generate embedding
-                    embedding = self.embedding_model.encode(
-                        text_content).tolist()
-
                     # Prepare metadata
                     metadata = self._prepare_metadata(item)
-
-                    batch_ids.append(item.id)
-                    batch_embeddings.append(embedding)
-                    batch_documents.append(text_content)
-                    batch_metadatas.append(metadata)
+                    metadata['content_hash'] = self._content_fingerprint(
+                        item, text_content, metadata)
+                    prepared.append((item, text_content, metadata))
 
                 except Exception as e:
                     self.logger.error(f"Error preparing item {item.id}: {e}")
+                    counts['failed'] += 1
                     continue
 
-            # Add batch to collection
-            if batch_ids:
+            if not prepared:
+                continue
+
+            # Compare fingerprints with what is already stored
+            try:
+                existing = self.collection.get(
+                    ids=[item.id for item, _, _ in prepared],
+                    include=['metadatas']
+                )
+                stored_hashes = {
+                    item_id: (metadata or {}).get('content_hash')
+                    for item_id, metadata in zip(
+                        existing['ids'], existing['metadatas'] or [])
+                }
+            except Exception as e:
+                self.logger.error(f"Error reading existing items: {e}")
+                counts['failed'] += len(prepared)
+                continue
+
+            changed = []
+            batch_updates = 0
+            for entry in prepared:
+                item, _, metadata = entry
+                if item.id not in stored_hashes:
+                    changed.append(entry)
+                elif stored_hashes[item.id] != metadata['content_hash']:
+                    changed.append(entry)
+                    batch_updates += 1
+                else:
+                    counts['skipped'] += 1
+
+            if not changed:
+                continue
+
+            if self.chunk_collection is not None:
+                # Leave items whose chunks failed without a fingerprint, so
+                # the next upsert retries them
+                failed_chunks = self._index_item_chunks(
+                    [item for item, _, _ in changed])
+                for item, _, metadata in changed:
+                    if item.id in failed_chunks:
+                        metadata['content_hash'] = ""
+
+            # Generate all embeddings of the batch in one model call
+            try:
+                batch_embeddings = self._encode_texts(
+                    [text for _, text, _ in changed]).tolist()
+                self.collection.upsert(
+                    ids=[item.id for item, _, _ in changed],
+                    embeddings=batch_embeddings,
+                    documents=[text for _, text, _ in changed],
+                    metadatas=[metadata for _, _, metadata in changed]
+                )
+            except Exception as e:
+                self.logger.error(f"Error upserting batch to vector store: {e}")
+                counts['failed'] += len(changed)
+                continue
+
+            if self.lexical_index is not None:
                 try:
-                    self.collection.add(
-                        ids=batch_ids,
-                        embeddings=batch_embeddings,
-                        documents=batch_documents,
-                        metadatas=batch_metadatas
-                    )
-                    successful_additions += len(batch_ids)
-                    self.logger.info(
-                        f"Added batch of {len(batch_ids)} items to vector store")
+                    self.lexical_index.add_documents(
+                        [item.id for item, _, _ in changed],
+                        [text for _, text, _ in changed])
+                except Exception as e:
+                    self.logger.error(f"Error updating lexical index: {e}")
+
+            if self.metadata_index is not None:
+                try:
+                    self.metadata_index.add(
+                        [item.id for item, _, _ in changed],
+                        [metadata for _, _, metadata in changed])
                 except Exception as e:
-                    self.logger.error(
-                        f"Error adding batch to vector store: {e}")
+                    self.logger.error(f"Error updating metadata index: {e}")
+
+            counts['updated'] += batch_updates
+            counts['inserted'] += len(changed) - batch_updates
+            self.logger.info(
+                f"Upserted batch of {len(changed)} items to vector store")
 
         self.logger.info(
-            f"Successfully added {successful_additions}/{len(items)} items")
-        return successful_additions
+            f"Ingested {len(unique_items)} items: {counts['inserted']} inserted, "
+            f"{counts['updated']} updated, {counts['skipped']} unchanged, "
+            f"{counts['failed']} failed")
+        return counts
 
     @monitor_performance
     def search_similar(self,
@@ -204,40 +357,294 @@ class VectorStore(LoggerMixin):
             List of search results with metadata
         """
         try:
-            if not self.embedding_model:
-                self.logger.error("No embedding model available for search")
-                return []
+            results = self._query_collection([query], n_results, where)[0]
+            self.logger.info(
+                f"Found {len(results)} similar items for query")
+            return results
 
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Invalid search parameters: {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Unexpected error searching vector store: {e}")
+            return []
+
+    @monitor_performance
+    def search_similar_batch(self,
+                             queries: List[str],
+                             n_results: int = 10,
+                             where: Optional[Dict[str, Any]] = None
+                             ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar literature items for many queries at once.
 
-            # Search collection
-            results = self.collection.query(
+        All queries are encoded in one model call and sent as one batched
+        collection query.
+
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+            where: Optional metadata filters applied to every query
+
+        Returns:
+            One result list per query, in query order
+        """
+        if not queries:
+            return []
+
+        try:
+            results = self._query_collection(queries, n_results, where)
+            self.logger.info(
+                f"Found {sum(len(r) for r in results)} similar items "
+                f"for {len(queries)} queries")
+            return results
+
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Invalid search parameters: {e}")
+            return [[] for _ in queries]
+        except Exception as e:
+            self.logger.error(f"Unexpected error searching vector store: {e}")
+            return [[] for _ in queries]
+
+    def _query_collection(self,
+                          queries: List[str],
+                          n_results: int,
+                          where: Optional[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Encode queries, run one collection query and format the results."""
+        return self._query_embeddings(self._encode_texts(queries), n_results, where)
+
+    def _query_embeddings(self,
+                          query_embeddings: np.ndarray,
+                          n_results: int,
+                          where: Optional[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run one collection query for encoded queries and format the results."""
+        results = self.collection.query(
+            query_embeddings=np.asarray(query_embeddings).tolist(),
+            n_results=n_results,
+            where=where
+        )
+
+        # Format results
+        formatted_results = []
+        for q in range(len(query_embeddings)):
+            query_results = []
+            for i in range(len(results['ids'][q])):
+                query_results.append({
+                    'id': results['ids'][q][i],
+                    'distance': results['distances'][q][i] if results.get('distances') else None,
+                    'document': results['documents'][q][i] if results['documents'] else None,
+                    'metadata': results['metadatas'][q][i] if results['metadatas'] else {}
+                })
+            formatted_results.append(query_results)
+        return formatted_results
+
+    @monitor_performance
+    def search_filtered(self,
+                        query: str,
+                        n_results: int = 10,
+                        categories: Optional[List[str]] = None,
+                        year_from: Optional[int] = None,
+                        year_to: Optional[int] = None,
+                        authors: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search within papers matching category, year and author filters.
+
+        The planner first counts matches in the metadata side index. When
+        few papers match, only those papers are fetched and scored exactly;
+        otherwise the filters are pushed into the ANN query through the
+        flattened metadata fields.
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            categories: Match papers in any of these categories (e.g. ``cs.LG``)
+            year_from: Earliest publication year (inclusive)
+            year_to: Latest publication year (inclusive)
+            authors: Match papers by any of these authors
+
+        Returns:
+            List of search results with metadata
+        """
+        try:
+            query_embedding = self._encode_texts([query])[0]
+            return self._search_filtered_embedding(
+                query_embedding, n_results, categories, year_from, year_to, authors)
+
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Invalid search parameters: {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Unexpected error in filtered search: {e}")
+            return []
+
+    @monitor_performance
+    def search_hybrid(self,
+                      query: str,
+                      n_results: int = 10,
+                      where: Optional[Dict[str, Any]] = None,
+                      fusion_weights: Optional[Tuple[float, float]] = None,
+                      candidates_per_result: int = 3) -> List[Dict[str, Any]]:
+        """
+        Search with BM25 and embeddings together, fused by reciprocal rank.
+
+        The lexical query runs on a worker thread while the vector query runs
+        on the calling thread. Exact matches on rare terms (model names,
+        datasets, acronyms) that the embedding ranks low are lifted by the
+        lexical ranking.
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            where: Optional metadata filters, applied to both retrievals
+            fusion_weights: (vector, lexical) weights; defaults to the
+                store's ``fusion_weights``
+            candidates_per_result: Candidates retrieved from each index per
+                requested result
+
+        Returns:
+            List of search results with fused ``score``, the vector
+            ``distance`` (None for lexical-only hits) and per-index ranks
+        """
+        if self.lexical_index is None:
+            self.logger.warning(
+                "Hybrid search is disabled; falling back to vector search")
+            return self.search_similar(query, n_results=n_results, where=where)
+
+        vector_weight, lexical_weight = fusion_weights or self.fusion_weights
+        n_candidates = n_results * candidates_per_result
+
+        try:
+            lexical_future = self._hybrid_executor.submit(
+                self.lexical_index.search, query, n_candidates)
+            vector_results = self._query_collection([query], n_candidates, where)[0]
+            lexical_hits = lexical_future.result()
+
+            results_by_id = {result['id']: result for result in vector_results}
+
+            # Fetch lexical-only hits, applying the metadata filter to them
+            missing = [doc_id for doc_id, _ in lexical_hits if doc_id not in results_by_id]
+            if missing:
+                fetched = self.collection.get(ids=missing, where=where)
+                for i, doc_id in enumerate(fetched['ids']):
+                    results_by_id[doc_id] = {
+                        'id': doc_id,
+                        'distance': None,
+                        'document': fetched['documents'][i] if fetched['documents'] else None,
+                        'metadata': fetched['metadatas'][i] if fetched['metadatas'] else {}
+                    }
+
+            vector_ranking = [result['id'] for result in vector_results]
+            lexical_ranking = [doc_id for doc_id, _ in lexical_hits
+                               if doc_id in results_by_id]
+            fused = reciprocal_rank_fusion(
+                [vector_ranking, lexical_ranking],
+                weights=[vector_weight, lexical_weight],
+                k=self.rrf_k
+            )
+
+            vector_ranks = {doc_id: rank for rank, doc_id in enumerate(vector_ranking, 1)}
+            lexical_ranks = {doc_id: rank for rank, doc_id in enumerate(lexical_ranking, 1)}
+            formatted_results = []
+            for doc_id, score in fused[:n_results]:
+                result = dict(results_by_id[doc_id])
+                result['score'] = score
+                result['vector_rank'] = vector_ranks.get(doc_id)
+                result['lexical_rank'] = lexical_ranks.get(doc_id)
+                formatted_results.append(result)
+
+            self.logger.info(
+                f"Found {len(formatted_results)} items from {len(vector_ranking)} vector "
+                f"and {len(lexical_ranking)} lexical candidates")
+            return formatted_results
+
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"Invalid search parameters: {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Unexpected error in hybrid search: {e}")
+            return []
+
+    @monitor_performance
+    def search_chunks(self,
+                      query: str,
+                      n_results: int = 10,
+                      where: Optional[Dict[str, Any]] = None,
+                      pooling: str = "max",
+                      candidates_per_result: int = 5) -> List[Dict[str, Any]]:
+        """
+        Search full-text chunks and aggregate the hits back to papers.
+
+        Args:
+            query: Search query
+            n_results: Number of papers to return
+            where: Optional metadata filters (parent paper metadata is
+                copied onto every chunk)
+            pooling: How chunk scores combine into a paper score: ``max``
+                (best passage) or ``sum`` (rewards many relevant passages)
+            candidates_per_result: Chunks retrieved per requested paper
+
+        Returns:
+            List of paper results with score, best chunk and chunk hits
+        """
+        if pooling not in ("max", "sum"):
+            raise ValueError(f"Unknown pooling: {pooling}. Use 'max' or 'sum'.")
+
+        if self.chunk_collection is None:
+            self.logger.warning(
+                "Chunk indexing is disabled; falling back to paper-level search")
+            return self.search_similar(query, n_results=n_results, where=where)
+
+        try:
+            query_embedding = self._encode_texts([query])[0].tolist()
+            results = self.chunk_collection.query(
                 query_embeddings=[query_embedding],
-                n_results=n_results,
+                n_results=n_results * candidates_per_result,
                 where=where
             )
 
-            # Format results
+            papers: Dict[str, Dict[str, Any]] = {}
+            for i, chunk_id in enumerate(results['ids'][0]):
+                metadata = results['metadatas'][0][i] if results['metadatas'] else {}
+                parent_id = metadata.get('parent_id') or chunk_id.split(
+                    CHUNK_ID_SEPARATOR)[0]
+                # Chunk collection uses cosine distance
+                score = 1.0 - results['distances'][0][i]
+
+                paper = papers.get(parent_id)
+                if paper is None:
+                    paper = papers[parent_id] = {
+                        'id': parent_id,
+                        'score': 0.0,
+                        'document': results['documents'][0][i] if results['documents'] else None,
+                        'metadata': metadata,
+                        'chunks': [],
+                    }
+                paper['chunks'].append({
+                    'id': chunk_id,
+                    'score': score,
+                    'chunk_index': metadata.get('chunk_index'),
+                })
+                if pooling == "max":
+                    paper['score'] = max(paper['score'], score)
+                else:
+                    paper['score'] += score
+
+            ranked = sorted(papers.values(), key=lambda p: p['score'], reverse=True)
             formatted_results = []
-            for i in range(len(results['ids'][0])):
-                result = {
-                    'id': results['ids'][0][i],
-                    'distance': results['distances'][0][i] if 'distances' in results else None,
-                    'document': results['documents'][0][i] if results['documents'] else None,
-                    'metadata': results['metadatas'][0][i] if results['metadatas'] else {}
-                }
-                formatted_results.append(result)
+            for paper in ranked[:n_results]:
+                paper['distance'] = 1.0 - paper['score']
+                formatted_results.append(paper)
 
             self.logger.info(
-                f"Found {len(formatted_results)} similar items for query")
+                f"Found {len(formatted_results)} papers from "
+                f"{len(results['ids'][0])} chunk hits")
             return formatted_results
 
         except (ValueError, TypeError) as e:
             self.logger.error(f"Invalid search parameters: {e}")
             return []
         except Exception as e:
-            self.logger.error(f"Unexpected error searching vector store: {e}")
+            self.logger.error(f"Unexpected error searching chunks: {e}")
             return []
 
     def get_item_by_id(self, item_id: str) -> Optional[Dict[str, Any]]:
@@ -265,6 +672,95 @@ class VectorStore(LoggerMixin):
             self.logger.error(f"Error getting item {item_id}: {e}")
             return None
 
+    def get_items(self, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several items by ID in one lookup.
+
+        Args:
+            item_ids: Literature item IDs
+
+        Returns:
+            Found items in the requested order; missing IDs are omitted
+        """
+        if not item_ids:
+            return []
+
+        try:
+            results = self.collection.get(ids=item_ids)
+            found = {
+                item_id: {
+                    'id': item_id,
+                    'document': results['documents'][i] if results['documents'] else None,
+                    'metadata': results['metadatas'][i] if results['metadatas'] else {}
+                }
+                for i, item_id in enumerate(results['ids'])
+            }
+            return [found[item_id] for item_id in item_ids if item_id in found]
+
+        except Exception as e:
+            self.logger.error(f"Error getting {len(item_ids)} items: {e}")
+            return []
+
+    # Async API: same behaviour as the synchronous methods, run on the
+    # store's executor so the event loop keeps serving other requests
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        """Run a blocking call on the store's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    async def asearch_similar(self, query: str, n_results: int = 10,
+                              where: Optional[Dict[str, Any]] = None
+                              ) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`search_similar`."""
+        return await self._run_in_executor(self.search_similar, query, n_results, where)
+
+    async def asearch_similar_batch(self, queries: List[str], n_results: int = 10,
+                                    where: Optional[Dict[str, Any]] = None
+                                    ) -> List[List[Dict[str, Any]]]:
+        """Async variant of :meth:`search_similar_batch`."""
+        return await self._run_in_executor(
+            self.search_similar_batch, queries, n_results, where)
+
+    async def asearch_filtered(self, query: str, n_results: int = 10,
+                               **filters: Any) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`search_filtered`."""
+        return await self._run_in_executor(
+            self.search_filtered, query, n_results, **filters)
+
+    async def asearch_hybrid(self, query: str, n_results: int = 10,
+                             **kwargs: Any) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`search_hybrid`."""
+        return await self._run_in_executor(self.search_hybrid, query, n_results, **kwargs)
+
+    async def asearch_chunks(self, query: str, n_results: int = 10,
+                             **kwargs: Any) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`search_chunks`."""
+        return await self._run_in_executor(self.search_chunks, query, n_results, **kwargs)
+
+    async def aadd_literature_items(self, items: List[LiteratureItem]) -> int:
+        """Async variant of :meth:`add_literature_items`."""
+        return await self._run_in_executor(self.add_literature_items, items)
+
+    async def aupsert_literature_items(self, items: List[LiteratureItem]) -> Dict[str, int]:
+        """Async variant of :meth:`upsert_literature_items`."""
+        return await self._run_in_executor(self.upsert_literature_items, items)
+
+    async def aget_items(self, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`get_items`."""
+        return await self._run_in_executor(self.get_items, item_ids)
+
+    def close(self) -> None:
+        """Stop the store's worker threads and close the side indexes."""
+        self._executor.shutdown(wait=True)
+        if self._hybrid_executor is not None:
+            self._hybrid_executor.shutdown(wait=True)
+        if self.lexical_index is not None:
+            self.lexical_index.close()
+        if self.metadata_index is not None:
+            self.metadata_index.close()
+
     def delete_item(self, item_id: str) -> bool:
         """
         Delete an item from the vector store.
@@ -277,6 +773,12 @@ class VectorStore(LoggerMixin):
         """
         try:
             self.collection.delete(ids=[item_id])
+            if self.chunk_collection is not None:
+                self.chunk_collection.delete(where={'parent_id': item_id})
+            if self.lexical_index is not None:
+                self.lexical_index.remove([item_id])
+            if self.metadata_index is not None:
+                self.metadata_index.remove([item_id])
             self.logger.info(f"Deleted item from vector store: {item_id}")
             return True
         except Exception as e:
@@ -292,15 +794,181 @@ class VectorStore(LoggerMixin):
         """
         try:
             count = self.collection.count()
-            return {
+            stats = {
                 'total_items': count,
                 'collection_name': self.collection_name,
-                'embedding_model': self.embedding_model_name
+                'embedding_model': self.embedding_model_name,
+                'backend': self.backend,
+                'quantization': self.quantization if self.backend == "numpy" else "none"
             }
+            if self.chunk_collection is not None:
+                stats['total_chunks'] = self.chunk_collection.count()
+            if self.lexical_index is not None:
+                stats['lexical_documents'] = self.lexical_index.count()
+            if self.metadata_index is not None:
+                stats['metadata_index_documents'] = self.metadata_index.count()
+            return stats
         except Exception as e:
             self.logger.error(f"Error getting collection stats: {e}")
             return {}
 
+    def evaluate_quantization(self, n_queries: int = 100, k: int = 10) -> Dict[str, Any]:
+        """
+        Report recall@k and latency of quantized search against exact search.
+
+        Args:
+            n_queries: Number of stored vectors sampled as queries
+            k: Results per query
+
+        Returns:
+            Dictionary with recall, latencies and bytes per vector, or an
+            empty dictionary if the backend does not support quantization
+        """
+        if self.backend != "numpy":
+            return {}
+        try:
+            return self.collection.evaluate_quantization(n_queries=n_queries, k=k)
+        except Exception as e:
+            self.logger.error(f"Error evaluating quantization: {e}")
+            return {}
+
+    def check_embedding_compatibility(self, min_cosine: float = MIN_COSINE_FP32,
+                                      sample_size: int = 16) -> Dict[str, Any]:
+        """
+        Re-encode a sample of stored documents and compare with their vectors.
+
+        Detects a collection built by a different encoder than the current
+        one, e.g. PyTorch vectors searched with an int8 ONNX model. The
+        embedding cache is bypassed so the live model is measured.
+
+        Args:
+            min_cosine: Smallest acceptable per-document cosine similarity
+            sample_size: Number of stored documents to re-encode
+
+        Returns:
+            Report from :func:`compare_vectors`, or an empty dictionary if
+            the collection holds no documents
+        """
+        sample = self.collection.get(limit=sample_size,
+                                     include=["documents", "embeddings"])
+        embeddings = sample.get('embeddings')
+        pairs = [(document, embedding) for document, embedding
+                 in zip(sample.get('documents') or [],
+                        [] if embeddings is None else embeddings)
+                 if document]
+        if not pairs:
+            return {}
+        encoded = self._encode_uncached([document for document, _ in pairs])
+        return compare_vectors([embedding for _, embedding in pairs], encoded, min_cosine)
+
+    def export_snapshot(self, path: str, batch_size: int = 5000,
+                        include_chunks: bool = True) -> Dict[str, int]:
+        """
+        Export IDs, embeddings, documents and metadata to a columnar file.
+
+        Records are paged out of the collection and streamed to Parquet (or
+        Arrow IPC for ``.arrow``/``.feather``/``.ipc`` paths). Chunk records
+        go to a sibling ``<name>_chunks`` file.
+
+        Args:
+            path: Snapshot file
+            batch_size: Records per page and per written batch
+            include_chunks: Also export the chunk collection, if enabled
+
+        Returns:
+            Number of exported ``items`` and ``chunks``
+        """
+        info = {
+            'collection_name': self.collection_name,
+            'embedding_model': self.embedding_model_name,
+            'count': self.collection.count(),
+        }
+        counts = {'items': write_snapshot(
+            path, collection_batches(self.collection, batch_size), info)}
+
+        if include_chunks and self.chunk_collection is not None:
+            if self.chunk_collection.count():
+                info = dict(info, collection_name=self.chunk_collection_name,
+                            count=self.chunk_collection.count())
+                counts['chunks'] = write_snapshot(
+                    self._chunk_snapshot_path(path),
+                    collection_batches(self.chunk_collection, batch_size), info)
+
+        self.logger.info(f"Exported snapshot to {path}: {counts}")
+        return counts
+
+    def import_snapshot(self, path: str, batch_size: int = 5000,
+                        rebuild_indexes: bool = True) -> Dict[str, int]:
+        """
+        Bulk-load a snapshot written by :meth:`export_snapshot`.
+
+        Stored embeddings are written as-is, so nothing is re-embedded.
+        Records with existing IDs are replaced.
+
+        Args:
+            path: Snapshot file
+            batch_size: Records read and written per batch
+            rebuild_indexes: Update the lexical and metadata side indexes from
+                the loaded records
+
+        Returns:
+            Number of imported ``items`` and ``chunks``
+
+        Raises:
+            ValueError: If the snapshot was embedded with a different model
+        """
+        info = read_snapshot_info(path)
+        snapshot_model = info.get('embedding_model')
+        if snapshot_model and snapshot_model != self.embedding_model_name:
+            raise ValueError(
+                f"Snapshot embeddings come from '{snapshot_model}', but this store "
+                f"uses '{self.embedding_model_name}'")
+
+        counts = {'items': self._load_snapshot(
+            self.collection, path, batch_size, rebuild_indexes)}
+
+        chunk_path = self._chunk_snapshot_path(path)
+        if self.chunk_collection is not None and chunk_path.exists():
+            counts['chunks'] = self._load_snapshot(
+                self.chunk_collection, chunk_path, batch_size, False)
+
+        self.logger.info(f"Imported snapshot from {path}: {counts}")
+        return counts
+
+    def _load_snapshot(self, collection, path, batch_size: int,
+                       rebuild_indexes: bool) -> int:
+        """Stream a snapshot file into a collection."""
+        bulk = self.backend == "numpy"
+        if bulk:
+            # One IVF build at the end instead of repeated rebuilds while growing
+            collection.auto_build_index = False
+
+        rows = 0
+        try:
+            for ids, embeddings, documents, metadatas in iter_snapshot(path, batch_size):
+                collection.upsert(ids=ids, embeddings=embeddings,
+                                  documents=documents, metadatas=metadatas)
+                if rebuild_indexes and self.lexical_index is not None:
+                    self.lexical_index.add_documents(ids, documents)
+                if rebuild_indexes and self.metadata_index is not None:
+                    self.metadata_index.add(ids, metadatas)
+                rows += len(ids)
+                self.logger.debug(f"Loaded {rows} records from {path}")
+        finally:
+            if bulk:
+                from .ann_index import BRUTE_FORCE_THRESHOLD
+
+                collection.auto_build_index = True
+                if collection.count() >= BRUTE_FORCE_THRESHOLD:
+                    collection.build_index()
+        return rows
+
+    @staticmethod
+    def _chunk_snapshot_path(path: str) -> Path:
+        """Path of the chunk snapshot written beside a paper snapshot."""
+        path = Path(path)
+        return path.with_name(f"{path.stem}_chunks{path.suffix}")
+
     def reset_collection(self) -> bool:
         """
         Reset (clear) the collection.
@@ -314,13 +982,341 @@ class VectorStore(LoggerMixin):
                 name=self.collection_name,
                 metadata={"description": "Literature review embeddings"}
             )
+            if self.chunk_collection is not None:
+                self.client.delete_collection(self.chunk_collection_name)
+                self.chunk_collection = self._get_chunk_collection()
+            if self.lexical_index is not None:
+                self.lexical_index.clear()
+            if self.metadata_index is not None:
+                self.metadata_index.clear()
             self.logger.info(f"Reset collection: {self.collection_name}")
             return True
         except Exception as e:
             self.logger.error(f"Error resetting collection: {e}")
             return False
 
-    @cache_embeddings
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts, serving known texts from the embedding cache.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Array of embeddings, one row per input text
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.embedding_cache is not None:
+            return self.embedding_cache.get_or_compute(texts, self._encode_uncached)
+        return self._encode_uncached(texts)
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts through the shared embedding scheduler.
+
+        The scheduler batches them by token length, together with any
+        concurrent requests for the same model (in the sidecar, if one is
+        configured).
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Array of embeddings, one row per input text
+        """
+        if self.sidecar is not None:
+            return self.sidecar.encode(texts, self.embedding_model_name,
+                                       max_batch_size=self.encode_batch_size)
+
+        if not self.embedding_model:
+            raise RuntimeError("No embedding model available")
+
+        return self.embedding_scheduler.encode(texts, max_batch_size=self.encode_batch_size)
+
+    def _create_client(self):
+        """Create the database client for the configured backend."""
+        if self.backend == "numpy":
+            from .ann_index import NumpyClient
+
+            return NumpyClient(path=str(self.persist_directory / "numpy_index"),
+                               quantization=self.quantization,
+                               rescore_factor=self.rescore_factor)
+
+        import chromadb
+        from chromadb.config import Settings
+
+        return chromadb.PersistentClient(
+            path=str(self.persist_directory),
+            settings=Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
+            )
+        )
+
+    def _sync_lexical_index(self, page_size: int = 1000) -> None:
+        """Index stored documents into an empty lexical index."""
+        total = self.collection.count()
+        if self.lexical_index.count() >= total:
+            return
+
+        self.logger.info(f"Building lexical index for {total} stored items")
+        self.lexical_index.clear()
+        for offset in range(0, total, page_size):
+            page = self.collection.get(limit=page_size, offset=offset,
+                                       include=['documents'])
+            self.lexical_index.add_documents(page['ids'], page['documents'] or [])
+
+    def _sync_metadata_index(self, page_size: int = 1000) -> None:
+        """Index stored metadata into an empty or stale metadata index."""
+        total = self.collection.count()
+        if self.metadata_index.count() >= total:
+            return
+
+        self.logger.info(f"Building metadata index for {total} stored items")
+        self.metadata_index.clear()
+        for offset in range(0, total, page_size):
+            page = self.collection.get(limit=page_size, offset=offset,
+                                       include=['metadatas'])
+            self.metadata_index.add(page['ids'], page['metadatas'] or [])
+
+    @staticmethod
+    def _filters_to_where(categories: Optional[List[str]],
+                          year_from: Optional[int],
+                          year_to: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Translate category and year filters into a flattened-metadata filter."""
+        clauses: List[Dict[str, Any]] = []
+        if categories:
+            category_clauses = [{category_field(c): True} for c in categories]
+            clauses.append(category_clauses[0] if len(category_clauses) == 1
+                           else {'$or': category_clauses})
+        if year_from is not None:
+            clauses.append({'year': {'$gte': year_from}})
+        if year_to is not None:
+            clauses.append({'year': {'$lte': year_to}})
+
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {'$and': clauses}
+
+    def _search_filtered_embedding(self,
+                                   query_embedding: np.ndarray,
+                                   n_results: int,
+                                   categories: Optional[List[str]],
+                                   year_from: Optional[int],
+                                   year_to: Optional[int],
+                                   authors: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Plan and run a filtered search for an encoded query."""
+        candidate_ids = None
+        if self.metadata_index is not None:
+            matched = self.metadata_index.match(
+                categories=categories, year_from=year_from, year_to=year_to,
+                authors=authors, limit=PREFILTER_MAX_CANDIDATES + 1)
+            if len(matched) <= PREFILTER_MAX_CANDIDATES:
+                candidate_ids = matched
+            elif authors:
+                # Authors are not flattened into metadata, so every
+                # match is scored exactly
+                candidate_ids = self.metadata_index.match(
+                    categories=categories, year_from=year_from,
+                    year_to=year_to, authors=authors)
+        elif authors:
+            raise ValueError("Author filters require the metadata index")
+
+        if candidate_ids is not None:
+            results = self._search_ids(query_embedding, candidate_ids, n_results)
+            plan = f"prefilter over {len(candidate_ids)} papers"
+        else:
+            where = self._filters_to_where(categories, year_from, year_to)
+            results = self._query_embeddings([query_embedding], n_results, where)[0]
+            plan = "filtered ANN query"
+
+        self.logger.info(f"Found {len(results)} items using {plan}")
+        return results
+
+    def _search_ids(self, query_embedding: np.ndarray, ids: List[str],
+                    n_results: int) -> List[Dict[str, Any]]:
+        """
+        Score a known set of papers exactly against an encoded query.
+
+        Distances use the collection's distance space so results are
+        comparable with :meth:`search_similar`.
+
+        Args:
+            query_embedding: Query embedding
+            ids: Candidate paper IDs
+            n_results: Number of results to return
+
+        Returns:
+            List of search results, closest first
+        """
+        if not ids:
+            return []
+
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+        records = self.collection.get(
+            ids=ids, include=['embeddings', 'documents', 'metadatas'])
+        if not records['ids']:
+            return []
+
+        embeddings = np.asarray(records['embeddings'], dtype=np.float32)
+        space = "cosine" if self.backend == "numpy" else (
+            (self.collection.metadata or {}).get("hnsw:space", "l2"))
+        if space == "l2":
+            distances = ((embeddings - query_embedding) ** 2).sum(axis=1)
+        elif space == "ip":
+            distances = 1.0 - embeddings @ query_embedding
+        else:
+            norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query_embedding)
+            distances = 1.0 - (embeddings @ query_embedding) / np.maximum(norms, 1e-12)
+
+        k = min(n_results, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top], kind="stable")]
+
+        return [{
+            'id': records['ids'][i],
+            'distance': float(distances[i]),
+            'document': records['documents'][i] if records['documents'] else None,
+            'metadata': records['metadatas'][i] if records['metadatas'] else {}
+        } for i in top]
+
+    def _get_chunk_collection(self):
+        """Get or create the chunk collection."""
+        return self.client.get_or_create_collection(
+            name=self.chunk_collection_name,
+            metadata={
+                "description": "Literature full-text chunk embeddings",
+                "hnsw:space": "cosine",
+            }
+        )
+
+    def _prepare_chunks(
+            self, item: LiteratureItem) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Split an item into chunks for chunk-level indexing.
+
+        Papers without full text get a single chunk with their paper-level
+        text, so every paper is reachable through chunk search.
+
+        Args:
+            item: Literature item
+
+        Returns:
+            List of (chunk id, chunk text, chunk metadata)
+        """
+        text = item.full_text
+        spans = list(self.chunking_strategy.iter_spans(text)) if text else []
+        if not spans:
+            text = self._prepare_text_for_embedding(item)
+            spans = [(0, len(text))] if text else []
+
+        parent_metadata = self._prepare_metadata(item)
+        # Large JSON lists are only needed on the paper record
+        parent_metadata.pop('keywords', None)
+
+        chunks = []
+        for n, (start, end) in enumerate(spans):
+            metadata = dict(parent_metadata)
+            metadata.update({
+                'parent_id': item.id,
+                'chunk_index': n,
+                'char_start': start,
+                'char_end': end,
+            })
+            chunks.append(
+                (f"{item.id}{CHUNK_ID_SEPARATOR}{n}", text[start:end], metadata))
+        return chunks
+
+    def _index_item_chunks(self, items: List[LiteratureItem],
+                           batch_size: int = 256) -> Set[str]:
+        """
+        Embed and store the chunks of several items in batches.
+
+        Args:
+            items: Literature items to chunk
+            batch_size: Chunks encoded and written per batch (a batch is
+                extended to hold all chunks of its last item)
+
+        Returns:
+            IDs of the items whose chunks could not be indexed
+        """
+        # Group whole items into batches so each batch replaces the complete
+        # chunk set of its papers
+        batches: List[Tuple[List[str], List[Tuple[str, str, Dict[str, Any]]]]] = []
+        failed: Set[str] = set()
+        for item in items:
+            try:
+                item_chunks = self._prepare_chunks(item)
+            except Exception as e:
+                self.logger.error(f"Error chunking item {item.id}: {e}")
+                failed.add(item.id)
+                continue
+            if not batches or len(batches[-1][1]) >= batch_size:
+                batches.append(([], []))
+            batches[-1][0].append(item.id)
+            batches[-1][1].extend(item_chunks)
+
+        indexed = 0
+        for parent_ids, batch in batches:
+            try:
+                # Encode before deleting, so a failed batch keeps the old chunks
+                embeddings = self._encode_texts([text for _, text, _ in batch])
+                # Drop chunks left over from previous, longer versions
+                self.chunk_collection.delete(where={'parent_id': {'$in': parent_ids}})
+                if batch:
+                    self.chunk_collection.add(
+                        ids=[chunk_id for chunk_id, _, _ in batch],
+                        embeddings=embeddings.tolist(),
+                        documents=[text for _, text, _ in batch],
+                        metadatas=[metadata for _, _, metadata in batch]
+                    )
+                indexed += len(batch)
+            except Exception as e:
+                self.logger.error(f"Error indexing chunk batch: {e}")
+                failed.update(parent_ids)
+
+        self.logger.info(f"Indexed {indexed} chunks for {len(items)} items")
+        return failed
+
+    def _content_fingerprint(self, item: LiteratureItem, text_content: str,
+                             metadata: Dict[str, Any]) -> str:
+        """
+        Fingerprint everything that determines an item's stored record.
+
+        Covers the embedded text, the metadata, the full text (which feeds
+        chunk indexing), the embedding model and, when chunks are indexed,
+        the chunker settings. Enabling chunk indexing or changing the chunker
+        therefore re-indexes existing items.
+
+        Args:
+            item: Literature item
+            text_content: Prepared embedding text
+            metadata: Prepared metadata
+
+        Returns:
+            Hex sha256 fingerprint
+        """
+        digest = hashlib.sha256()
+        for part in (self.embedding_model_name, text_content,
+                     json.dumps(metadata, sort_keys=True), item.full_text or "",
+                     self._chunking_signature()):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _chunking_signature(self) -> str:
+        """Describe the chunker settings that shape indexed chunks."""
+        if self.chunk_collection is None:
+            return ""
+        settings = {
+            name: value
+            for name, value in vars(self.chunking_strategy).items()
+            if isinstance(value, (str, int, float, bool))
+        }
+        return json.dumps(
+            [type(self.chunking_strategy).__name__, settings], sort_keys=True)
+
     def _prepare_text_for_embedding(self, item: LiteratureItem) -> str:
         """
         Prepare text content for embedding generation.
@@ -388,6 +1384,13 @@ class VectorStore(LoggerMixin):
             'keywords': json.dumps(item.keywords) if item.keywords else "[]",
         }
 
+        # Flattened, filterable fields; the JSON lists above are kept for display
+        metadata['primary_category'] = item.categories[0] if item.categories else ""
+        for category in dict.fromkeys(item.categories or []):
+            metadata[category_field(category)] = True
+        metadata['first_author'] = item.authors[0] if item.authors else ""
+        metadata['author_count'] = len(item.authors or [])
+
         # Keep numeric metadata as numbers for better querying
         if item.year is not None:
             metadata['year'] = item.year
@@ -405,8 +1408,8 @@ class VectorStore(LoggerMixin):
         # Only convert non-numeric values to strings
         processed_metadata = {}
         for k, v in metadata.items():
-            if isinstance(v, (int, float)):
-                processed_metadata[k] = v  # Keep numbers as numbers
+            if isinstance(v, (bool, int, float)):
+                processed_metadata[k] = v  # Keep numbers and flags as is
             else:
                 processed_metadata[k] = str(v) if v is not None else ""
 
@@ -5,6 +5,7 @@ from .logger import setup_logger
 from .helpers import (
     clean_text,
     extract_keywords,
+    extract_keywords_batch,
     validate_email,
     safe_filename,
 )
@@ -14,6 +15,7 @@ __all__ = [
     "setup_logger",
     "clean_text",
     "extract_keywords",
+    "extract_keywords_batch",
     "validate_email",
     "safe_filename",
 ]
@@ -33,6 +33,21 @@ class Config(BaseSettings):
     llm_rate_limit_delay: float = Field(
         default=5.0, validation_alias="LLM_RATE_LIMIT_DELAY"
     )  # Seconds
+    # Pooled HTTP connections to the LLM provider
+    llm_max_connections: int = Field(
+        default=20, validation_alias="LLM_MAX_CONNECTIONS"
+    )
+    llm_max_keepalive_connections: int = Field(
+        default=10, validation_alias="LLM_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    llm_keepalive_expiry_seconds: float = Field(
+        default=60.0, validation_alias="LLM_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    llm_http2: bool = Field(default=False, validation_alias="LLM_HTTP2")
+    # Prompt + completion tokens the model accepts (None: known model default)
+    llm_context_window: Optional[int] = Field(
+        default=None, validation_alias="LLM_CONTEXT_WINDOW"
+    )
     embedding_dimension_mock: int = Field(
         default=128, validation_alias="EMBEDDING_DIMENSION_MOCK"
     )  # For mock LLM testing
@@ -128,11 +143,55 @@ class Config(BaseSettings):
     nltk_data_path: Optional[str] = Field(
         default=None, validation_alias="NLTK_DATA_PATH"
     )
+    spacy_n_process: int = Field(default=1, validation_alias="SPACY_N_PROCESS")
+    spacy_batch_size: int = Field(
+        default=32, validation_alias="SPACY_BATCH_SIZE")
+    # "spacy" scores each paper alone; "tfidf"/"yake" score across the corpus
+    keyword_backend: Literal["spacy", "tfidf", "yake"] = Field(
+        default="spacy", validation_alias="KEYWORD_BACKEND"
+    )
 
     # Embedding Settings for Vector Store
     sentence_transformer_model: str = Field(
         default="all-MiniLM-L6-v2", validation_alias="SENTENCE_TRANSFORMER_MODEL"
     )
+    embedding_batch_size: int = Field(
+        default=32, validation_alias="EMBEDDING_BATCH_SIZE"
+    )
+    # "onnx" runs the sentence-transformer model under ONNX Runtime on CPU
+    embedding_backend: Literal["sentence_transformers", "onnx"] = Field(
+        default="sentence_transformers", validation_alias="EMBEDDING_BACKEND"
+    )
+    onnx_model_dir: str = Field(
+        default="./data/models/onnx", validation_alias="ONNX_MODEL_DIR"
+    )
+    onnx_quantize: bool = Field(default=False, validation_alias="ONNX_QUANTIZE")
+    # Intra-op threads for ONNX Runtime (None uses the host's physical cores)
+    onnx_num_threads: Optional[int] = Field(
+        default=None, validation_alias="ONNX_NUM_THREADS"
+    )
+    # Activation memory one embedding forward pass may use; sizes the batch
+    # of each token-length bucket
+    embedding_memory_budget_mb: float = Field(
+        default=256.0, validation_alias="EMBEDDING_MEMORY_BUDGET_MB"
+    )
+    # Window for coalescing concurrent embedding requests into one batch
+    embedding_coalesce_ms: float = Field(
+        default=2.0, validation_alias="EMBEDDING_COALESCE_MS"
+    )
+    # Unix socket of an inference sidecar (``tsearch sidecar``)
+    # holding the embedding and spaCy models for all workers
+    inference_sidecar_socket: Optional[str] = Field(
+        default=None, validation_alias="INFERENCE_SIDECAR_SOCKET"
+    )
+    # Persistent embedding cache; set to an empty string to disable
+    embedding_cache_dir: Optional[str] = Field(
+        default="./data/cache/embeddings", validation_alias="EMBEDDING_CACHE_DIR"
+    )
+    # Unload shared models after this many idle seconds (None keeps them loaded)
+    model_idle_timeout_seconds: Optional[float] = Field(
+        default=None, validation_alias="MODEL_IDLE_TIMEOUT_SECONDS"
+    )
 
     # Advanced Settings & Defaults
     default_retrieval_sources: List[str] = Field(
@@ -147,6 +206,54 @@ class Config(BaseSettings):
     chroma_collection_name: str = Field(
         default="literature_collection", validation_alias="CHROMA_COLLECTION_NAME"
     )
+    # "numpy" serves search from an in-process, memory-mapped IVF index
+    vector_store_backend: Literal["chroma", "numpy"] = Field(
+        default="chroma", validation_alias="VECTOR_STORE_BACKEND"
+    )
+    # Quantized codes scanned by the numpy backend before full-precision rescoring
+    vector_quantization: Literal["none", "int8", "binary"] = Field(
+        default="none", validation_alias="VECTOR_QUANTIZATION"
+    )
+    quantization_rescore_factor: Optional[int] = Field(
+        default=None, validation_alias="QUANTIZATION_RESCORE_FACTOR"
+    )
+    # BM25 index kept beside the vector index for hybrid search
+    hybrid_search: bool = Field(default=False, validation_alias="HYBRID_SEARCH")
+    hybrid_vector_weight: float = Field(
+        default=1.0, validation_alias="HYBRID_VECTOR_WEIGHT"
+    )
+    hybrid_lexical_weight: float = Field(
+        default=1.0, validation_alias="HYBRID_LEXICAL_WEIGHT"
+    )
+    hybrid_rrf_k: int = Field(default=60, validation_alias="HYBRID_RRF_K")
+    # Split the collection into shards by year bucket, primary category or ID hash
+    vector_store_shard_key: Optional[Literal["year", "category", "hash"]] = Field(
+        default=None, validation_alias="VECTOR_STORE_SHARD_KEY"
+    )
+    vector_store_shards: int = Field(default=8, validation_alias="VECTOR_STORE_SHARDS")
+    shard_year_bucket: int = Field(default=5, validation_alias="SHARD_YEAR_BUCKET")
+    # Cross-encoder reranking of the top vector search candidates
+    rerank_enabled: bool = Field(default=False, validation_alias="RERANK_ENABLED")
+    rerank_model: str = Field(
+        default="cross-encoder/ms-marco-MiniLM-L-6-v2", validation_alias="RERANK_MODEL"
+    )
+    rerank_candidates: int = Field(default=50, validation_alias="RERANK_CANDIDATES")
+    rerank_batch_size: int = Field(default=32, validation_alias="RERANK_BATCH_SIZE")
+    rerank_latency_budget_ms: Optional[float] = Field(
+        default=None, validation_alias="RERANK_LATENCY_BUDGET_MS"
+    )
+    rerank_cache_size: int = Field(default=10000, validation_alias="RERANK_CACHE_SIZE")
+    # Threads serving async vector store calls (embedding + query)
+    vector_store_workers: int = Field(
+        default=2, validation_alias="VECTOR_STORE_WORKERS"
+    )
+    # Embed every full-text chunk for passage-level search
+    index_full_text_chunks: bool = Field(
+        default=False, validation_alias="INDEX_FULL_TEXT_CHUNKS"
+    )
+    chunk_pooling: Literal["max", "sum"] = Field(
+        default="max", validation_alias="CHUNK_POOLING"
+    )
 
     # Application Configuration
     log_file: str = Field(default="./logs/app.log",
@@ -162,6 +269,10 @@ class Config(BaseSettings):
     max_tokens_per_request: int = Field(
         default=4000, validation_alias="MAX_TOKENS_PER_REQUEST"
     )
+    # Local tokenizer.json file or tokenizer directory for exact token counts
+    tokenizer_path: Optional[str] = Field(
+        default=None, validation_alias="TOKENIZER_PATH"
+    )
 
     # Output Configuration
     output_dir: str = Field(default="./data/outputs",
@@ -0,0 +1,289 @@
+"""Persistent embedding cache backed by a memory-mapped float16 array."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within one process are serialised
+    fcntl = None
+
+import numpy as np
+
+from .logger import LoggerMixin
+
+DIGEST_SIZE = 32  # sha256
+
+
+class EmbeddingCache(LoggerMixin):
+    """
+    Append-only on-disk cache of text embeddings for one model.
+
+    Layout of the cache directory:
+    - ``vectors.f16``: embeddings as consecutive float16 rows
+    - ``digests.bin``: sha256 digest of each row's text, in row order
+    - ``meta.json``: model name and embedding dimension
+
+    Vectors are read through a read-only memory map, so only the rows that
+    are actually looked up are paged in; the in-memory index holds just the
+    digest-to-row mapping.
+
+    Several processes may share a directory: appends are serialised with an
+    exclusive lock on ``.lock``, and rows appended by other processes are
+    picked up from ``digests.bin`` before lookups and appends.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            cache_dir: Root directory for embedding caches
+            model_name: Embedding model name; each model gets its own store
+        """
+        self.model_name = model_name
+        safe_name = re.sub(r"[^\w.-]+", "_", model_name)
+        self.directory = Path(cache_dir) / safe_name
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._vectors_path = self.directory / "vectors.f16"
+        self._digests_path = self.directory / "digests.bin"
+        self._meta_path = self.directory / "meta.json"
+        self._lock_path = self.directory / ".lock"
+
+        self._lock = threading.RLock()
+        self._index: Dict[bytes, int] = {}
+        self._dim: Optional[int] = None
+        self._rows = 0
+        self._mmap: Optional[np.memmap] = None
+        self._hits = 0
+        self._misses = 0
+
+        self._load()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the exclusive lock other processes use to append."""
+        with open(self._lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        """Load the digest index and recover from a partially written append."""
+        with self._lock, self._file_lock():
+            self._refresh(repair=True)
+        if self._rows:
+            self.logger.info(
+                f"Loaded embedding cache for '{self.model_name}' with {self._rows} vectors")
+
+    def _refresh(self, repair: bool = False) -> None:
+        """
+        Index rows appended since the last refresh, by any process.
+
+        Digests are appended after their vectors, so every complete digest
+        already has its vector on disk and can be read without the file lock.
+
+        Args:
+            repair: Trim a partially written append from both files; only
+                safe while holding the file lock
+        """
+        if self._dim is None:
+            if not self._meta_path.exists():
+                return
+            try:
+                meta = json.loads(self._meta_path.read_text())
+                self._dim = int(meta["dim"])
+            except (ValueError, KeyError, OSError) as e:
+                self.logger.warning(f"Ignoring unreadable embedding cache metadata: {e}")
+                return
+
+        digest_rows = (self._digests_path.stat().st_size // DIGEST_SIZE
+                       if self._digests_path.exists() else 0)
+        if repair:
+            row_bytes = self._dim * 2
+            vector_rows = (self._vectors_path.stat().st_size // row_bytes
+                           if self._vectors_path.exists() else 0)
+            # A crash between the two appends leaves one file longer; trim both
+            digest_rows = min(vector_rows, digest_rows)
+            for path, size in ((self._vectors_path, digest_rows * row_bytes),
+                               (self._digests_path, digest_rows * DIGEST_SIZE)):
+                if path.exists() and path.stat().st_size != size:
+                    with open(path, "r+b") as f:
+                        f.truncate(size)
+
+        if digest_rows <= self._rows:
+            return
+        with open(self._digests_path, "rb") as f:
+            f.seek(self._rows * DIGEST_SIZE)
+            digests = f.read((digest_rows - self._rows) * DIGEST_SIZE)
+        for i in range(len(digests) // DIGEST_SIZE):
+            digest = digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+            self._index.setdefault(digest, self._rows + i)
+        self._rows += len(digests) // DIGEST_SIZE
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        """Get the cache key of a text."""
+        return hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+
+    def _vectors(self) -> np.memmap:
+        """Get a memory map covering every row written so far."""
+        if self._mmap is None or self._mmap.shape[0] < self._rows:
+            self._mmap = np.memmap(
+                self._vectors_path, dtype=np.float16, mode="r",
+                shape=(self._rows, self._dim)
+            )
+        return self._mmap
+
+    def get_many(self, texts: Sequence[str]) -> Tuple[List[Optional[np.ndarray]], List[int]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Tuple of (embedding or None per text, indices of missing texts)
+        """
+        digests = [self.digest(text) for text in texts]
+        with self._lock:
+            self._refresh()
+            rows = [self._index.get(d) for d in digests]
+            vectors = self._vectors() if self._rows else None
+
+        found: List[Optional[np.ndarray]] = []
+        missing: List[int] = []
+        for i, row in enumerate(rows):
+            if row is None:
+                found.append(None)
+                missing.append(i)
+            else:
+                found.append(np.asarray(vectors[row], dtype=np.float32))
+
+        with self._lock:
+            self._hits += len(texts) - len(missing)
+            self._misses += len(missing)
+        return found, missing
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray) -> int:
+        """
+        Append embeddings for texts that are not cached yet.
+
+        Args:
+            texts: Texts that were embedded
+            embeddings: Array with one embedding row per text
+
+        Returns:
+            Number of vectors appended
+        """
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim != 2 or len(texts) == 0:
+            return 0
+
+        with self._lock, self._file_lock():
+            # Other processes may have appended since the last refresh; after
+            # the repair both files end exactly at row self._rows
+            self._refresh(repair=True)
+            if self._dim is None:
+                self._dim = embeddings.shape[1]
+                tmp_path = self._meta_path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_text(
+                    json.dumps({"model": self.model_name, "dim": self._dim,
+                                "dtype": "float16"}))
+                os.replace(tmp_path, self._meta_path)
+            elif embeddings.shape[1] != self._dim:
+                self.logger.warning(
+                    f"Embedding dimension {embeddings.shape[1]} does not match "
+                    f"cache dimension {self._dim}; not caching")
+                return 0
+
+            new_rows = []
+            new_digests = []
+            seen = set()
+            for text, vector in zip(texts, embeddings):
+                digest = self.digest(text)
+                if digest in self._index or digest in seen:
+                    continue
+                new_rows.append(vector)
+                new_digests.append(digest)
+                seen.add(digest)
+
+            if not new_rows:
+                return 0
+
+            # Vectors first: a crash before the digests are written only
+            # leaves unreferenced rows, which the next repair trims
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.asarray(new_rows, dtype=np.float16).tobytes())
+            with open(self._digests_path, "ab") as f:
+                f.write(b"".join(new_digests))
+
+            for offset, digest in enumerate(new_digests):
+                self._index[digest] = self._rows + offset
+            self._rows += len(new_rows)
+            return len(new_rows)
+
+    def get_or_compute(self, texts: Sequence[str],
+                       encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Get embeddings, computing and caching only the missing ones.
+
+        Args:
+            texts: Texts to embed
+            encode: Function encoding a list of texts into an array
+
+        Returns:
+            float32 array with one embedding row per text
+        """
+        found, missing = self.get_many(texts)
+        if missing:
+            # Encode each distinct missing text once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            computed = np.asarray(encode(unique_texts), dtype=np.float32)
+            self.put_many(unique_texts, computed)
+            by_text = dict(zip(unique_texts, computed))
+            for i in missing:
+                found[i] = by_text[texts[i]]
+        return np.stack(found) if found else np.empty((0, self._dim or 0), np.float32)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get cache size and hit statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "model": self.model_name,
+                "vectors": self._rows,
+                "dimension": self._dim or 0,
+                "size_mb": round(self._rows * (self._dim or 0) * 2 / 1024 / 1024, 2),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
+
+
+# Global embedding caches, one per (directory, model)
+_embedding_caches: Dict[Tuple[str, str], EmbeddingCache] = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str,
+                        cache_dir: str = "./data/cache/embeddings") -> EmbeddingCache:
+    """Get the shared embedding cache for a model."""
+    key = (str(Path(cache_dir).resolve()), model_name)
+    with _embedding_caches_lock:
+        cache = _embedding_caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(cache_dir, model_name)
+            _embedding_caches[key] = cache
+        return cache
@@ -0,0 +1,314 @@
+"""Shared, length-bucketed batching of sentence embedding requests."""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .logger import LoggerMixin
+from .model_registry import get_model_registry
+from .tokenizer import get_token_counter
+
+# Padded lengths texts are grouped by; longer inputs share the model's limit
+BUCKET_LENGTHS = (16, 32, 64, 128, 256, 512)
+# Rough float32 activations kept per token and hidden unit during a forward
+# pass (attention projections, feed-forward expansion, layer outputs)
+ACTIVATION_COPIES = 16
+# Attention heads assumed when sizing the per-sequence attention matrices
+ATTENTION_HEADS = 12
+DEFAULT_HIDDEN_SIZE = 384
+# Characters counted per token of the model limit; anything longer is
+# truncated by the model anyway
+_CHARS_PER_TOKEN_LIMIT = 8
+
+
+class _Request:
+    """One caller's texts and the future their embeddings are delivered to."""
+
+    def __init__(self, texts: List[str], max_batch_size: Optional[int]):
+        self.texts = texts
+        self.max_batch_size = max_batch_size
+        self.future: Future = Future()
+
+
+class EmbeddingScheduler(LoggerMixin):
+    """
+    Batch embedding requests for one model across the whole process.
+
+    Callers submit texts from any thread (:meth:`encode`) or coroutine
+    (:meth:`aencode`). A single dispatcher thread collects requests that
+    arrive within ``max_wait_ms`` of each other, removes duplicate texts,
+    groups them into buckets of similar token length and encodes each
+    bucket with the largest batch that fits ``memory_budget_mb``. Short
+    texts therefore run in large batches without padding to the longest
+    abstract, and long texts in small ones.
+    """
+
+    def __init__(self,
+                 model_name: str,
+                 memory_budget_mb: float = 256.0,
+                 max_batch_size: int = 256,
+                 max_wait_ms: float = 2.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            model_name: Sentence transformer model name
+            memory_budget_mb: Activation memory one forward pass may use
+            max_batch_size: Upper bound on texts per forward pass
+            max_wait_ms: How long to wait for more requests to coalesce
+        """
+        self.model_name = model_name
+        self.memory_budget_mb = memory_budget_mb
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        registry = get_model_registry()
+        self._model_handle = registry.acquire(registry.SENTENCE_TRANSFORMER, model_name)
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+
+        self._requests = 0
+        self._dispatches = 0
+        self._texts = 0
+        self._forward_passes = 0
+        self._bucket_texts: Counter = Counter()
+
+    @property
+    def model(self) -> Any:
+        """Shared sentence transformer, or None if it could not be loaded."""
+        return self._model_handle.model
+
+    def submit(self, texts: Sequence[str], max_batch_size: Optional[int] = None) -> Future:
+        """
+        Queue texts for encoding.
+
+        Args:
+            texts: Texts to encode
+            max_batch_size: Caller's cap on texts per forward pass
+
+        Returns:
+            Future resolving to a float32 array with one row per text
+        """
+        request = _Request(list(texts), max_batch_size)
+        if not request.texts:
+            request.future.set_result(np.empty((0, 0), dtype=np.float32))
+            return request.future
+
+        self._ensure_dispatcher()
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts: Sequence[str],
+               max_batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Encode texts, blocking until their batch has run.
+
+        Args:
+            texts: Texts to encode
+            max_batch_size: Caller's cap on texts per forward pass
+
+        Returns:
+            float32 array with one row per text
+        """
+        return self.submit(texts, max_batch_size).result()
+
+    async def aencode(self, texts: Sequence[str],
+                      max_batch_size: Optional[int] = None) -> np.ndarray:
+        """Async variant of :meth:`encode`; does not block the event loop."""
+        return await asyncio.wrap_future(self.submit(texts, max_batch_size))
+
+    def _ensure_dispatcher(self) -> None:
+        """Start the dispatcher thread on first use."""
+        with self._lock:
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_loop,
+                    name=f"embedding-scheduler-{self.model_name}",
+                    daemon=True,
+                )
+                self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        """Collect requests within the coalescing window and encode them."""
+        while True:
+            requests = [self._queue.get()]
+            pending = len(requests[0].texts)
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while pending < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                requests.append(request)
+                pending += len(request.texts)
+
+            # Requests that were already waiting join this dispatch too
+            while True:
+                try:
+                    requests.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._run(requests)
+
+    def _run(self, requests: List[_Request]) -> None:
+        """Encode the union of several requests and resolve their futures."""
+        try:
+            unique: Dict[str, int] = {}
+            for request in requests:
+                for text in request.texts:
+                    unique.setdefault(text, len(unique))
+            caps = [r.max_batch_size for r in requests if r.max_batch_size]
+            max_batch_size = min(caps + [self.max_batch_size])
+
+            embeddings = self._encode_bucketed(list(unique), max_batch_size)
+            for request in requests:
+                rows = [unique[text] for text in request.texts]
+                request.future.set_result(embeddings[rows])
+
+            with self._lock:
+                self._requests += len(requests)
+                self._dispatches += 1
+                self._texts += len(unique)
+        except BaseException as e:
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def _encode_bucketed(self, texts: List[str], max_batch_size: int) -> np.ndarray:
+        """Encode texts bucket by bucket and return rows in input order."""
+        model = self.model
+        if model is None:
+            raise RuntimeError(f"Embedding model '{self.model_name}' is not available")
+
+        max_tokens = int(getattr(model, "max_seq_length", None) or BUCKET_LENGTHS[-1])
+        buckets: Dict[int, List[int]] = {}
+        for i, text in enumerate(texts):
+            buckets.setdefault(self._bucket_length(text, max_tokens), []).append(i)
+
+        hidden_size = self._hidden_size(model)
+        embeddings: Optional[np.ndarray] = None
+        for length in sorted(buckets):
+            indices = buckets[length]
+            batch_size = self.batch_size_for(length, hidden_size, max_batch_size)
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start:start + batch_size]
+                encoded = np.asarray(
+                    model.encode([texts[i] for i in batch], batch_size=len(batch),
+                                 convert_to_numpy=True, show_progress_bar=False),
+                    dtype=np.float32)
+                if embeddings is None:
+                    embeddings = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+                embeddings[batch] = encoded
+                with self._lock:
+                    self._forward_passes += 1
+            with self._lock:
+                self._bucket_texts[length] += len(indices)
+        return embeddings
+
+    def _bucket_length(self, text: str, max_tokens: int) -> int:
+        """Padded length bucket of a text under the model's token limit."""
+        tokens = get_token_counter().count(text[:max_tokens * _CHARS_PER_TOKEN_LIMIT])
+        tokens = min(tokens + 2, max_tokens)  # special tokens
+        for length in BUCKET_LENGTHS:
+            if tokens <= length:
+                return min(length, max_tokens)
+        return max_tokens
+
+    @staticmethod
+    def _hidden_size(model: Any) -> int:
+        """Hidden size of the model, falling back to MiniLM's."""
+        try:
+            return int(model.get_sentence_embedding_dimension() or DEFAULT_HIDDEN_SIZE)
+        except Exception:
+            return DEFAULT_HIDDEN_SIZE
+
+    def batch_size_for(self, length: int, hidden_size: int = DEFAULT_HIDDEN_SIZE,
+                       max_batch_size: Optional[int] = None) -> int:
+        """
+        Largest batch of ``length``-token sequences within the memory budget.
+
+        Args:
+            length: Padded sequence length
+            hidden_size: Model hidden size
+            max_batch_size: Cap on the batch size (defaults to the scheduler's)
+
+        Returns:
+            Batch size of at least 1
+        """
+        bytes_per_sequence = 4 * length * (hidden_size * ACTIVATION_COPIES
+                                           + length * ATTENTION_HEADS)
+        fits = int(self.memory_budget_mb * 1024 * 1024 // bytes_per_sequence)
+        return max(1, min(fits, max_batch_size or self.max_batch_size))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Request, dispatch and forward-pass counts and texts per bucket
+        """
+        with self._lock:
+            return {
+                "model": self.model_name,
+                "requests": self._requests,
+                "dispatches": self._dispatches,
+                "requests_per_dispatch": (self._requests / self._dispatches
+                                          if self._dispatches else 0.0),
+                "texts": self._texts,
+                "forward_passes": self._forward_passes,
+                "bucket_texts": dict(sorted(self._bucket_texts.items())),
+                "memory_budget_mb": self.memory_budget_mb,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+
+# Global schedulers, one per model
+_scheduler_settings: Dict[str, float] = {}
+_schedulers: Dict[str, EmbeddingScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def configure_embedding_scheduler(memory_budget_mb: Optional[float] = None,
+                                  max_batch_size: Optional[int] = None,
+                                  max_wait_ms: Optional[float] = None) -> None:
+    """
+    Set batching parameters for all current and future schedulers.
+
+    Args:
+        memory_budget_mb: Activation memory one forward pass may use
+        max_batch_size: Upper bound on texts per forward pass
+        max_wait_ms: How long to wait for more requests to coalesce
+    """
+    settings = {
+        "memory_budget_mb": memory_budget_mb,
+        "max_batch_size": max_batch_size,
+        "max_wait_ms": max_wait_ms,
+    }
+    with _schedulers_lock:
+        for name, value in settings.items():
+            if value is None:
+                continue
+            _scheduler_settings[name] = value
+            for scheduler in _schedulers.values():
+                setattr(scheduler, name, value)
+
+
+def get_embedding_scheduler(model_name: str) -> EmbeddingScheduler:
+    """Get the shared embedding scheduler for a model."""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(model_name)
+        if scheduler is None:
+            scheduler = EmbeddingScheduler(model_name, **_scheduler_settings)
+            _schedulers[model_name] = scheduler
+        return scheduler
@@ -3,26 +3,27 @@
 import re
 import unicodedata
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Iterator, List, Optional, Set, Tuple
 
-import spacy
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 
-# Global model cache to avoid reloading models repeatedly
-_SPACY_MODEL_CACHE = {}
+from .model_registry import get_model_registry
+from .tokenizer import get_token_counter
+
+# Global stopwords cache to avoid reloading them repeatedly
 _STOPWORDS_CACHE = {}
 
+# Pipeline components keyword extraction never reads; disabled for batch runs
+_KEYWORD_DISABLED_PIPES = ("parser",)
+
+# Texts longer than this are sampled before being fed to spaCy
+DEFAULT_MAX_DOC_CHARS = 100_000
+
 
 def _get_spacy_model(model_name: str = "en_core_web_sm"):
-    """Get cached spaCy model or load it if not cached."""
-    if model_name not in _SPACY_MODEL_CACHE:
-        try:
-            _SPACY_MODEL_CACHE[model_name] = spacy.load(model_name)
-        except OSError:
-            # Model not found, return None
-            _SPACY_MODEL_CACHE[model_name] = None
-    return _SPACY_MODEL_CACHE[model_name]
+    """Get the shared spaCy model from the model registry (None if unavailable)."""
+    return get_model_registry().get_spacy_model(model_name)
 
 
 def _get_stopwords(language: str = "english"):
@@ -64,6 +65,93 @@ def clean_text(text: str, remove_special_chars: bool = True) -> str:
     return text
 
 
+def _sample_text(text: str, max_chars: int, n_windows: int = 4) -> str:
+    """
+    Sample evenly spaced windows from a text that exceeds ``max_chars``.
+
+    Keeping the head, tail and a few windows from the middle preserves the
+    vocabulary of every part of a long paper while bounding the work done by
+    the NLP pipeline.
+
+    Args:
+        text: Input text
+        max_chars: Maximum number of characters to keep
+        n_windows: Number of windows to sample
+
+    Returns:
+        The original text if short enough, otherwise the joined windows
+    """
+    if len(text) <= max_chars:
+        return text
+
+    n_windows = max(1, n_windows)
+    window = max_chars // n_windows
+    stride = (len(text) - window) / max(n_windows - 1, 1)
+
+    windows = []
+    for i in range(n_windows):
+        start = int(i * stride)
+        end = start + window
+        # Snap to whitespace so words are not cut in half
+        if start > 0:
+            space = text.find(" ", start, end)
+            if space != -1:
+                start = space + 1
+        space = text.rfind(" ", start, end)
+        if space > start:
+            end = space
+        windows.append(text[start:end])
+
+    return "\n".join(windows)
+
+
+def _collect_keywords(
+    doc,
+    min_length: int,
+    stop_words: Set[str],
+    use_lemmas: bool = True,
+) -> List[str]:
+    """Collect entity and POS-based keyword candidates from a spaCy doc."""
+    keywords = []
+
+    # Add named entities
+    for ent in doc.ents:
+        if (
+            ent.label_ in ["PERSON", "ORG", "GPE", "PRODUCT", "EVENT"]
+            and len(ent.text) >= min_length
+            and ent.text.lower() not in stop_words
+        ):
+            keywords.append(ent.text.lower())
+
+    # Add important nouns and adjectives
+    for token in doc:
+        if (
+            token.pos_ in ["NOUN", "PROPN", "ADJ"]
+            and not token.is_stop
+            and not token.is_punct
+            and len(token.text) >= min_length
+            and token.text.lower() not in stop_words
+        ):
+            term = token.lemma_ if use_lemmas and token.lemma_ else token.text
+            keywords.append(term.lower())
+
+    # Preserve order while removing duplicates
+    return list(dict.fromkeys(keywords))
+
+
+def _fallback_keywords(
+    text: str, max_keywords: int, min_length: int, stop_words: Set[str]
+) -> List[str]:
+    """Extract keywords with plain tokenization when spaCy is unavailable."""
+    tokens = word_tokenize(text.lower())
+    keywords = [
+        token
+        for token in tokens
+        if (len(token) >= min_length and token.isalpha() and token not in stop_words)
+    ]
+    return list(dict.fromkeys(keywords))[:max_keywords]
+
+
 def extract_keywords(
     text: str,
     max_keywords: int = 10,
@@ -85,63 +173,87 @@ def extract_keywords(
     if not text:
         return []
 
-    try:
-        # Get cached spaCy model
-        nlp = _get_spacy_model("en_core_web_sm")
-        if nlp is None:
-            raise OSError("spaCy model not available")
-
-        doc = nlp(text.lower())
-
-        # Get cached stopwords
-        stop_words = _get_stopwords("english")
-        if custom_stopwords:
-            stop_words.update(custom_stopwords)
-
-        # Extract keywords based on POS tags and named entities
-        keywords = []
-
-        # Add named entities
-        for ent in doc.ents:
-            if (
-                ent.label_ in ["PERSON", "ORG", "GPE", "PRODUCT", "EVENT"]
-                and len(ent.text) >= min_length
-                and ent.text.lower() not in stop_words
-            ):
-                keywords.append(ent.text.lower())
-
-        # Add important nouns and adjectives
-        for token in doc:
-            if (
-                token.pos_ in ["NOUN", "PROPN", "ADJ"]
-                and not token.is_stop
-                and not token.is_punct
-                and len(token.text) >= min_length
-                and token.text.lower() not in stop_words
-            ):
-                keywords.append(token.lemma_.lower())
-
-        # Remove duplicates and limit results
-        # Preserve order while removing duplicates
-        keywords = list(dict.fromkeys(keywords))
-        return keywords[:max_keywords]
-
-    except OSError:
+    return extract_keywords_batch(
+        [text],
+        max_keywords=max_keywords,
+        min_length=min_length,
+        custom_stopwords=custom_stopwords,
+    )[0]
+
+
+def extract_keywords_batch(
+    texts: List[str],
+    max_keywords: int = 10,
+    min_length: int = 3,
+    custom_stopwords: Optional[Set[str]] = None,
+    use_lemmas: bool = True,
+    n_process: int = 1,
+    batch_size: int = 32,
+    max_doc_chars: int = DEFAULT_MAX_DOC_CHARS,
+    spacy_model: str = "en_core_web_sm",
+) -> List[List[str]]:
+    """
+    Extract keywords from many texts in a single spaCy ``nlp.pipe`` pass.
+
+    Components the extraction never reads (the dependency parser, and the
+    lemmatizer when ``use_lemmas`` is False) are disabled for the run, and
+    texts longer than ``max_doc_chars`` are sampled rather than truncated.
+
+    Args:
+        texts: Input texts
+        max_keywords: Maximum number of keywords to return per text
+        min_length: Minimum length of keywords
+        custom_stopwords: Additional stopwords to filter out
+        use_lemmas: Whether to return lemmatized keywords
+        n_process: Number of worker processes for ``nlp.pipe``
+        batch_size: Number of texts buffered per ``nlp.pipe`` batch
+        max_doc_chars: Maximum characters fed to the pipeline per text
+        spacy_model: Name of the spaCy pipeline to use
+
+    Returns:
+        One keyword list per input text, in input order
+    """
+    if not texts:
+        return []
+
+    # Copy so custom stopwords never leak into the shared cache
+    stop_words = set(_get_stopwords("english"))
+    if custom_stopwords:
+        stop_words.update(custom_stopwords)
+
+    results: List[List[str]] = [[] for _ in texts]
+    indices = [i for i, text in enumerate(texts) if text]
+    if not indices:
+        return results
+
+    nlp = _get_spacy_model(spacy_model)
+    if nlp is None:
         # Fallback to simple tokenization if spaCy model is not available
-        tokens = word_tokenize(text.lower())
-        stop_words = _get_stopwords("english")
-        if custom_stopwords:
-            stop_words.update(custom_stopwords)
-
-        keywords = [
-            token
-            for token in tokens
-            if (
-                len(token) >= min_length and token.isalpha() and token not in stop_words
+        for i in indices:
+            results[i] = _fallback_keywords(
+                texts[i], max_keywords, min_length, stop_words
             )
+        return results
+
+    disabled = [name for name in _KEYWORD_DISABLED_PIPES if name in nlp.pipe_names]
+    if not use_lemmas and "lemmatizer" in nlp.pipe_names:
+        disabled.append("lemmatizer")
+
+    max_chars = min(max_doc_chars, nlp.max_length - 1)
+    prepared = (_sample_text(texts[i], max_chars).lower() for i in indices)
+
+    docs = nlp.pipe(
+        prepared,
+        disable=disabled,
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    for i, doc in zip(indices, docs):
+        results[i] = _collect_keywords(doc, min_length, stop_words, use_lemmas)[
+            :max_keywords
         ]
 
-        return list(dict.fromkeys(keywords))[:max_keywords]
+    return results
 
 
 def validate_email(email: str) -> bool:
@@ -198,88 +310,142 @@ def safe_filename(filename: str, max_length: int = 200) -> str:
     return safe_chars
 
 
-def chunk_text(
-    text: str, chunk_size: int = 1000, overlap: int = 200, separator: str = "\n\n"
-) -> List[str]:
+def find_break_point(
+    text: str, start: int, end: int, chunk_size: int, separator: str = "\n\n"
+) -> int:
     """
-    Split text into overlapping chunks for processing.
+    Find a natural break point for a chunk without copying the text.
+
+    Searches ``text[start:end]`` in place for, in order of preference, the
+    separator, a sentence ending and a word boundary in the latter half of
+    the chunk.
+
+    Args:
+        text: Full text
+        start: Start offset of the chunk
+        end: Proposed end offset
+        chunk_size: Nominal chunk size
+        separator: Preferred split separator
+
+    Returns:
+        End offset of the chunk
+    """
+    # Only break in the latter half of the chunk
+    min_pos = start + chunk_size // 2
+
+    sep_pos = text.rfind(separator, start, end)
+    if sep_pos > min_pos:
+        return sep_pos + len(separator)
+
+    for punct in (". ", "! ", "? "):
+        punct_pos = text.rfind(punct, start, end)
+        if punct_pos > min_pos:
+            return punct_pos + len(punct)
+
+    space_pos = text.rfind(" ", start, end)
+    if space_pos > min_pos:
+        return space_pos + 1
+
+    return end
+
+
+def trim_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """
+    Shrink a span so it excludes surrounding whitespace.
+
+    Args:
+        text: Full text
+        start: Span start offset
+        end: Span end offset
+
+    Returns:
+        Trimmed ``(start, end)``; empty spans have ``start == end``
+    """
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def iter_chunk_spans(
+    text: str,
+    chunk_size: int = 1000,
+    overlap: int = 200,
+    separator: str = "\n\n",
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Lazily yield overlapping chunk spans as ``(start, end)`` offsets.
 
     Args:
         text: Text to chunk
         chunk_size: Maximum size of each chunk
         overlap: Number of characters to overlap between chunks
         separator: Preferred split separator
+        start: Offset to start chunking from
+        end: Offset to stop chunking at (defaults to the end of the text)
 
-    Returns:
-        List of text chunks
+    Yields:
+        Whitespace-trimmed, non-empty ``(start, end)`` spans
     """
-    if not text or len(text) <= chunk_size:
-        return [text] if text else []
+    limit = len(text) if end is None else end
 
-    chunks = []
-    start = 0
+    while start < limit:
+        chunk_end = start + chunk_size
+        if chunk_end >= limit:
+            chunk_end = limit
+        else:
+            chunk_end = find_break_point(text, start, chunk_end, chunk_size, separator)
 
-    while start < len(text):
-        # Determine end position
-        end = start + chunk_size
+        span = trim_span(text, start, chunk_end)
+        if span[1] > span[0]:
+            yield span
 
-        if end >= len(text):
-            # Last chunk
-            chunks.append(text[start:])
+        if chunk_end >= limit:
             break
+        start = max(start + 1, chunk_end - overlap)
 
-        # Try to find a good break point
-        chunk_end = end
 
-        # Look for separator within the last part of the chunk
-        sep_pos = text[start:end].rfind(separator)
-        if sep_pos > chunk_size // 2:  # Only use if separator is in the latter half
-            chunk_end = start + sep_pos + len(separator)
-        else:
-            # Look for sentence endings
-            for punct in [". ", "! ", "? "]:
-                punct_pos = text[start:end].rfind(punct)
-                if punct_pos > chunk_size // 2:
-                    chunk_end = start + punct_pos + len(punct)
-                    break
-            else:
-                # Look for word boundaries
-                space_pos = text[start:end].rfind(" ")
-                if space_pos > chunk_size // 2:
-                    chunk_end = start + space_pos + 1
-
-        chunks.append(text[start:chunk_end].strip())
-
-        # Move start position with overlap
-        start = max(start + 1, chunk_end - overlap)
+def chunk_text(
+    text: str, chunk_size: int = 1000, overlap: int = 200, separator: str = "\n\n"
+) -> List[str]:
+    """
+    Split text into overlapping chunks for processing.
 
-    return [chunk for chunk in chunks if chunk.strip()]
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum size of each chunk
+        overlap: Number of characters to overlap between chunks
+        separator: Preferred split separator
+
+    Returns:
+        List of text chunks
+    """
+    if not text:
+        return []
+    return [
+        text[start:end]
+        for start, end in iter_chunk_spans(text, chunk_size, overlap, separator)
+    ]
 
 
 def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
     """
-    Estimate the number of tokens in a text.
+    Count the number of tokens in a text.
 
-    This is a simple estimation. For more accurate token counting,
-    use the actual tokenizer of the target LLM model.
+    Uses the shared token counter: the configured local tokenizer if there
+    is one, otherwise a CJK- and code-aware heuristic. Counts are memoized.
 
     Args:
         text: Input text
-        chars_per_token: Average characters per token
+        chars_per_token: Unused; kept for backwards compatibility
 
     Returns:
-        Estimated token count
+        Token count
     """
-    if not text:
-        return 0
-
-    # Simple word-based estimation that's usually more accurate than pure character count
-    word_count = len(text.split())
-    char_estimate = int(len(text) / chars_per_token)
-
-    # Use the average of word count and character-based estimate
-    # This tends to be more accurate for most texts
-    return int((word_count + char_estimate) / 2)
+    return get_token_counter().count(text)
 
 
 def truncate_text(text: str, max_tokens: int, chars_per_token: float = 4.0) -> str:
@@ -289,31 +455,9 @@ def truncate_text(text: str, max_tokens: int, chars_per_token: float = 4.0) -> s
     Args:
         text: Input text
         max_tokens: Maximum allowed tokens
-        chars_per_token: Average characters per token
+        chars_per_token: Unused; kept for backwards compatibility
 
     Returns:
         Truncated text
     """
-    if not text:
-        return ""
-
-    max_chars = int(max_tokens * chars_per_token)
-
-    if len(text) <= max_chars:
-        return text
-
-    # Truncate and try to end at a sentence boundary
-    truncated = text[:max_chars]
-
-    # Find the last sentence ending
-    for punct in [". ", "! ", "? "]:
-        last_punct = truncated.rfind(punct)
-        if last_punct > max_chars * 0.8:  # Only if we don't lose too much text
-            return truncated[: last_punct + 1].strip()
-
-    # If no good sentence boundary, truncate at word boundary
-    last_space = truncated.rfind(" ")
-    if last_space > max_chars * 0.8:
-        return truncated[:last_space].strip()
-
-    return truncated.strip()
+    return get_token_counter().truncate(text, max_tokens)
@@ -0,0 +1,381 @@
+"""Process-wide registry for sharing heavyweight NLP models between components."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .logger import LoggerMixin
+
+ModelKey = Tuple[str, str]
+
+
+class _ModelEntry:
+    """Bookkeeping for a single registered model."""
+
+    def __init__(self, loader: Callable[[], Any]):
+        self.loader = loader
+        self.model: Any = None
+        self.loaded = False
+        self.failed = False
+        self.ref_count = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+
+class ModelHandle:
+    """
+    Reference-counted, lazily resolved handle to a registered model.
+
+    The model is loaded on first access to :attr:`model` and transparently
+    reloaded if the registry unloaded it while idle.
+    """
+
+    def __init__(self, registry: "ModelRegistry", key: ModelKey):
+        self._registry = registry
+        self._key = key
+        self._released = False
+
+    @property
+    def kind(self) -> str:
+        """Model kind (e.g. ``sentence_transformer`` or ``spacy``)."""
+        return self._key[0]
+
+    @property
+    def name(self) -> str:
+        """Model name."""
+        return self._key[1]
+
+    @property
+    def model(self) -> Any:
+        """The loaded model, or None if it could not be loaded."""
+        return self._registry.get(*self._key)
+
+    def release(self) -> None:
+        """Drop this handle's reference. Safe to call more than once."""
+        if not self._released:
+            self._released = True
+            self._registry.release(*self._key)
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:
+            pass
+
+
+class ModelRegistry(LoggerMixin):
+    """
+    Thread-safe registry that loads each model at most once per process.
+
+    Features:
+    - Lazy loading on first use
+    - Load-once semantics under concurrent access
+    - Reference counting through :class:`ModelHandle`
+    - Optional unloading of models that have been idle for a while
+    """
+
+    SENTENCE_TRANSFORMER = "sentence_transformer"
+    SPACY = "spacy"
+    TOKENIZER = "tokenizer"
+    CROSS_ENCODER = "cross_encoder"
+
+    def __init__(self, idle_timeout: Optional[float] = None):
+        """
+        Initialize the model registry.
+
+        Args:
+            idle_timeout: Seconds after which unused models are unloaded.
+                None disables idle unloading.
+        """
+        self._entries: Dict[ModelKey, _ModelEntry] = {}
+        self._loaders: Dict[str, Callable[[str], Any]] = {
+            self.SENTENCE_TRANSFORMER: _load_sentence_transformer,
+            self.SPACY: _load_spacy_model,
+            self.TOKENIZER: _load_tokenizer,
+            self.CROSS_ENCODER: _load_cross_encoder,
+        }
+        self._lock = threading.RLock()
+        self._idle_timeout: Optional[float] = None
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+        self.configure_idle_unloading(idle_timeout)
+
+    def register_loader(self, kind: str, loader: Callable[[str], Any]) -> None:
+        """
+        Register (or replace) the loader used for a model kind.
+
+        Args:
+            kind: Model kind
+            loader: Callable taking a model name and returning the model
+        """
+        with self._lock:
+            self._loaders[kind] = loader
+
+    def _entry(self, kind: str, name: str) -> _ModelEntry:
+        """Get or create the entry for a model."""
+        key = (kind, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if kind not in self._loaders:
+                    raise KeyError(f"No loader registered for model kind: {kind}")
+                loader = self._loaders[kind]
+                entry = _ModelEntry(lambda: loader(name))
+                self._entries[key] = entry
+            return entry
+
+    def acquire(self, kind: str, name: str) -> ModelHandle:
+        """
+        Take a reference to a model without loading it yet.
+
+        Args:
+            kind: Model kind
+            name: Model name
+
+        Returns:
+            Handle resolving to the shared model instance
+        """
+        entry = self._entry(kind, name)
+        with self._lock:
+            entry.ref_count += 1
+        return ModelHandle(self, (kind, name))
+
+    def release(self, kind: str, name: str) -> None:
+        """
+        Drop a reference taken with :meth:`acquire`.
+
+        Args:
+            kind: Model kind
+            name: Model name
+        """
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is not None and entry.ref_count > 0:
+                entry.ref_count -= 1
+
+    def get(self, kind: str, name: str) -> Any:
+        """
+        Get a model, loading it if necessary.
+
+        Args:
+            kind: Model kind
+            name: Model name
+
+        Returns:
+            The shared model instance, or None if it failed to load
+        """
+        while True:
+            entry = self._entry(kind, name)
+            with entry.lock:
+                with self._lock:
+                    if self._entries.get((kind, name)) is not entry:
+                        # Removed by unload() after we looked it up; loading
+                        # into it would leave a second, untracked copy
+                        continue
+                return self._load(entry, kind, name)
+
+    def _load(self, entry: _ModelEntry, kind: str, name: str) -> Any:
+        """Load an entry's model if needed. Caller holds ``entry.lock``."""
+        entry.last_used = time.monotonic()
+        if not entry.loaded:
+            start = time.monotonic()
+            try:
+                entry.model = entry.loader()
+                entry.failed = False
+                self.logger.info(
+                    f"Loaded {kind} model '{name}' "
+                    f"in {time.monotonic() - start:.2f}s"
+                )
+            except Exception as e:
+                self.logger.warning(f"Could not load {kind} model '{name}': {e}")
+                entry.model = None
+                entry.failed = True
+            entry.loaded = True
+        return entry.model
+
+    def get_sentence_transformer(self, name: str) -> Any:
+        """Get a shared SentenceTransformer model."""
+        return self.get(self.SENTENCE_TRANSFORMER, name)
+
+    def get_spacy_model(self, name: str) -> Any:
+        """Get a shared spaCy pipeline."""
+        return self.get(self.SPACY, name)
+
+    def unload(self, kind: str, name: str) -> bool:
+        """
+        Unload a model. Outstanding handles reload it on next access.
+
+        Args:
+            kind: Model kind
+            name: Model name
+
+        Returns:
+            True if a loaded model was dropped
+        """
+        key = (kind, name)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+
+        # Waits for an in-flight load of this model; the registry lock is
+        # only taken briefly inside, so other models are not blocked
+        with entry.lock:
+            was_loaded = entry.loaded and entry.model is not None
+            entry.model = None
+            entry.loaded = False
+
+            # Still under the entry lock, so get() cannot be loading into an
+            # entry that is being dropped
+            with self._lock:
+                if entry.ref_count == 0 and self._entries.get(key) is entry:
+                    del self._entries[key]
+        if was_loaded:
+            self.logger.info(f"Unloaded {kind} model '{name}'")
+        return was_loaded
+
+    def unload_idle(self, max_idle: Optional[float] = None) -> int:
+        """
+        Unload models that have not been used recently.
+
+        Models with outstanding handles stay loaded; only unreferenced ones
+        are unloaded.
+
+        Args:
+            max_idle: Idle threshold in seconds (uses the configured timeout if None)
+
+        Returns:
+            Number of models unloaded
+        """
+        max_idle = max_idle if max_idle is not None else self._idle_timeout
+        if max_idle is None:
+            return 0
+
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                key
+                for key, entry in self._entries.items()
+                if entry.loaded and entry.ref_count == 0
+                and now - entry.last_used > max_idle
+            ]
+        return sum(1 for key in idle if self.unload(*key))
+
+    def configure_idle_unloading(self, idle_timeout: Optional[float]) -> None:
+        """
+        Enable or disable background unloading of idle models.
+
+        Args:
+            idle_timeout: Seconds after which unused models are unloaded,
+                or None to disable
+        """
+        self._idle_timeout = idle_timeout
+        if idle_timeout is None:
+            self._stop_reaper.set()
+            return
+
+        if self._reaper and self._reaper.is_alive():
+            if not self._stop_reaper.is_set():
+                return
+            # A reaper stopped by an earlier call may not have exited yet;
+            # wait for it so the event can be cleared for the new one
+            self._reaper.join()
+
+        self._stop_reaper.clear()
+        self._reaper = threading.Thread(
+            target=self._reap_loop, name="model-registry-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        """Periodically unload idle models until stopped."""
+        while self._idle_timeout is not None:
+            interval = max(self._idle_timeout / 2, 1.0)
+            if self._stop_reaper.wait(interval):
+                break
+            try:
+                self.unload_idle()
+            except Exception as e:
+                self.logger.error(f"Error unloading idle models: {e}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get registry statistics.
+
+        Returns:
+            Mapping of ``kind:name`` to load state and reference count
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{kind}:{name}": {
+                    "loaded": entry.loaded and entry.model is not None,
+                    "failed": entry.failed,
+                    "ref_count": entry.ref_count,
+                    "idle_seconds": round(now - entry.last_used, 1),
+                }
+                for (kind, name), entry in self._entries.items()
+            }
+
+
+def _load_sentence_transformer(name: str) -> Any:
+    """Load a SentenceTransformer model."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(name)
+
+
+def _load_cross_encoder(name: str) -> Any:
+    """Load a sentence-transformers CrossEncoder model."""
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(name)
+
+
+def _load_spacy_model(name: str) -> Any:
+    """Load a spaCy pipeline."""
+    import spacy
+
+    return spacy.load(name)
+
+
+def _load_tokenizer(path: str) -> Any:
+    """
+    Load a tokenizer from local files only.
+
+    Accepts a ``tokenizer.json`` file (or a directory containing one) for the
+    ``tokenizers`` library, otherwise a local ``transformers`` tokenizer
+    directory. Never downloads anything.
+    """
+    from pathlib import Path
+
+    tokenizer_file = Path(path)
+    if tokenizer_file.is_dir():
+        tokenizer_file = tokenizer_file / "tokenizer.json"
+
+    if tokenizer_file.is_file():
+        try:
+            from tokenizers import Tokenizer
+
+            return Tokenizer.from_file(str(tokenizer_file))
+        except ImportError:
+            pass
+
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(path, local_files_only=True)
+
+
+# Global registry instance
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the global model registry instance."""
+    global _model_registry
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry()
+    return _model_registry
@@ -0,0 +1,374 @@
+"""Sentence embeddings on CPU with ONNX Runtime.
+
+:class:`OnnxSentenceEncoder` is a drop-in replacement for the subset of the
+``SentenceTransformer`` API used by this package (``encode``), built from the
+same HuggingFace model files. It avoids importing PyTorch at runtime and can
+run an int8 dynamically quantized graph. Models without a bundled ONNX file
+are exported once (this step needs ``torch`` and ``transformers``) and
+reused from ``model_dir`` afterwards.
+"""
+
+import functools
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .logger import LoggerMixin
+from .model_registry import get_model_registry
+
+ONNX_FILE = "model.onnx"
+QUANTIZED_ONNX_FILE = "model_int8.onnx"
+# Minimum per-text cosine similarity to PyTorch embeddings for ONNX vectors
+# to share a collection with PyTorch-built ones (fp32 export and int8 model)
+MIN_COSINE_FP32 = 0.9999
+MIN_COSINE_INT8 = 0.99
+
+
+def default_num_threads() -> int:
+    """Intra-op threads for the host: physical cores available to this process."""
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+
+    try:
+        import psutil
+
+        physical = psutil.cpu_count(logical=False) or available
+    except ImportError:
+        physical = available
+    return max(1, min(available, physical))
+
+
+class OnnxSentenceEncoder(LoggerMixin):
+    """Sentence encoder running a transformer ONNX graph with ONNX Runtime."""
+
+    def __init__(self,
+                 model_path: str,
+                 tokenizer_path: str,
+                 pooling: str = "mean",
+                 normalize: bool = True,
+                 max_seq_length: int = 256,
+                 num_threads: Optional[int] = None):
+        """
+        Initialize the encoder.
+
+        Args:
+            model_path: ONNX model file
+            tokenizer_path: ``tokenizer.json`` of the model
+            pooling: ``mean``, ``cls`` or ``max`` token pooling
+            normalize: L2-normalize the sentence embeddings
+            max_seq_length: Token limit per input
+            num_threads: Intra-op threads (defaults to the physical cores
+                available to this process)
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        if pooling not in ("mean", "cls", "max"):
+            raise ValueError(f"Unknown pooling: {pooling}")
+
+        self.model_path = str(model_path)
+        self.pooling = pooling
+        self.normalize = normalize
+        self.max_seq_length = max_seq_length
+        self.num_threads = num_threads or default_num_threads()
+
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+        self.logger.info(
+            f"Loaded ONNX encoder {self.model_path} "
+            f"({pooling} pooling, {self.num_threads} threads)")
+
+    @classmethod
+    def from_pretrained(cls,
+                        name: str,
+                        model_dir: str = "./data/models/onnx",
+                        quantize: bool = False,
+                        num_threads: Optional[int] = None) -> "OnnxSentenceEncoder":
+        """
+        Build an encoder from a sentence-transformers model.
+
+        Uses the model's bundled ``onnx/model.onnx`` when present, otherwise
+        a previous export in ``model_dir``, otherwise exports one.
+
+        Args:
+            name: Model name (``all-MiniLM-L6-v2``), hub ID or local directory
+            model_dir: Directory for exported and quantized ONNX files
+            quantize: Run an int8 dynamically quantized copy of the model
+            num_threads: Intra-op threads
+
+        Returns:
+            Encoder instance
+        """
+        source = _resolve_model_source(name)
+        target = Path(model_dir) / re.sub(r"[^\w.-]+", "_", name)
+        target.mkdir(parents=True, exist_ok=True)
+
+        onnx_path = source / "onnx" / ONNX_FILE
+        if not onnx_path.exists():
+            onnx_path = target / ONNX_FILE
+            if not onnx_path.exists():
+                _export_onnx(source, onnx_path)
+
+        if quantize:
+            quantized_path = target / QUANTIZED_ONNX_FILE
+            if not quantized_path.exists():
+                _quantize_onnx(onnx_path, quantized_path)
+            onnx_path = quantized_path
+
+        config = _read_json(source / "sentence_bert_config.json")
+        return cls(
+            model_path=str(onnx_path),
+            tokenizer_path=str(source / "tokenizer.json"),
+            pooling=_pooling_mode(source),
+            normalize=_has_normalize_module(source),
+            max_seq_length=int(config.get("max_seq_length", 256)),
+            num_threads=num_threads,
+        )
+
+    def encode(self,
+               sentences: Union[str, Sequence[str]],
+               batch_size: int = 32,
+               convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False,
+               **kwargs: Any) -> np.ndarray:
+        """
+        Encode sentences into embeddings.
+
+        Mirrors ``SentenceTransformer.encode``: a single string gives a 1-D
+        vector, a list gives one row per sentence. Inputs are length-sorted
+        internally so each batch pads to similar lengths.
+
+        Args:
+            sentences: Sentence or sentences to encode
+            batch_size: Sentences per ONNX Runtime call
+            convert_to_numpy: Accepted for compatibility; output is always NumPy
+            normalize_embeddings: Force L2 normalization
+            **kwargs: Other ``SentenceTransformer.encode`` options (ignored)
+
+        Returns:
+            float32 embeddings
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batches.append(self._encode_batch([texts[i] for i in order[start:start + batch_size]]))
+        encoded = np.concatenate(batches)
+
+        embeddings = np.empty_like(encoded)
+        embeddings[order] = encoded
+        if normalize_embeddings and not self.normalize:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Run one padded batch through the model and pool it."""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        feeds = {name: value for name, value in feeds.items() if name in self._input_names}
+
+        output = self.session.run(None, feeds)[0].astype(np.float32, copy=False)
+        if output.ndim == 2:
+            embeddings = output  # graph already pools
+        elif self.pooling == "cls":
+            embeddings = output[:, 0]
+        elif self.pooling == "max":
+            masked = np.where(attention_mask[:, :, None] > 0, output, -np.inf)
+            embeddings = masked.max(axis=1)
+        else:
+            mask = attention_mask[:, :, None].astype(np.float32)
+            embeddings = (output * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+        if self.normalize:
+            embeddings = embeddings / np.maximum(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings.astype(np.float32, copy=False)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding dimension of the model."""
+        shape = self.session.get_outputs()[0].shape
+        dim = shape[-1]
+        return dim if isinstance(dim, int) else len(self.encode("dimension probe"))
+
+
+def compare_embeddings(reference: Any, candidate: Any,
+                       texts: Sequence[str],
+                       min_cosine: float = MIN_COSINE_FP32) -> Dict[str, Any]:
+    """
+    Check that two encoders produce interchangeable embeddings.
+
+    Run this before pointing an ONNX encoder at a collection built with the
+    PyTorch model (or the other way around).
+
+    Args:
+        reference: Encoder that built the existing vectors
+        candidate: Encoder to validate
+        texts: Sample texts, ideally drawn from the collection
+        min_cosine: Smallest acceptable per-text cosine similarity
+
+    Returns:
+        Dictionary with ``min_cosine``, ``mean_cosine``, ``max_abs_diff`` and
+        ``compatible``
+    """
+    return compare_vectors(reference.encode(list(texts)), candidate.encode(list(texts)),
+                           min_cosine)
+
+
+def compare_vectors(expected: Any, actual: Any,
+                    min_cosine: float = MIN_COSINE_FP32) -> Dict[str, Any]:
+    """
+    Compare two sets of embeddings of the same texts row by row.
+
+    Args:
+        expected: Reference embeddings, e.g. vectors stored in a collection
+        actual: Embeddings of the same texts from the encoder to validate
+        min_cosine: Smallest acceptable per-text cosine similarity
+
+    Returns:
+        Dictionary with ``min_cosine``, ``mean_cosine``, ``max_abs_diff``
+        (between the L2-normalized vectors) and ``compatible``
+    """
+    expected = np.asarray(expected, dtype=np.float32)
+    actual = np.asarray(actual, dtype=np.float32)
+    if expected.shape != actual.shape:
+        return {"texts": len(expected), "threshold": min_cosine, "compatible": False,
+                "error": f"shape {actual.shape} does not match {expected.shape}"}
+    # Stores may keep normalized vectors; compare directions only
+    expected = expected / np.maximum(np.linalg.norm(expected, axis=1, keepdims=True), 1e-12)
+    actual = actual / np.maximum(np.linalg.norm(actual, axis=1, keepdims=True), 1e-12)
+    cosines = (expected * actual).sum(axis=1)
+    return {
+        "texts": len(expected),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "max_abs_diff": float(np.abs(expected - actual).max()),
+        "threshold": min_cosine,
+        "compatible": bool(cosines.min() >= min_cosine),
+    }
+
+
+def configure_onnx_embeddings(model_dir: str = "./data/models/onnx",
+                              quantize: bool = False,
+                              num_threads: Optional[int] = None) -> None:
+    """
+    Serve shared sentence-transformer models through ONNX Runtime.
+
+    Replaces the registry loader for sentence-transformer models, so every
+    component acquiring one afterwards (VectorStore, EmbeddingsManager,
+    TextProcessor) gets an :class:`OnnxSentenceEncoder`. Call it before those
+    components load their model.
+
+    Args:
+        model_dir: Directory for exported and quantized ONNX files
+        quantize: Use int8 dynamically quantized models
+        num_threads: Intra-op threads (defaults to the host's physical cores)
+    """
+    registry = get_model_registry()
+    registry.register_loader(
+        registry.SENTENCE_TRANSFORMER,
+        functools.partial(OnnxSentenceEncoder.from_pretrained, model_dir=model_dir,
+                          quantize=quantize, num_threads=num_threads)
+    )
+
+
+def _resolve_model_source(name: str) -> Path:
+    """Local directory holding a model's files, downloading it if needed."""
+    path = Path(name)
+    if path.is_dir():
+        return path
+
+    from huggingface_hub import snapshot_download
+
+    repo_id = name if "/" in name else f"sentence-transformers/{name}"
+    return Path(snapshot_download(
+        repo_id,
+        allow_patterns=["*.json", "*.txt", "onnx/model.onnx", "1_Pooling/*",
+                        "*.safetensors", "*.bin"],
+        ignore_patterns=["*/tf_model*", "*/flax_model*", "*/rust_model*"],
+    ))
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Read a JSON file, or an empty dict if it does not exist."""
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _pooling_mode(source: Path) -> str:
+    """Pooling mode from the model's sentence-transformers pooling config."""
+    config = _read_json(source / "1_Pooling" / "config.json")
+    if config.get("pooling_mode_cls_token"):
+        return "cls"
+    if config.get("pooling_mode_max_tokens"):
+        return "max"
+    return "mean"
+
+
+def _has_normalize_module(source: Path) -> bool:
+    """Whether the sentence-transformers pipeline ends with normalization."""
+    modules = json.loads((source / "modules.json").read_text()) \
+        if (source / "modules.json").exists() else []
+    return any(module.get("type", "").endswith("Normalize") for module in modules)
+
+
+def _export_onnx(source: Path, output_path: Path) -> None:
+    """Export a transformers model to ONNX (needs torch and transformers)."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    model = AutoModel.from_pretrained(str(source))
+    model.eval()
+    tokenizer = AutoTokenizer.from_pretrained(str(source))
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids")
+                   if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    tmp_path = output_path.with_suffix(".tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(tmp_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    shutil.move(str(tmp_path), str(output_path))
+
+
+def _quantize_onnx(input_path: Path, output_path: Path) -> None:
+    """Write an int8 dynamically quantized copy of an ONNX model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = output_path.with_suffix(".tmp")
+    quantize_dynamic(str(input_path), str(tmp_path), weight_type=QuantType.QInt8)
+    shutil.move(str(tmp_path), str(output_path))
@@ -0,0 +1,302 @@
+"""Token counting with local tokenizer files and a script-aware fallback."""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from .logger import LoggerMixin
+from .model_registry import get_model_registry
+
+Span = Tuple[int, int]
+
+# CJK ideographs, kana and hangul are roughly one token per character
+_CJK = (
+    "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff66-\uff9f"
+)
+# One match per heuristic "piece": a CJK character, a digit run, a word or a
+# symbol. Spaces are free: BPE vocabularies fold them into the next word.
+_PIECE_PATTERN = re.compile(rf"[{_CJK}]|(?P<digits>\d+)|[^\W\d{_CJK}]+|[^\w\s]")
+# Calibrated on English prose against ~100k-entry BPE vocabularies (GPT-4,
+# DeepSeek): words of up to 8 letters are usually one token, longer ones
+# add about one token per further 8 letters
+_CHARS_PER_WORD_PIECE = 8
+# Digit runs are split into groups of up to three digits
+_DIGITS_PER_PIECE = 3
+
+_SENTENCE_ENDS = (". ", "! ", "? ", "。", "！", "？")
+
+
+class TokenCounter(LoggerMixin):
+    """
+    Count tokens and pack text to exact token budgets.
+
+    Uses a local tokenizer when one is configured (a HuggingFace
+    ``tokenizer.json`` file or a local model directory; nothing is
+    downloaded) and otherwise a heuristic that treats CJK characters,
+    words, digit groups and symbols separately, which is closer than a fixed
+    characters-per-token ratio for English prose, CJK and code-heavy text. Token counts are
+    memoized by a hash of the text.
+    """
+
+    def __init__(self, tokenizer_path: Optional[str] = None, cache_size: int = 4096):
+        """
+        Initialize the token counter.
+
+        Args:
+            tokenizer_path: Path to a ``tokenizer.json`` file or a local
+                tokenizer directory. None uses the heuristic counter.
+            cache_size: Maximum number of memoized token counts
+        """
+        self.tokenizer_path = tokenizer_path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self._tokenizer_handle = None
+        if tokenizer_path:
+            registry = get_model_registry()
+            self._tokenizer_handle = registry.acquire(registry.TOKENIZER, tokenizer_path)
+
+    @property
+    def tokenizer(self):
+        """Shared local tokenizer, or None when using the heuristic."""
+        return self._tokenizer_handle.model if self._tokenizer_handle else None
+
+    @property
+    def backend(self) -> str:
+        """Name of the active counting backend."""
+        tokenizer = self.tokenizer
+        if tokenizer is None:
+            return "heuristic"
+        return "tokenizers" if hasattr(tokenizer, "encode_batch") else "transformers"
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens in a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+
+        key = hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with self._cache_lock:
+            count = self._cache.get(key)
+            if count is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return count
+
+        count = self._count_uncached(text)
+
+        with self._cache_lock:
+            self._misses += 1
+            self._cache[key] = count
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def _count_uncached(self, text: str) -> int:
+        """Count tokens without the memo, by token IDs when a tokenizer is set."""
+        tokenizer = self.tokenizer
+        if tokenizer is not None:
+            try:
+                return _tokenizer_count(tokenizer, text)
+            except Exception as e:
+                self.logger.warning(f"Tokenizer failed, using heuristic counts: {e}")
+        return len(self._heuristic_offsets(text))
+
+    def token_offsets(self, text: str) -> List[Span]:
+        """
+        Get the character span of every token.
+
+        Tokens without a span in the text (added or special tokens mapped to
+        zero-width offsets) are left out, so this can be shorter than
+        :meth:`count`; use it for cut positions, not for counting.
+
+        Args:
+            text: Input text
+
+        Returns:
+            ``(start, end)`` character offsets, one per token with a span
+        """
+        if not text:
+            return []
+
+        tokenizer = self.tokenizer
+        if tokenizer is not None:
+            try:
+                return _tokenizer_offsets(tokenizer, text)
+            except Exception as e:
+                self.logger.warning(f"Tokenizer failed, using heuristic counts: {e}")
+        return self._heuristic_offsets(text)
+
+    @staticmethod
+    def _heuristic_offsets(text: str) -> List[Span]:
+        """Spans of the heuristic tokens of a text."""
+        offsets: List[Span] = []
+        for match in _PIECE_PATTERN.finditer(text):
+            start, end = match.span()
+            piece = _DIGITS_PER_PIECE if match.lastgroup == "digits" else _CHARS_PER_WORD_PIECE
+            while end - start > piece:
+                offsets.append((start, start + piece))
+                start += piece
+            offsets.append((start, end))
+        return offsets
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Truncate text to at most ``max_tokens`` tokens.
+
+        Prefers ending at a sentence boundary, then a word boundary, as long
+        as that keeps at least 80% of the budget.
+
+        Args:
+            text: Input text
+            max_tokens: Maximum allowed tokens
+
+        Returns:
+            Truncated text
+        """
+        if not text or max_tokens <= 0:
+            return ""
+
+        total = self.count(text)
+        if total <= max_tokens:
+            return text
+
+        offsets = self.token_offsets(text)
+        # Tokens without a span still count against the budget
+        keep = min(max_tokens - (total - len(offsets)), len(offsets))
+        if keep <= 0:
+            return ""
+        cut = offsets[keep - 1][1]
+        floor = offsets[int(keep * 0.8)][0]
+
+        best = max(text.rfind(punct, floor, cut + 1) for punct in _SENTENCE_ENDS)
+        if best > floor:
+            return text[: best + 1].strip()
+
+        space = text.rfind(" ", floor, cut)
+        if space > floor:
+            return text[:space].strip()
+
+        return text[:cut].strip()
+
+    def pack(
+        self, texts: Sequence[str], max_tokens: int, separator: str = "\n\n"
+    ) -> List[str]:
+        """
+        Select leading texts that fit together within a token budget.
+
+        The last text that does not fit whole is truncated into the remaining
+        budget if a meaningful amount of room is left.
+
+        Args:
+            texts: Candidate texts, in priority order
+            max_tokens: Token budget for the joined result
+            separator: Separator the caller will join the texts with
+
+        Returns:
+            Texts to join, within the budget
+        """
+        packed: List[str] = []
+        remaining = max_tokens
+        separator_tokens = self.count(separator)
+
+        for text in texts:
+            cost = self.count(text) + (separator_tokens if packed else 0)
+            if cost <= remaining:
+                packed.append(text)
+                remaining -= cost
+                continue
+
+            room = remaining - (separator_tokens if packed else 0)
+            if room >= 32:
+                truncated = self.truncate(text, room)
+                if truncated:
+                    packed.append(truncated)
+            break
+
+        return packed
+
+    def get_stats(self) -> dict:
+        """Get counter backend and memoization statistics."""
+        with self._cache_lock:
+            total = self._hits + self._misses
+            return {
+                "backend": self.backend,
+                "cached_counts": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
+
+
+def _tokenizer_count(tokenizer, text: str) -> int:
+    """Count the token IDs a ``tokenizers`` or ``transformers`` tokenizer produces."""
+    if hasattr(tokenizer, "encode_batch"):
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    return len(tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+
+
+def _tokenizer_offsets(tokenizer, text: str) -> List[Span]:
+    """Get token offsets from a ``tokenizers`` or ``transformers`` tokenizer."""
+    if hasattr(tokenizer, "encode_batch"):
+        # tokenizers.Tokenizer
+        encoding = tokenizer.encode(text, add_special_tokens=False)
+        return [span for span in encoding.offsets if span[1] > span[0]]
+
+    encoding = tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+    )
+    return [tuple(span) for span in encoding["offset_mapping"] if span[1] > span[0]]
+
+
+# Global token counters
+_default_tokenizer_path: Optional[str] = None
+_token_counters = {}
+_token_counters_lock = threading.Lock()
+
+
+def configure_default_tokenizer(tokenizer_path: Optional[str]) -> None:
+    """
+    Set the tokenizer used by :func:`get_token_counter` when no path is given.
+
+    Args:
+        tokenizer_path: Path to a local tokenizer, or None for the heuristic
+    """
+    global _default_tokenizer_path
+    _default_tokenizer_path = tokenizer_path
+
+
+def get_token_counter(tokenizer_path: Optional[str] = None) -> TokenCounter:
+    """
+    Get the shared token counter for a tokenizer.
+
+    Args:
+        tokenizer_path: Path to a local tokenizer. Uses the configured
+            default if None.
+
+    Returns:
+        Shared TokenCounter instance
+    """
+    path = tokenizer_path or _default_tokenizer_path
+    counter = _token_counters.get(path)
+    if counter is None:
+        with _token_counters_lock:
+            counter = _token_counters.get(path)
+            if counter is None:
+                counter = TokenCounter(path)
+                _token_counters[path] = counter
+    return counter